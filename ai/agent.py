@@ -1,16 +1,44 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional
+import asyncio
 import json
 import logging
+import threading
 from .llm_client import LLMClient
+from .fast_path import FastPathPolicy
+from .bots import RuleBot
+from .prompt import STATIC_INSTRUCTIONS, compact_state, estimate_tokens, fit_memories, message_tokens
 from game.equity import EquityCalculator
 
+# Defaults for PokerAgent(fast_path=..., fallback=...): fresh policies per agent
+DEFAULT_FAST_PATH: Any = object()
+DEFAULT_FALLBACK: Any = object()
+
+# LLM failures that mean the provider is unusable right now (not a bad reply)
+PROVIDER_FAILURES = ("timeout", "circuit_open", "provider_error")
+
 class PokerAgent:
-    def __init__(self, name: str, profile: str = "A professional poker player", client: LLMClient = None): # type: ignore
+    # Max Monte Carlo samples per decision; sampling stops earlier once the
+    # standard error reaches the target or the CI clears the pot-odds threshold
+    EQUITY_SIMULATIONS = 50000
+    EQUITY_TARGET_STD_ERROR = 0.005
+
+    def __init__(self, name: str, profile: str = "A professional poker player", client: LLMClient = None, fast_path: Optional[FastPathPolicy] = DEFAULT_FAST_PATH, fallback: Any = DEFAULT_FALLBACK, batcher: Any = None, token_budget: Optional[int] = None): # type: ignore
         self.name = name
         self.profile = profile
         self.client = client if client else LLMClient()
         self.equity_calculator = EquityCalculator()
         self.memories: List[str] = []
+        # Clear-cut spots are answered locally; None sends every decision to the LLM
+        self.fast_path = FastPathPolicy() if fast_path is DEFAULT_FAST_PATH else fast_path
+        # Local policy (get_action contract) used when the LLM times out or its circuit is open
+        self.fallback = RuleBot(name) if fallback is DEFAULT_FALLBACK else fallback
+        self.decision_sources = {"fast_path": 0, "llm": 0, "fallback": 0}
+        # Optional DecisionBatcher shared by several agents; streamed decisions bypass it
+        self.batcher = batcher
+        # Estimated input tokens allowed per prompt; memories are summarized/dropped to fit (None = no limit)
+        self.token_budget = token_budget
+        self.prompt_counts = {"calls": 0, "tokens": 0, "last_tokens": 0, "max_tokens": 0, "memories_summarized": 0}
+        self._prompt_lock = threading.Lock()
 
     def add_memory(self, event: str):
         """Adds a memory of a past hand/event."""
@@ -27,6 +55,108 @@ class PokerAgent:
         if not valid_actions:
             return {"action": "fold", "reasoning": "No valid actions"}
 
+        equity = self.estimate_equity(game_info)
+        decision = self._fast_decision(game_info, valid_actions, equity)
+        if decision is None:
+            response = (self.batcher or self.client).chat_completion(messages=self._build_messages(game_info, valid_actions, equity))
+            decision = self._llm_decision(response, game_info, valid_actions)
+        self.record_source(decision)
+        return decision
+
+    async def aget_action(self, game_info: Dict[str, Any], valid_actions: List[str]) -> Dict[str, Any]:
+        """
+        Async get_action: the LLM round-trip is awaited, so several agents (or
+        tables) can think at the same time with asyncio.gather.
+        """
+        if not valid_actions:
+            return {"action": "fold", "reasoning": "No valid actions"}
+
+        # Equity sampling is CPU work: keep it off the caller's event loop
+        equity = await asyncio.to_thread(self.estimate_equity, game_info)
+        decision = self._fast_decision(game_info, valid_actions, equity)
+        if decision is None:
+            response = await (self.batcher or self.client).achat_completion(messages=self._build_messages(game_info, valid_actions, equity))
+            decision = self._llm_decision(response, game_info, valid_actions)
+        self.record_source(decision)
+        return decision
+
+    def stream_action(self, game_info: Dict[str, Any], valid_actions: List[str]) -> Iterator[Dict[str, Any]]:
+        """
+        Streaming get_action. Yields:
+          {"type": "decision", "decision": d}  as soon as action (and amount, for a
+                                               raise) have arrived; d is final
+          {"type": "chat", "text": t}          the table talk as it is generated
+          {"type": "done", "decision": d}      d with reasoning and chat filled in
+        """
+        if not valid_actions:
+            decision = {"action": "fold", "reasoning": "No valid actions"}
+            yield {"type": "decision", "decision": decision}
+            yield {"type": "done", "decision": decision}
+            return
+
+        equity = self.estimate_equity(game_info)
+        for event in self.stream_decision(game_info, valid_actions, equity):
+            if event["type"] == "done":
+                self.record_source(event["decision"])
+            yield event
+
+    def stream_decision(self, game_info: Dict[str, Any], valid_actions: List[str], equity: float) -> Iterator[Dict[str, Any]]:
+        """stream_action's events once equity is known (decision sources are not recorded here)."""
+        decision = self._fast_decision(game_info, valid_actions, equity)
+        if decision is not None:
+            yield {"type": "decision", "decision": decision}
+            yield {"type": "done", "decision": decision}
+            return
+
+        committed = None
+        fields: Dict[str, Any] = {}
+        for event in self.client.stream_completion(messages=self._build_messages(game_info, valid_actions, equity)):
+            if event["type"] == "field":
+                fields[event["key"]] = event["value"]
+                action = str(fields.get("action", "")).lower()
+                if committed is None and action and (action != "raise" or "amount" in fields):
+                    committed = self._parse_decision(dict(fields), valid_actions)
+                    yield {"type": "decision", "decision": committed}
+            elif event["type"] == "delta" and event["key"] == "chat":
+                yield {"type": "chat", "text": event["text"]}
+            elif event["type"] == "done":
+                decision = self._llm_decision(event["response"], game_info, valid_actions)
+                if committed is None:
+                    committed = decision
+                    yield {"type": "decision", "decision": committed}
+                else:
+                    # The committed action was already played; keep the rest of the reply
+                    decision = dict(decision, action=committed["action"], amount=committed.get("amount", 0))
+                yield {"type": "done", "decision": decision}
+
+    def _fast_decision(self, game_info: Dict[str, Any], valid_actions: List[str], equity: float) -> Optional[Dict[str, Any]]:
+        """The fast-path answer for a clear-cut spot, or None if the LLM should decide."""
+        if self.fast_path is None:
+            return None
+        decision = self.fast_path.decide(game_info, valid_actions, equity)
+        if decision is not None and decision["action"] not in valid_actions:
+            return None
+        return decision
+
+    def _llm_decision(self, response: Dict[str, Any], game_info: Dict[str, Any], valid_actions: List[str]) -> Dict[str, Any]:
+        """The parsed LLM reply, or the fallback policy's decision if the provider failed."""
+        if self.fallback is not None and any(response.get(flag) for flag in PROVIDER_FAILURES):
+            decision = self.fallback.get_action(game_info, valid_actions)
+            if decision.get("action") in valid_actions:
+                return dict(decision, reasoning=f"Fallback policy: {response.get('error')}", source="fallback")
+        return self._parse_decision(response, valid_actions)
+
+    def record_source(self, decision: Dict[str, Any]):
+        source = decision.get("source")
+        self.decision_sources[source if source in ("fast_path", "fallback") else "llm"] += 1
+
+    def decision_stats(self) -> Dict[str, Any]:
+        """How many decisions were answered locally (fast path, fallback) vs by the LLM."""
+        total = sum(self.decision_sources.values())
+        return dict(self.decision_sources, fast_path_fraction=self.decision_sources["fast_path"] / total if total else 0.0)
+
+    def estimate_equity(self, game_info: Dict[str, Any]) -> float:
+        """Equity of my hand against the active players (0.0 if it cannot be computed)."""
         # Calculate Equity
         my_hand = game_info.get('my_hand', [])
         board = game_info.get('board', [])
@@ -39,47 +169,65 @@ class PokerAgent:
         # Better: let caller provide 'num_active_players'
         num_active = game_info.get('num_active_players', 2)
         
+        # Pot odds (fraction of the pot we must put in) decide when equity is precise enough
+        pot_odds_threshold = (game_info.get('pot_odds') or {}).get('pot_odds') or None
+
         equity = 0.0
         if my_hand:
             try:
-                equity = self.equity_calculator.calculate_equity(my_hand, board, num_active_players=num_active)
+                equity = self.equity_calculator.calculate_equity_details(
+                    my_hand, board, num_active_players=num_active,
+                    simulations=self.EQUITY_SIMULATIONS,
+                    target_std_error=self.EQUITY_TARGET_STD_ERROR,
+                    threshold=pot_odds_threshold,
+                )["equity"]
             except Exception as e:
                 logging.error(f"Equity calc error: {e}")
                 equity = 0.0 # Ignore
+        return equity
 
-        equity_percent = round(equity * 100, 1)
+    def _build_messages(self, game_info: Dict[str, Any], valid_actions: List[str], equity: Optional[float] = None) -> List[Dict[str, str]]:
+        """
+        System and user messages for one decision. The system message (shared
+        instructions, then the persona) never changes for an agent, so it is a
+        cacheable prefix; memories and the compact state follow in the user
+        message, with memories cut down to fit token_budget.
+        """
+        if equity is None:
+            equity = self.estimate_equity(game_info)
 
-        memory_str = "\n".join([f"- {m}" for m in self.memories])
-        if memory_str:
-            memory_section = f"\nRecent History:\n{memory_str}\n"
-        else:
-            memory_section = ""
+        system_message = f"{STATIC_INSTRUCTIONS}\nYou are {self.name}. {self.profile}"
+        state = f"{compact_state(game_info, equity)}\nValid Actions: {', '.join(valid_actions)}"
 
-        system_message = (
-            f"You are {self.name}, playing Texas Hold'em. {self.profile}\n"
-            "Your goal is to win chips. You must make logical decisions based on your hand, the board, and pot odds.\n"
-            f"{memory_section}"
-            "You must output JSON only."
-        )
+        memory_budget = None
+        if self.token_budget is not None:
+            memory_budget = self.token_budget - estimate_tokens(system_message) - estimate_tokens(state) - estimate_tokens("Recent:\n\n")
+        memory_lines, summarized = fit_memories(self.memories, memory_budget)
+        user_message = f"Recent:\n{chr(10).join(memory_lines)}\n\n{state}" if memory_lines else state
 
-        # Construct Game State Description
-        state_desc = self._format_state(game_info)
-        state_desc += f"\nYour Calculated Win Probability (Equity): {equity_percent}%"
-        
-        user_message = (
-            f"Game State:\n{state_desc}\n\n"
-            f"Valid Actions: {', '.join(valid_actions)}\n"
-            "What is your move? Respond in JSON format with fields: 'action', 'amount' (optional if not raising), 'reasoning', 'chat'."
-            "Example: {\"action\": \"call\", \"amount\": 0, \"reasoning\": \"Pot odds are good\", \"chat\": \"I call.\"}"
-        )
-
-        response = self.client.chat_completion(
-            messages=[
-                {"role": "system", "content": system_message},
-                {"role": "user", "content": user_message}
-            ]
-        )
-        
+        messages = [
+            {"role": "system", "content": system_message},
+            {"role": "user", "content": user_message}
+        ]
+        self._record_prompt(message_tokens(messages), summarized)
+        return messages
+
+    def _record_prompt(self, tokens: int, summarized: int):
+        with self._prompt_lock:
+            self.prompt_counts["calls"] += 1
+            self.prompt_counts["tokens"] += tokens
+            self.prompt_counts["last_tokens"] = tokens
+            self.prompt_counts["max_tokens"] = max(self.prompt_counts["max_tokens"], tokens)
+            self.prompt_counts["memories_summarized"] += summarized
+
+    def prompt_stats(self) -> Dict[str, Any]:
+        """Estimated input tokens per LLM prompt built by this agent."""
+        with self._prompt_lock:
+            calls = self.prompt_counts["calls"]
+            return dict(self.prompt_counts, mean_tokens=self.prompt_counts["tokens"] / calls if calls else 0.0)
+
+    def _parse_decision(self, response: Dict[str, Any], valid_actions: List[str]) -> Dict[str, Any]:
+        """Validate the LLM response, falling back to check/call/fold on errors."""
         # Check for error or fallback
         if "error" in response:
             # Fallback to check/call instead of always folding
@@ -100,29 +248,3 @@ class PokerAgent:
             return {"action": "fold", "reasoning": "Invalid action fallback"}
 
         return response
-
-    def _format_state(self, info: Dict[str, Any]) -> str:
-        """
-        Formats the game state dictionary into a readable definition for the LLM.
-        """
-        lines = []
-        lines.append(f"My Hand: {info.get('my_hand')}")
-        lines.append(f"Community Cards (Board): {info.get('board')}")
-        lines.append(f"Game Stage: {info.get('stage', 'Unknown')}")
-        lines.append(f"My Position: {info.get('position', 'Unknown')}")
-        lines.append(f"Pot Size: {info.get('pot')}")
-        lines.append(f"Current Bet to match: {info.get('current_bet')}")
-        lines.append(f"Cost to Call: {info.get('to_call')}")
-        lines.append(f"My Chips: {info.get('my_chips')}")
-        lines.append(f"My Previous Bet: {info.get('my_bet')}")
-        
-        # Add pot odds info
-        pot_odds = info.get('pot_odds', {})
-        if pot_odds:
-            lines.append(f"Pot Odds: {pot_odds.get('pot_odds_pct', 'N/A')} ({pot_odds.get('description', '')})")
-        
-        # Add history/players info if available
-        if 'players' in info:
-           lines.append(f"Other Players: {info['players']}")
-
-        return "\n".join(lines)
@@ -0,0 +1,155 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple
+from .llm_client import LLMClient
+
+class DecisionBatcher:
+    """
+    Collects LLM requests from many agents over a short window and sends them
+    together. It has the same chat_completion/achat_completion interface as
+    LLMClient, so PokerAgent(batcher=...) routes its LLM calls through it and
+    each caller gets back exactly its own parsed reply.
+
+      window: seconds to wait after the first request for others to join
+      max_batch: a batch is sent at once when it reaches this size
+      combine: send a batch as ONE multi-decision prompt (one round-trip and one
+          shared instruction preamble); decisions missing from the combined
+          reply are re-asked individually. Otherwise the batch's requests are
+          sent concurrently. Only JSON-mode requests are combined; the others
+          are always sent on their own with json_mode=False.
+    """
+    COMBINED_SYSTEM = (
+        "You are deciding for several Texas Hold'em players at once. Each decision below "
+        "has an id, the player's persona and their game state; answer each one as that player.\n"
+        "You must output JSON only, in the form "
+        "{\"decisions\": {\"<id>\": {\"action\": ..., \"amount\": ..., \"reasoning\": ..., \"chat\": ...}}} "
+        "with one entry per decision id."
+    )
+
+    def __init__(self, client: LLMClient, window: float = 0.01, max_batch: int = 16, combine: bool = False):
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1")
+        self.client = client
+        self.window = window
+        self.max_batch = max_batch
+        self.combine = combine
+        # (messages, json_mode, caller's future)
+        self._pending: List[Tuple[List[Dict[str, str]], bool, Future]] = []
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.requests = 0
+        self.decisions = 0
+        self.retries = 0
+
+    def submit(self, messages: List[Dict[str, str]], json_mode: bool = True) -> Future:
+        """Queue one request; the Future resolves to what chat_completion would return."""
+        future: Future = Future()
+        with self._lock:
+            self._pending.append((messages, json_mode, future))
+            if len(self._pending) >= self.max_batch:
+                batch = self._take()
+            else:
+                batch = None
+                if self._timer is None:
+                    self._timer = threading.Timer(self.window, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+        if batch:
+            self._send(batch)
+        return future
+
+    def chat_completion(self, messages: List[Dict[str, str]], json_mode: bool = True) -> Dict[str, Any]:
+        return self.submit(messages, json_mode).result()
+
+    async def achat_completion(self, messages: List[Dict[str, str]], json_mode: bool = True) -> Dict[str, Any]:
+        return await asyncio.wrap_future(self.submit(messages, json_mode))
+
+    def flush(self):
+        """Send whatever is pending now."""
+        with self._lock:
+            batch = self._take()
+        if batch:
+            self._send(batch)
+
+    def _take(self) -> List[Tuple[List[Dict[str, str]], bool, Future]]:
+        """Pending requests, emptied (lock held)."""
+        batch, self._pending = self._pending, []
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        return batch
+
+    def _send(self, batch: List[Tuple[List[Dict[str, str]], bool, Future]]):
+        with self._lock:
+            self.batches += 1
+            self.decisions += len(batch)
+        # The combined reply is one JSON object, so only JSON-mode requests can share it
+        combined = [(messages, future) for messages, json_mode, future in batch if json_mode] if self.combine else []
+        if len(combined) > 1:
+            with self._lock:
+                self.requests += 1
+            request = self.client.submit(self.combined_messages([messages for messages, _ in combined]))
+            request.add_done_callback(lambda f: self._route(combined, f))
+            batch = [entry for entry in batch if not entry[1]]
+        for messages, json_mode, future in batch:
+            self._forward(messages, future, json_mode)
+
+    def _forward(self, messages: List[Dict[str, str]], future: Future, json_mode: bool = True):
+        """One request of its own, resolving future when it lands."""
+        with self._lock:
+            self.requests += 1
+        self.client.submit(messages, json_mode).add_done_callback(lambda f: _resolve(future, f))
+
+    def _route(self, batch: List[Tuple[List[Dict[str, str]], Future]], request: Future):
+        """Hand each caller its entry of a combined reply."""
+        if request.exception() is not None:
+            for _, future in batch:
+                future.set_exception(request.exception())  # type: ignore
+            return
+        response = request.result()
+        if response.get("timeout") or response.get("circuit_open") or response.get("provider_error"):
+            # The provider is down: every caller gets the failure (and its fallback policy)
+            for _, future in batch:
+                future.set_result(dict(response))
+            return
+        decisions = response.get("decisions") if isinstance(response.get("decisions"), dict) else {}
+        for i, (messages, future) in enumerate(batch):
+            decision = decisions.get(str(i))
+            if isinstance(decision, dict) and "action" in decision:
+                future.set_result(decision)
+            else:
+                with self._lock:
+                    self.retries += 1
+                self._forward(messages, future)
+
+    @classmethod
+    def combined_messages(cls, batch: List[List[Dict[str, str]]]) -> List[Dict[str, str]]:
+        """One system preamble, then each request's own system and user text under its id."""
+        sections = []
+        for i, messages in enumerate(batch):
+            persona = "\n".join(m["content"] for m in messages if m["role"] == "system")
+            state = "\n".join(m["content"] for m in messages if m["role"] != "system")
+            sections.append(f"### Decision id {i}\nPersona:\n{persona}\n\n{state}")
+        return [
+            {"role": "system", "content": cls.COMBINED_SYSTEM},
+            {"role": "user", "content": "\n\n".join(sections)},
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "batches": self.batches,
+                "decisions": self.decisions,
+                "requests": self.requests,
+                "retries": self.retries,
+                "mean_batch": self.decisions / self.batches if self.batches else 0.0,
+            }
+
+
+def _resolve(future: Future, inner: Future):
+    if inner.exception() is not None:
+        future.set_exception(inner.exception())  # type: ignore
+    else:
+        future.set_result(inner.result())
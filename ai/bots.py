@@ -0,0 +1,147 @@
+import random
+from typing import Any, Dict, List, Optional
+from game.models import card_to_int
+from game.evaluator import HandEvaluator
+from game.preflop import PreflopTable
+from game.equity import EquityCalculator
+
+# Worst treys score; made-hand strength is 1 - score / WORST_SCORE
+WORST_SCORE = 7462
+
+_PREFLOP_TABLE = None
+_PREFLOP_TABLE_LOADED = False
+_EVALUATOR = HandEvaluator()
+
+def _preflop_table() -> Optional[PreflopTable]:
+    global _PREFLOP_TABLE, _PREFLOP_TABLE_LOADED
+    if not _PREFLOP_TABLE_LOADED:
+        _PREFLOP_TABLE = PreflopTable.load()
+        _PREFLOP_TABLE_LOADED = True
+    return _PREFLOP_TABLE
+
+
+class RandomBot:
+    """Picks uniformly among the legal actions. Useful as a baseline and for fuzzing the engine."""
+    def __init__(self, name: str = "Random", seed: Optional[int] = None):
+        self.name = name
+        self.rng = random.Random(seed)
+
+    def get_action(self, game_info: Dict[str, Any], valid_actions: List[str]) -> Dict[str, Any]:
+        if not valid_actions:
+            return {"action": "fold"}
+        action = self.rng.choice(valid_actions)
+        big_blind = game_info.get('big_blind', 20)
+        return {"action": action, "amount": big_blind * self.rng.randint(1, 4) if action == "raise" else 0}
+
+
+class RuleBot:
+    """
+    Cheap heuristic player with the same get_action(game_info, valid_actions)
+    contract as PokerAgent, but no LLM or sampling in the decision.
+
+    Hand strength is preflop equity from the precomputed table, and the made-hand
+    percentile (1 - score / 7462) after the flop.
+      tightness (0-1): how strong a hand must be to put chips in
+      aggression (0-1): how often strong hands bet/raise instead of check/call
+    """
+    def __init__(self, name: str = "RuleBot", tightness: float = 0.5, aggression: float = 0.5, seed: Optional[int] = None):
+        self.name = name
+        self.tightness = tightness
+        self.aggression = aggression
+        self.rng = random.Random(seed)
+        self._equity_calculator = None
+
+    def hand_strength(self, game_info: Dict[str, Any]) -> float:
+        """
+        0-1 strength scaled so that 1/num_active_players is an average hand preflop.
+        """
+        hand = [card_to_int(c) for c in game_info.get('my_hand', [])]
+        board = [card_to_int(c) for c in game_info.get('board', [])]
+        if len(hand) != 2:
+            return 0.0
+        if not board:
+            num_players = game_info.get('num_active_players', 2)
+            table = _preflop_table()
+            if table is not None and table.covers(num_players):
+                return table.lookup(hand, num_players)["equity"]
+            if self._equity_calculator is None:
+                self._equity_calculator = EquityCalculator(use_preflop_table=False)
+            return self._equity_calculator.calculate_equity(hand, [], num_players, simulations=2000)
+        return 1.0 - _EVALUATOR.evaluate_ints(hand, board) / WORST_SCORE
+
+    def get_action(self, game_info: Dict[str, Any], valid_actions: List[str]) -> Dict[str, Any]:
+        if not valid_actions:
+            return {"action": "fold"}
+
+        strength = self.hand_strength(game_info)
+        to_call = game_info.get('to_call', 0)
+        pot = game_info.get('pot', 0)
+        big_blind = game_info.get('big_blind', 20)
+        num_players = max(2, game_info.get('num_active_players', 2))
+
+        if game_info.get('board'):
+            # Made-hand percentile: ~0.55 is top pair, ~0.7 trips or better
+            play_bar = 0.2 + 0.3 * self.tightness
+            value_bar = 0.5 + 0.2 * self.tightness
+        else:
+            fair_share = 1.0 / num_players
+            play_bar = fair_share * (0.8 + 0.6 * self.tightness)
+            value_bar = fair_share * (1.2 + 0.6 * self.tightness)
+
+        if strength >= value_bar and self.rng.random() < self.aggression:
+            if "raise" in valid_actions:
+                amount = max(big_blind, int(pot * (0.5 + 0.5 * self.aggression)))
+                return {"action": "raise", "amount": amount}
+            if "all_in" in valid_actions:
+                return {"action": "all_in", "amount": 0}
+
+        if "check" in valid_actions:
+            return {"action": "check", "amount": 0}
+
+        pot_odds = to_call / (pot + to_call) if to_call > 0 else 0.0
+        if strength >= play_bar or (strength >= pot_odds and self.rng.random() > self.tightness):
+            if "call" in valid_actions:
+                return {"action": "call", "amount": 0}
+            if "all_in" in valid_actions and strength >= value_bar:
+                return {"action": "all_in", "amount": 0}
+        return {"action": "fold", "amount": 0}
+
+
+# (tightness, aggression) presets for tuning experiments
+BOT_PROFILES = {
+    "rock": (0.85, 0.3),
+    "tag": (0.65, 0.7),
+    "lag": (0.35, 0.75),
+    "station": (0.1, 0.05),
+    "maniac": (0.0, 0.95),
+}
+
+# Per-decision search budget of make_bot("mcts"), small enough for self-play runs
+MCTS_PROFILE_ITERATIONS = 300
+
+def make_bot(profile: str, name: Optional[str] = None, seed: Optional[int] = None):
+    """
+    Build a bot from a BOT_PROFILES name, 'random' for RandomBot, 'mcts' for
+    MCTSBot or 'cfr' for CFRPolicy (the trained blueprint, see train_cfr.py).
+    """
+    if profile == "random":
+        return RandomBot(name or "Random", seed=seed)
+    if profile == "mcts":
+        from .mcts import MCTSBot
+        return MCTSBot(name or "MCTS", iterations=MCTS_PROFILE_ITERATIONS, time_limit=None, seed=seed)
+    if profile == "cfr":
+        from .cfr import CFRPolicy
+        return CFRPolicy(name or "CFR", seed=seed)
+    if profile not in BOT_PROFILES:
+        raise ValueError(f"Unknown bot profile: {profile} (expected one of: random, mcts, cfr, {', '.join(BOT_PROFILES)})")
+    tightness, aggression = BOT_PROFILES[profile]
+    return RuleBot(name or profile, tightness=tightness, aggression=aggression, seed=seed)
+
+def profile_policies(profiles: List[str], table_index: int = 0, seed: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Seats for one table from a list of profile names, named '<profile>-<seat>'.
+    Module-level so functools.partial(profile_policies, profiles) can be sent to
+    game.simulation.run_tables workers.
+    """
+    base = (seed or 0) * 1000
+    return {f"{profile}-{seat}": make_bot(profile, f"{profile}-{seat}", seed=base + seat) for seat, profile in enumerate(profiles)}
@@ -0,0 +1,304 @@
+import json
+import os
+import random
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from game.engine import TexasHoldemGame, GameStage
+from game.equity import EquityCalculator, EquityCache, canonical_spot
+from game.models import Player
+from .bots import RuleBot, _EVALUATOR
+
+DEFAULT_BLUEPRINT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "cfr_blueprint")
+
+# Abstract actions, the columns of the regret and strategy tables. Raises are
+# pot fractions; "raise:all" puts the whole stack in.
+ACTIONS = ("fold", "call", "raise:0.5", "raise:1", "raise:all")
+RAISE_FRACTIONS = {2: 0.5, 3: 1.0}
+RAISE_ALL = 4
+
+# Information-set features besides street and equity bucket: pot odds faced
+# (0 = nothing to call), stack-to-pot ratio, and whether we have the button
+ODDS_EDGES = (0.2, 0.3, 0.4)
+SPR_EDGES = (1.0, 3.0, 8.0)
+STAGES = (GameStage.PREFLOP, GameStage.FLOP, GameStage.TURN, GameStage.RIVER)
+STREET_INDEX = {stage.name: i for i, stage in enumerate(STAGES)}
+
+# Spots whose equity bucket is remembered; training revisits the common ones constantly
+BUCKET_CACHE_SIZE = 200000
+
+REGRETS_FILE = "regrets.npy"
+STRATEGY_FILE = "strategy.npy"
+META_FILE = "meta.json"
+
+
+def _bin(value: float, edges: Tuple[float, ...]) -> int:
+    for i, edge in enumerate(edges):
+        if value <= edge:
+            return i
+    return len(edges)
+
+
+class CardAbstraction:
+    """
+    Information sets of the blueprint: one row per (street, equity bucket, pot
+    odds bin, stack-to-pot bin, button), computed from a game_info alone.
+
+    The equity bucket is the hand's equity against random hands, from
+    EquityCalculator, cut into `buckets` equal bins: the preflop table before
+    the flop, `simulations` sampled runouts on the flop and turn, and every
+    runout on the river. It is a function of the spot alone: sampling is
+    seeded from the spot's canonical form, so a hand gets the same bucket in
+    training and in play, and suit-isomorphic spots share it.
+
+    Cost per decision: a table lookup preflop; after the flop about 1 ms
+    (1000 samples, or the 990 river deals heads-up) the first time a spot
+    is seen, then a cache lookup.
+    """
+    def __init__(self, buckets: int = 10, simulations: int = 1000, players: int = 2):
+        if buckets < 1:
+            raise ValueError("buckets must be at least 1")
+        self.buckets = buckets
+        self.simulations = simulations
+        self.players = players
+        self.calculator = EquityCalculator(cache=EquityCache(maxsize=BUCKET_CACHE_SIZE))
+        self.rows = len(STAGES) * buckets * (len(ODDS_EDGES) + 2) * (len(SPR_EDGES) + 1) * 2
+
+    def bucket(self, hand: List, board: List) -> int:
+        hand_cards, board_cards = canonical_spot(hand, board)
+        # Only read on a cache miss: the sampled runouts depend on nothing but the spot
+        self.calculator.rng = np.random.default_rng([*hand_cards, *board_cards])
+        equity = self.calculator.calculate_equity(hand, board, self.players, simulations=self.simulations,
+                                                  exact=None if not board else len(board) == 5)
+        return min(self.buckets - 1, int(equity * self.buckets))
+
+    def row(self, info: Dict[str, Any], bucket: int) -> int:
+        """The table row of this decision, given the hand's equity bucket."""
+        to_call = info['to_call']
+        odds = 0 if to_call <= 0 else 1 + _bin(to_call / (info['pot'] + to_call), ODDS_EDGES)
+        spr = _bin(info['my_chips'] / max(info['pot'], 1), SPR_EDGES)
+        button = 1 if info.get('seat') == info.get('dealer') else 0
+        row = STREET_INDEX[info['stage']] * self.buckets + bucket
+        row = row * (len(ODDS_EDGES) + 2) + odds
+        row = row * (len(SPR_EDGES) + 1) + spr
+        return row * 2 + button
+
+
+def abstract_actions(info: Dict[str, Any], valid_actions: List[str], allow_raise: bool = True) -> Dict[int, Tuple[str, int]]:
+    """The abstract actions available here, as {column: (engine action, raise amount)}."""
+    to_call = info['to_call']
+    chips = info['my_chips']
+    moves: Dict[int, Tuple[str, int]] = {}
+    # Folding when checking is free is never better, so it is left out
+    if to_call > 0 and "fold" in valid_actions:
+        moves[0] = ("fold", 0)
+    for action in ("check", "call", "all_in"):
+        if action in valid_actions:
+            moves[1] = (action, 0)
+            break
+    if allow_raise and "raise" in valid_actions:
+        for column, fraction in RAISE_FRACTIONS.items():
+            amount = max(info.get('big_blind', 20), int(info['pot'] * fraction))
+            if to_call + amount < chips:
+                moves[column] = ("raise", amount)
+        moves[RAISE_ALL] = ("raise", chips - to_call)
+    return moves
+
+
+def regret_matching(regrets: np.ndarray, columns: List[int]) -> np.ndarray:
+    """Current strategy over `columns`: positive regrets normalized, uniform when there are none."""
+    positive = np.maximum(regrets[columns], 0.0)
+    total = positive.sum()
+    if total > 0:
+        return positive / total
+    return np.full(len(columns), 1.0 / len(columns))
+
+
+class CFRBlueprint:
+    """
+    A trained average strategy, normalized once at load so each decision is
+    a row lookup. Rows that training never reached are all zero.
+    """
+    def __init__(self, strategy_sum: np.ndarray, abstraction: CardAbstraction, iterations: int):
+        totals = strategy_sum.sum(axis=1, keepdims=True)
+        self.strategy = np.divide(strategy_sum, totals, out=np.zeros(strategy_sum.shape, dtype=np.float32), where=totals > 0)
+        self.abstraction = abstraction
+        self.iterations = iterations
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_BLUEPRINT_DIR) -> Optional["CFRBlueprint"]:
+        """Load the strategy of a CFRTrainer checkpoint; returns None if there is none."""
+        if not os.path.exists(os.path.join(path, META_FILE)):
+            return None
+        with open(os.path.join(path, META_FILE)) as f:
+            meta = json.load(f)
+        abstraction = CardAbstraction(meta["buckets"], meta["equity_simulations"], meta["players"])
+        return cls(np.load(os.path.join(path, STRATEGY_FILE)), abstraction, meta["iterations"])
+
+    def policy(self, info: Dict[str, Any], bucket: int) -> np.ndarray:
+        return self.strategy[self.abstraction.row(info, bucket)]
+
+
+class CFRTrainer:
+    """
+    External-sampling Monte Carlo CFR on heads-up TexasHoldemGame hands, over
+    the ACTIONS abstraction and CardAbstraction information sets.
+
+    Each iteration deals one hand and, for each seat in turn, walks every
+    abstract action of that seat (taking each back with snapshot/restore)
+    while the other seat and the cards are sampled; regrets are updated with
+    regret matching+ and the sampled seat's strategy is added to the average.
+
+    Regrets and strategy sums live in memory-mapped .npy files under `path`,
+    with meta.json holding the settings, the iteration count and the RNG
+    state: checkpoint() flushes them, and a trainer opened on an existing
+    checkpoint resumes it (its stored settings win over the arguments).
+
+      stack: both stacks at the start of every hand
+      max_raises: raises allowed per street before only fold/call remain
+    """
+    def __init__(self, path: str = DEFAULT_BLUEPRINT_DIR, buckets: int = 10, equity_simulations: int = 1000, stack: int = 2000,
+                 small_blind: int = 10, big_blind: int = 20, max_raises: int = 2, seed: Optional[int] = None):
+        self.path = path
+        meta_path = os.path.join(path, META_FILE)
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                meta = json.load(f)
+        else:
+            meta = {"iterations": 0, "buckets": buckets, "equity_simulations": equity_simulations, "players": 2,
+                    "stack": stack, "small_blind": small_blind, "big_blind": big_blind, "max_raises": max_raises, "rng": None}
+        self.iterations = meta["iterations"]
+        self.stack = meta["stack"]
+        self.max_raises = meta["max_raises"]
+        self.abstraction = CardAbstraction(meta["buckets"], meta["equity_simulations"], meta["players"])
+        self.meta = meta
+
+        self.rng = np.random.default_rng(seed)
+        if meta["rng"] is not None:
+            self.rng.bit_generator.state = meta["rng"]
+        shape = (self.abstraction.rows, len(ACTIONS))
+        if os.path.exists(meta_path):
+            self.regrets = np.load(os.path.join(path, REGRETS_FILE), mmap_mode="r+")
+            self.strategy_sum = np.load(os.path.join(path, STRATEGY_FILE), mmap_mode="r+")
+            if self.regrets.shape != shape:
+                raise ValueError(f"Checkpoint tables have shape {self.regrets.shape}, expected {shape}")
+        else:
+            os.makedirs(path, exist_ok=True)
+            self.regrets = np.lib.format.open_memmap(os.path.join(path, REGRETS_FILE), mode="w+", dtype=np.float32, shape=shape)
+            self.strategy_sum = np.lib.format.open_memmap(os.path.join(path, STRATEGY_FILE), mode="w+", dtype=np.float32, shape=shape)
+
+        self.game = TexasHoldemGame(meta["small_blind"], meta["big_blind"], evaluator=_EVALUATOR)
+        for name in ("P0", "P1"):
+            self.game.add_player(Player(name, is_ai=True, chips=self.stack))
+        # Equity buckets of the current deal: (seat, board size) -> bucket
+        self._buckets: Dict[Tuple[int, int], int] = {}
+
+    def train(self, iterations: int, checkpoint_every: int = 1000, progress=None):
+        """
+        Run `iterations` more iterations, checkpointing every `checkpoint_every`
+        and at the end. progress: optional callable(done, total).
+        """
+        for done in range(1, iterations + 1):
+            self._iteration()
+            if done % checkpoint_every == 0 or done == iterations:
+                self.checkpoint()
+            if progress:
+                progress(done, iterations)
+
+    def checkpoint(self):
+        """Flush the tables and record the iteration count and RNG state."""
+        self.regrets.flush()
+        self.strategy_sum.flush()
+        self.meta.update(iterations=self.iterations, rng=self.rng.bit_generator.state)
+        tmp = os.path.join(self.path, META_FILE + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(self.meta, f)
+        os.replace(tmp, os.path.join(self.path, META_FILE))
+
+    def blueprint(self) -> CFRBlueprint:
+        return CFRBlueprint(np.array(self.strategy_sum), self.abstraction, self.iterations)
+
+    def _iteration(self):
+        game = self.game
+        for p in game.players:
+            p.chips = self.stack
+        # The deck is shuffled from the trainer's RNG so a resumed run continues the same sequence
+        game.deck.rng = random.Random(int(self.rng.integers(2 ** 63)))
+        game.dealer_index = self.iterations % 2
+        game.start_hand()
+        self._buckets = {}
+        root = game.snapshot()
+        for traverser in (0, 1):
+            game.restore(root)
+            self._traverse(traverser, game.stage, 0)
+        self.iterations += 1
+
+    def _traverse(self, traverser: int, stage: GameStage, raises: int) -> float:
+        """Value of the current state for the traverser, in big blinds."""
+        game = self.game
+        if game.stage == GameStage.GAME_OVER:
+            return (game.players[traverser].chips - self.stack) / game.big_blind
+        if game.stage != stage:
+            stage, raises = game.stage, 0
+
+        seat = game.current_player_index
+        player = game.players[seat]
+        info = game.get_game_info(player)
+        key = (seat, len(game.board))
+        if key not in self._buckets:
+            self._buckets[key] = self.abstraction.bucket([c.index for c in player.hand], [c.index for c in game.board])
+        row = self.abstraction.row(info, self._buckets[key])
+        moves = abstract_actions(info, game.get_legal_actions(player), allow_raise=raises < self.max_raises)
+        columns = list(moves)
+        strategy = regret_matching(self.regrets[row], columns)
+
+        if seat != traverser:
+            self.strategy_sum[row, columns] += strategy
+            column = columns[self.rng.choice(len(columns), p=strategy)]
+            game.step(*moves[column])
+            return self._traverse(traverser, stage, raises + (column >= 2))
+
+        state = game.snapshot()
+        values = np.zeros(len(columns))
+        for i, column in enumerate(columns):
+            game.step(*moves[column])
+            values[i] = self._traverse(traverser, stage, raises + (column >= 2))
+            game.restore(state)
+        value = float(strategy @ values)
+        # Regret matching+: cumulative regrets never go below zero
+        self.regrets[row, columns] = np.maximum(self.regrets[row, columns] + (values - value), 0.0)
+        return value
+
+
+class CFRPolicy:
+    """
+    Plays a CFRBlueprint with the get_action(game_info, valid_actions)
+    contract: the decision's row of the average strategy, restricted to the
+    legal abstract actions, is sampled. Decisions the blueprint does not
+    cover (no blueprint, other table sizes, rows never trained) go to RuleBot.
+
+    No blueprint ships with the repo: until one is trained into `path` with
+    train_cfr.py, every decision is RuleBot's.
+    """
+    def __init__(self, name: str = "CFR", blueprint: Optional[CFRBlueprint] = None, path: str = DEFAULT_BLUEPRINT_DIR, seed: Optional[int] = None):
+        self.name = name
+        self.blueprint = blueprint if blueprint is not None else CFRBlueprint.load(path)
+        self.rng = np.random.default_rng(seed)
+        self.fallback = RuleBot(name, seed=seed)
+
+    def get_action(self, game_info: Dict[str, Any], valid_actions: List[str]) -> Dict[str, Any]:
+        if not valid_actions:
+            return {"action": "fold"}
+        blueprint = self.blueprint
+        if blueprint is None or len(game_info.get('seats', [])) != blueprint.abstraction.players or 'seat' not in game_info:
+            return self.fallback.get_action(game_info, valid_actions)
+
+        bucket = blueprint.abstraction.bucket(game_info['my_hand'], game_info['board'])
+        moves = abstract_actions(game_info, valid_actions)
+        columns = list(moves)
+        weights = blueprint.policy(game_info, bucket)[columns]
+        if weights.sum() <= 0:
+            return self.fallback.get_action(game_info, valid_actions)
+        weights = weights / weights.sum()
+        i = self.rng.choice(len(columns), p=weights)
+        action, amount = moves[columns[i]]
+        return {"action": action, "amount": amount, "reasoning": f"CFR blueprint: {ACTIONS[columns[i]]} ({weights[i]:.0%})"}
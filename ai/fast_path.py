@@ -0,0 +1,57 @@
+from typing import Any, Dict, List, Optional
+
+class FastPathPolicy:
+    """
+    Answers clear-cut spots locally so PokerAgent only asks the LLM about
+    marginal ones. Every rule works from the equity the agent already computed,
+    the pot odds from TexasHoldemGame.calculate_pot_odds and the seat position
+    from TexasHoldemGame.get_player_position (both in game_info).
+
+      trash_check: check for free when equity < trash_check * fair share (1 / players)
+      hopeless_fold: fold when equity < hopeless_fold * the pot odds needed to call
+      nuts_equity: put the whole stack in at or above this equity
+      out_of_position_factor: scales hopeless_fold for early/blind seats, which
+          have to play the rest of the hand first
+    Set a threshold to 0 (or nuts_equity above 1) to turn its rule off.
+    """
+    LATE_POSITIONS = ("BTN", "CO", "SB/BTN")
+
+    def __init__(self, trash_check: float = 0.6, hopeless_fold: float = 0.5, nuts_equity: float = 0.95, out_of_position_factor: float = 1.2):
+        self.trash_check = trash_check
+        self.hopeless_fold = hopeless_fold
+        self.nuts_equity = nuts_equity
+        self.out_of_position_factor = out_of_position_factor
+
+    def decide(self, game_info: Dict[str, Any], valid_actions: List[str], equity: float) -> Optional[Dict[str, Any]]:
+        """A decision dict for a clear-cut spot, or None to escalate to the LLM."""
+        to_call = game_info.get('to_call', 0)
+        my_chips = game_info.get('my_chips', 0)
+        num_players = max(2, game_info.get('num_active_players', 2))
+
+        if equity >= self.nuts_equity:
+            if "raise" in valid_actions and my_chips > to_call:
+                return self._decision("raise", f"Fast path: {equity:.0%} equity, getting it all in", my_chips - to_call)
+            if "all_in" in valid_actions:
+                return self._decision("all_in", f"Fast path: {equity:.0%} equity, all in")
+            if "call" in valid_actions:
+                return self._decision("call", f"Fast path: {equity:.0%} equity, calling")
+
+        if to_call <= 0:
+            if "check" in valid_actions and equity < self.trash_check / num_players:
+                return self._decision("check", f"Fast path: free check with {equity:.0%} equity")
+            return None
+
+        pot_odds = (game_info.get('pot_odds') or {}).get('pot_odds')
+        if pot_odds is None:
+            pot = game_info.get('pot', 0)
+            pot_odds = to_call / (pot + to_call)
+        fold_below = self.hopeless_fold * pot_odds
+        if game_info.get('position') not in self.LATE_POSITIONS:
+            fold_below *= self.out_of_position_factor
+        if "fold" in valid_actions and equity < fold_below:
+            return self._decision("fold", f"Fast path: {equity:.0%} equity vs {pot_odds:.0%} needed")
+        return None
+
+    @staticmethod
+    def _decision(action: str, reasoning: str, amount: int = 0) -> Dict[str, Any]:
+        return {"action": action, "amount": amount, "reasoning": reasoning, "chat": "", "source": "fast_path"}
@@ -0,0 +1,128 @@
+import json
+import re
+from typing import Any, Dict, List
+
+# A trailing backslash escape that has not fully arrived yet (\, \u, \u0 ...)
+_PARTIAL_ESCAPE = re.compile(r'(?<!\\)(\\\\)*\\(u[0-9a-fA-F]{0,3})?$')
+
+class JSONFieldStream:
+    """
+    Incremental parser for the top-level fields of one JSON object arriving in
+    chunks (a streamed LLM reply). feed() returns events as soon as they can be
+    known:
+      {"type": "field", "key": k, "value": v}  a top-level field is complete
+      {"type": "delta", "key": k, "text": t}   more of a string field's text
+    Anything before the first '{' (e.g. a ```json fence) and after the closing
+    '}' is ignored. Nested values are reported whole once they close.
+    """
+    def __init__(self):
+        self.fields: Dict[str, Any] = {}
+        self.done = False
+        self._state = "start"
+        self._key = ""
+        self._raw: List[str] = []
+        self._escape = False
+        self._in_string = False
+        self._depth = 0
+        self._emitted = ""
+
+    def feed(self, text: str) -> List[Dict[str, Any]]:
+        events: List[Dict[str, Any]] = []
+        for ch in text:
+            if self.done:
+                break
+            self._step(ch, events)
+        if self._state == "string":
+            self._string_delta(events)
+        return events
+
+    def _step(self, ch: str, events: List[Dict[str, Any]]):
+        state = self._state
+        if state == "start":
+            if ch == "{":
+                self._state = "key"
+        elif state == "key":
+            if ch == '"':
+                self._state, self._raw, self._escape = "key_string", [], False
+            elif ch == "}":
+                self.done = True
+        elif state == "key_string":
+            if self._escape:
+                self._escape = False
+            elif ch == "\\":
+                self._escape = True
+            elif ch == '"':
+                self._key = json.loads('"' + "".join(self._raw) + '"')
+                self._state = "colon"
+                return
+            self._raw.append(ch)
+        elif state == "colon":
+            if ch == ":":
+                self._state = "value"
+        elif state == "value":
+            if ch.isspace():
+                return
+            self._raw, self._escape = [], False
+            if ch == '"':
+                self._state, self._emitted = "string", ""
+            elif ch in "{[":
+                self._state, self._depth, self._in_string = "nested", 1, False
+                self._raw.append(ch)
+            else:
+                self._state = "scalar"
+                self._raw.append(ch)
+        elif state == "string":
+            if self._escape:
+                self._escape = False
+            elif ch == "\\":
+                self._escape = True
+            elif ch == '"':
+                self._string_delta(events)
+                self._finish(json.loads('"' + "".join(self._raw) + '"'), events)
+                return
+            self._raw.append(ch)
+        elif state == "nested":
+            self._raw.append(ch)
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._finish(json.loads("".join(self._raw)), events)
+        elif state == "scalar":
+            if ch in ",}" or ch.isspace():
+                self._finish(json.loads("".join(self._raw)), events)
+                if ch == "}":
+                    self.done = True
+            else:
+                self._raw.append(ch)
+        elif state == "after_value":
+            if ch == ",":
+                self._state = "key"
+            elif ch == "}":
+                self.done = True
+
+    def _finish(self, value: Any, events: List[Dict[str, Any]]):
+        self.fields[self._key] = value
+        events.append({"type": "field", "key": self._key, "value": value})
+        self._state = "key" if self._state == "scalar" else "after_value"
+
+    def _string_delta(self, events: List[Dict[str, Any]]):
+        """Report the decoded text of the current string value that is new since the last delta."""
+        raw = "".join(self._raw)
+        decoded = json.loads('"' + _PARTIAL_ESCAPE.sub(lambda m: m.group(1) or "", raw) + '"')
+        if decoded and "\ud800" <= decoded[-1] <= "\udbff":
+            # Wait for the low half of a surrogate pair
+            decoded = decoded[:-1]
+        if len(decoded) > len(self._emitted):
+            events.append({"type": "delta", "key": self._key, "text": decoded[len(self._emitted):]})
+            self._emitted = decoded
@@ -1,6 +1,11 @@
 import os
 import json
-from typing import List, Dict, Any, Optional
+import asyncio
+import concurrent.futures
+import queue
+import threading
+import time
+from typing import List, Dict, Any, Iterator, Optional, Tuple, Union
 import logging
 
 # Load environment variables from .env file
@@ -16,60 +21,364 @@ except ImportError:
     # If not found, we might want to alert or define a dummy
     pass
 
-from openai import OpenAI
+from openai import AsyncOpenAI
+from .response_cache import ResponseStore, response_cache_key
+from .json_stream import JSONFieldStream
+from .resilience import ProviderHealth
+
+ZHIPU_BASE_URL = "https://open.bigmodel.cn/api/paas/v4/"
+
+# Max requests in flight per provider, shared by every LLMClient in the process
+CONCURRENCY_LIMITS = {"openai": 16, "zhipu": 8}
+
+# Circuit breaker settings for each provider endpoint (applied when its health tracker is created)
+BREAKER_SETTINGS = {"failure_threshold": 5, "reset_timeout": 30.0}
+
+# Successful calls needed before a "p95" hedge threshold is trusted
+MIN_HEDGE_SAMPLES = 20
+
+# One event loop thread hosts every request, so all agents share one pooled
+# HTTP session per (provider, key, base_url) and one semaphore per provider.
+_STATE_LOCK = threading.Lock()
+_STATE: Dict[str, Any] = {"pid": None, "loop": None, "clients": {}, "semaphores": {}, "health": {}}
+
+def _state() -> Dict[str, Any]:
+    """Shared loop/clients, rebuilt after a fork (the loop thread does not survive it)."""
+    with _STATE_LOCK:
+        if _STATE["pid"] != os.getpid():
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="llm-client-loop", daemon=True).start()
+            _STATE.update(pid=os.getpid(), loop=loop, clients={}, semaphores={}, health={})
+        return _STATE
+
+def _shared_client(provider: str, api_key: str, base_url: Optional[str], max_retries: Optional[int] = None):
+    """The process-wide SDK client (and its connection pool) for these credentials and retry policy."""
+    state = _state()
+    key: Tuple = (provider, api_key, base_url, max_retries)
+    with _STATE_LOCK:
+        client = state["clients"].get(key)
+        if client is None:
+            # None keeps the SDK's own retry default
+            options = {} if max_retries is None else {"max_retries": max_retries}
+            if provider == "zhipu":
+                client = ZhipuAiClient(api_key=api_key, **options)
+            else:
+                client = AsyncOpenAI(api_key=api_key, base_url=base_url, **options)
+            state["clients"][key] = client
+        return client
+
+def provider_health(provider: str, endpoint: Optional[str]) -> ProviderHealth:
+    """The process-wide latency/outcome counters and circuit breaker for one endpoint."""
+    state = _state()
+    with _STATE_LOCK:
+        health = state["health"].get((provider, endpoint))
+        if health is None:
+            health = state["health"][(provider, endpoint)] = ProviderHealth(**BREAKER_SETTINGS)
+        return health
+
+def _semaphore(provider: str) -> asyncio.Semaphore:
+    """Per-provider concurrency limit; only called on the shared loop."""
+    semaphores = _state()["semaphores"]
+    if provider not in semaphores:
+        semaphores[provider] = asyncio.Semaphore(CONCURRENCY_LIMITS.get(provider, 8))
+    return semaphores[provider]
+
+def set_concurrency_limit(provider: str, limit: int):
+    """Change a provider's limit. Takes effect for semaphores created afterwards (call before the first request)."""
+    if limit < 1:
+        raise ValueError("Concurrency limit must be at least 1")
+    CONCURRENCY_LIMITS[provider] = limit
+    _state()["semaphores"].pop(provider, None)
 
 class LLMClient:
-    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None, model: str = "glm-4.5-air"):
+    """
+    Chat completions against Zhipu or any OpenAI-compatible endpoint.
+
+      timeout: deadline in seconds for each call, hedges included (None = no deadline)
+      hedge_after: send a duplicate request if the first has not answered after
+          this many seconds, and use whichever succeeds first; "p95" uses the
+          endpoint's recent p95 latency, None disables hedging
+    Every endpoint has a circuit breaker: after repeated failures or timeouts
+    calls fail fast with {"error": ..., "circuit_open": True} until a trial
+    request succeeds. stats() reports the endpoint's latency and outcome counters.
+    """
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None, model: str = "glm-4.5-air", cache: Optional[ResponseStore] = None, temperature: float = 0.5, max_retries: Optional[int] = None,
+                 timeout: Optional[float] = 30.0, hedge_after: Union[float, str, None] = "p95"):
+        if hedge_after is not None and hedge_after != "p95" and not isinstance(hedge_after, (int, float)):
+            raise ValueError(f"hedge_after must be seconds, 'p95' or None, not {hedge_after!r}")
         self.api_key = api_key or os.getenv("ZHIPU_API_KEY")
         if not self.api_key:
             raise ValueError("API key not provided. Set ZHIPU_API_KEY environment variable or pass api_key parameter.")
         self.base_url = base_url
         self.model = model
+        self.temperature = temperature
+        # Optional ResponseStore (e.g. ResponseCache): identical (model, temperature, messages) requests are answered locally
+        self.cache = cache
+        # Retries the SDK makes itself on errors (None = SDK default); 0 surfaces every failure
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.hedge_after = hedge_after
         self.provider = "openai"
+        self.endpoint: Optional[str] = None
 
         # Check if we should use ZhipuAI based on model name or availability
+        # Clients are shared process-wide, so every agent reuses the same connection pool
         if "glm" in self.model.lower():
-            if HAS_ZAI:
+            # An explicit base_url (e.g. a local mock server) is always OpenAI-compatible
+            if HAS_ZAI and not self.base_url:
                 self.provider = "zhipu"
-                self.client = ZhipuAiClient(api_key=self.api_key)
+                self.endpoint = ZHIPU_BASE_URL
+                self.client = _shared_client("zhipu", self.api_key, None, max_retries)
             else:
                 # Fallback to OpenAI standard but pointing to Zhipu Endpoint if not provided
                 self.provider = "openai"
-                zhipu_url = "https://open.bigmodel.cn/api/paas/v4/"
-                self.client = OpenAI(
-                    api_key=self.api_key,
-                    base_url=self.base_url or os.getenv("OPENAI_BASE_URL") or zhipu_url
-                )
+                self.endpoint = self.base_url or os.getenv("OPENAI_BASE_URL") or ZHIPU_BASE_URL
+                self.client = _shared_client("openai", self.api_key, self.endpoint, max_retries)
         else:
             # Standard OpenAI
-            self.client = OpenAI(
-                api_key=self.api_key,
-                base_url=self.base_url or os.getenv("OPENAI_BASE_URL")
-            )
+            self.endpoint = self.base_url or os.getenv("OPENAI_BASE_URL")
+            self.client = _shared_client("openai", self.api_key, self.endpoint, max_retries)
+        self.health = provider_health(self.provider, self.endpoint)
+
+    def available(self) -> bool:
+        """False while the endpoint's circuit breaker is refusing requests."""
+        return self.health.breaker.available()
+
+    def stats(self) -> Dict[str, Any]:
+        """Latency percentiles and outcome counters of this client's endpoint."""
+        return self.health.stats()
 
     def chat_completion(self, messages: List[Dict[str, str]], json_mode: bool = True) -> Dict[str, Any]:
         """
         Send messages to LLM and get response.
         If json_mode is True, attempts to parse JSON from response.
+        Blocking wrapper around achat_completion.
+        """
+        return self.submit(messages, json_mode).result()
+
+    def submit(self, messages: List[Dict[str, str]], json_mode: bool = True) -> "concurrent.futures.Future":
+        """Start a request without waiting; the Future resolves to what chat_completion returns."""
+        return asyncio.run_coroutine_threadsafe(self._complete(messages, json_mode), _state()["loop"])
+
+    def chat_completions(self, batch: List[List[Dict[str, str]]], json_mode: bool = True) -> List[Dict[str, Any]]:
+        """
+        Send several conversations at once and wait for all of them; requests
+        overlap up to the provider's concurrency limit. Results keep the input order.
+        """
+        futures = [self.submit(m, json_mode) for m in batch]
+        return [f.result() for f in futures]
+
+    async def achat_completion(self, messages: List[Dict[str, str]], json_mode: bool = True) -> Dict[str, Any]:
         """
+        Async version of chat_completion, usable from any event loop; run many
+        with asyncio.gather to overlap their round-trips.
+        """
+        return await asyncio.wrap_future(self.submit(messages, json_mode))
+
+    def stream_completion(self, messages: List[Dict[str, str]], json_mode: bool = True) -> Iterator[Dict[str, Any]]:
+        """
+        Streamed chat_completion: yields events while the reply is generated.
+          {"type": "field", "key": k, "value": v}  a top-level JSON field is complete
+          {"type": "delta", "key": k, "text": t}   more text of a string field
+                                                   (key "content" when not json_mode)
+          {"type": "done", "response": r}          r is what chat_completion would return
+        Fields arrive in the order the model writes them, so a caller can act on
+        the first ones while the rest is still being generated.
+        """
+        key = None
+        if self.cache is not None:
+            key = response_cache_key(self.model, self.temperature, messages, json_mode)
+            cached = self.cache.get(key)
+            if cached is not None:
+                for k, v in cached.items():
+                    yield {"type": "field", "key": k, "value": v}
+                self.health.record("cache_hit")
+                yield {"type": "done", "response": cached}
+                return
+        if not self.health.breaker.allow():
+            self.health.record("short_circuit")
+            yield {"type": "done", "response": self._circuit_open_error()}
+            return
+
+        start = time.perf_counter()
+        chunks: "queue.Queue[Optional[str]]" = queue.Queue()
+        future = asyncio.run_coroutine_threadsafe(self._stream(messages, json_mode, chunks), _state()["loop"])
+        parser: Optional[JSONFieldStream] = JSONFieldStream() if json_mode else None
+        content = []
+        timed_out = False
+        while True:
+            try:
+                remaining = None if self.timeout is None else max(0.0, start + self.timeout - time.perf_counter())
+                chunk = chunks.get(timeout=remaining)
+            except queue.Empty:
+                # Deadline passed mid-stream: abandon the request (hedging does not apply to streams)
+                future.cancel()
+                timed_out = True
+                break
+            if chunk is None:
+                break
+            content.append(chunk)
+            if not json_mode:
+                yield {"type": "delta", "key": "content", "text": chunk}
+            elif parser is not None:
+                try:
+                    yield from parser.feed(chunk)
+                except json.JSONDecodeError:
+                    # Not parseable incrementally; the full text is parsed at the end
+                    parser = None
+
+        text = "".join(content)
+        if timed_out:
+            response: Dict[str, Any] = self._timeout_error()
+        elif future.result() is not None:
+            response = {"error": future.result(), "provider_error": True}
+        elif not json_mode:
+            response = {"content": text}
+        elif parser is not None and parser.done and parser.fields:
+            response = parser.fields
+        else:
+            response = self._parse_json(text)
+        self._settle(response, start)
+        if key is not None and "error" not in response:
+            self.cache.put(key, response)
+        yield {"type": "done", "response": response}
+
+    async def _stream(self, messages: List[Dict[str, str]], json_mode: bool, chunks: queue.Queue) -> Optional[str]:
+        """Runs on the shared loop: puts content deltas on chunks, then None. Returns an error message or None."""
         try:
-            if self.provider == "zhipu":
-                 # ZhipuAI specific call structure (matches OpenAI mostly)
-                 response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=messages,
-                    temperature=0.5
-                    # Zhipu SDK might not support response_format={"type": "json_object"} directly or consistently?
-                    # test.py didn't use it. Let's assume we don't use it for zhipu or try it.
-                    # Best to clean prompt to ask for JSON.
-                )
-            else:
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=messages, # type: ignore
-                    response_format={"type": "json_object"} if json_mode else None,  # pyright: ignore[reportArgumentType]
-                    temperature=0.5
-                )
+            async with _semaphore(self.provider):
+                if self.provider == "zhipu":
+                    # The SDK's stream is a blocking iterator: drain it on a worker thread
+                    def drain():
+                        stream = self.client.chat.completions.create(
+                            model=self.model, messages=messages, temperature=self.temperature, stream=True)
+                        for chunk in stream:
+                            if chunk.choices and chunk.choices[0].delta.content:
+                                chunks.put(chunk.choices[0].delta.content)
+                    await asyncio.to_thread(drain)
+                else:
+                    stream = await self.client.chat.completions.create(
+                        model=self.model,
+                        messages=messages, # type: ignore
+                        response_format={"type": "json_object"} if json_mode else None,  # pyright: ignore[reportArgumentType]
+                        temperature=self.temperature,
+                        stream=True,
+                        **self._sdk_timeout()
+                    )
+                    async for chunk in stream:
+                        if chunk.choices and chunk.choices[0].delta.content:
+                            chunks.put(chunk.choices[0].delta.content)
+            return None
+        except Exception as e:
+            logging.error(f"LLM API Error: {e}")
+            return str(e)
+        finally:
+            chunks.put(None)
+
+    async def _complete(self, messages: List[Dict[str, str]], json_mode: bool) -> Dict[str, Any]:
+        """Runs on the shared loop: the cached response, or a request to the provider."""
+        key = None
+        if self.cache is not None:
+            key = response_cache_key(self.model, self.temperature, messages, json_mode)
+            # A disk-backed cache does SQLite I/O: keep it off the shared loop
+            cached = await asyncio.to_thread(self.cache.get, key)
+            if cached is not None:
+                self.health.record("cache_hit")
+                return cached
+        if not self.health.breaker.allow():
+            self.health.record("short_circuit")
+            return self._circuit_open_error()
+
+        start = time.perf_counter()
+        try:
+            response = await asyncio.wait_for(self._hedged_request(messages, json_mode), self.timeout)
+        except asyncio.TimeoutError:
+            response = self._timeout_error()
+        self._settle(response, start)
+        # Errors are not cached, so a later identical request retries the provider
+        if key is not None and "error" not in response:
+            await asyncio.to_thread(self.cache.put, key, response)
+        return response
+
+    def _hedge_delay(self) -> Optional[float]:
+        if self.hedge_after == "p95":
+            return self.health.percentile(0.95, MIN_HEDGE_SAMPLES)
+        return self.hedge_after  # type: ignore
+
+    async def _hedged_request(self, messages: List[Dict[str, str]], json_mode: bool) -> Dict[str, Any]:
+        """_request, duplicated once if it is slower than the hedge threshold; the first success wins."""
+        delay = self._hedge_delay()
+        if delay is None:
+            return await self._request(messages, json_mode)
+        primary = asyncio.ensure_future(self._request(messages, json_mode))
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done:
+                return primary.result()
+            if _semaphore(self.provider).locked():
+                # Slow because requests are queueing locally: a duplicate would only add load
+                return await primary
+            hedge = asyncio.ensure_future(self._request(messages, json_mode))
+            tasks.add(hedge)
+            response: Dict[str, Any] = {}
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    response = task.result()
+                    if "error" not in response:
+                        self.health.record_hedge(won=task is hedge)
+                        return response
+            # Both failed: report the last error
+            self.health.record_hedge(won=False)
+            return response
+        finally:
+            # The loser (or both, on a deadline) is cancelled
+            for task in tasks:
+                task.cancel()
+
+    def _settle(self, response: Dict[str, Any], start: float):
+        """Record one call's outcome and feed the circuit breaker."""
+        if response.get("timeout") or response.get("provider_error"):
+            self.health.record("timeout" if response.get("timeout") else "error")
+            self.health.breaker.record_failure()
+        else:
+            # Unparseable model output still means the provider is up
+            self.health.record("error" if "error" in response else "success", time.perf_counter() - start)
+            self.health.breaker.record_success()
+
+    def _timeout_error(self) -> Dict[str, Any]:
+        logging.error(f"LLM call timed out after {self.timeout}s")
+        return {"error": f"Timed out after {self.timeout}s", "timeout": True}
+
+    @staticmethod
+    def _circuit_open_error() -> Dict[str, Any]:
+        return {"error": "Circuit open: provider degraded", "circuit_open": True}
+
+    async def _request(self, messages: List[Dict[str, str]], json_mode: bool) -> Dict[str, Any]:
+        """One request under the provider's concurrency limit."""
+        try:
+            async with _semaphore(self.provider):
+                if self.provider == "zhipu":
+                    # ZhipuAI specific call structure (matches OpenAI mostly); the SDK is
+                    # synchronous, so the call runs on a worker thread
+                    response = await asyncio.to_thread(
+                        self.client.chat.completions.create,
+                        model=self.model,
+                        messages=messages,
+                        temperature=self.temperature
+                        # Zhipu SDK might not support response_format={"type": "json_object"} directly or consistently?
+                        # test.py didn't use it. Let's assume we don't use it for zhipu or try it.
+                        # Best to clean prompt to ask for JSON.
+                    )
+                else:
+                    response = await self.client.chat.completions.create(
+                        model=self.model,
+                        messages=messages, # type: ignore
+                        response_format={"type": "json_object"} if json_mode else None,  # pyright: ignore[reportArgumentType]
+                        temperature=self.temperature,
+                        **self._sdk_timeout()
+                    )
             
             # OpenAI 1.x / ZhipuAI response structure
             if not response.choices:
@@ -81,28 +390,37 @@ class LLMClient:
                  return {"error": "Empty response content", "raw": response}
 
             if json_mode:
-                try:
-                    # Clean content (remove markdown backticks if any)
-                    clean_content = content.strip()
-                    if clean_content.startswith("```json"):
-                        clean_content = clean_content[7:]
-                    if clean_content.startswith("```"):
-                        clean_content = clean_content[3:]
-                    if clean_content.endswith("```"):
-                        clean_content = clean_content[:-3]
-                    
-                    return json.loads(clean_content.strip())
-                except json.JSONDecodeError:
-                    logging.error(f"Failed to parse JSON: {content}")
-                    return {"error": "Invalid JSON response", "raw": content}
+                return self._parse_json(content)
             
             return {"content": content}
             
         except Exception as e:
             logging.error(f"LLM API Error: {e}")
-            return {"error": str(e)}
+            return {"error": str(e), "provider_error": True}
+
+    def _sdk_timeout(self) -> Dict[str, Any]:
+        """Per-request HTTP timeout for the OpenAI SDK, so the socket gives up with the deadline."""
+        return {} if self.timeout is None else {"timeout": self.timeout}
+
+    @staticmethod
+    def _parse_json(content: str) -> Dict[str, Any]:
+        try:
+            # Clean content (remove markdown backticks if any)
+            clean_content = content.strip()
+            if clean_content.startswith("```json"):
+                clean_content = clean_content[7:]
+            if clean_content.startswith("```"):
+                clean_content = clean_content[3:]
+            if clean_content.endswith("```"):
+                clean_content = clean_content[:-3]
+
+            return json.loads(clean_content.strip())
+        except json.JSONDecodeError:
+            logging.error(f"Failed to parse JSON: {content}")
+            return {"error": "Invalid JSON response", "raw": content}
 
-    def mock_completion(self, action="call", reason="Random move"):
+    @staticmethod
+    def mock_completion(action="call", reason="Random move"):
         return {
             "action": action,
             "amount": 0,
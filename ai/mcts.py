@@ -0,0 +1,299 @@
+import math
+import random
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from game.engine import TexasHoldemGame, GameStage
+from game.models import Player, PlayerState, FULL_DECK, card_to_int
+from .bots import RuleBot, _EVALUATOR
+
+# Raise sizes the search considers, as fractions of the pot
+DEFAULT_RAISE_SIZES = (0.5, 1.0)
+
+# Safety net for rollouts, as in game.simulation
+MAX_ROLLOUT_ACTIONS = 200
+
+# Root-parallel search pools, one per worker count, kept apart from the equity pools
+_SEARCH_POOLS: Dict[int, ProcessPoolExecutor] = {}
+_SEARCH_POOLS_LOCK = threading.Lock()
+
+def get_search_pool(workers: int) -> ProcessPoolExecutor:
+    """Return the persistent search pool for this worker count, starting it if needed."""
+    with _SEARCH_POOLS_LOCK:
+        pool = _SEARCH_POOLS.get(workers)
+        if pool is None:
+            pool = ProcessPoolExecutor(max_workers=workers)
+            _SEARCH_POOLS[workers] = pool
+        return pool
+
+def shutdown_search_pools():
+    """Stop every pool started by get_search_pool()."""
+    with _SEARCH_POOLS_LOCK:
+        for pool in _SEARCH_POOLS.values():
+            pool.shutdown(wait=True)
+        _SEARCH_POOLS.clear()
+
+
+class _Node:
+    """One of our decision points in the tree, with its edges keyed by action."""
+    __slots__ = ("visits", "edges")
+
+    def __init__(self):
+        self.visits = 0
+        # action key -> [visits, total reward of the seat choosing it]
+        self.edges: Dict[str, List[float]] = {}
+
+
+class MCTSBot:
+    """
+    Information-set Monte Carlo tree search on TexasHoldemGame, with the same
+    get_action(game_info, valid_actions) contract as PokerAgent and the bots.
+    Needs no network and answers within its budget.
+
+    Every iteration deals the unseen cards at random (opponents' hole cards,
+    then the rest of the deck) and plays the hand out through step(). Our own
+    decisions walk one tree, keyed by the public action sequence (raises bucketed
+    to raise_sizes or a shove) and shared by all those deals, with UCB1 until a
+    new node is added; opponents, and our decisions past that node, are played
+    by a cheap model policy that sees the cards dealt this iteration. The chips won or lost are credited along the
+    path, and the most visited root action is played.
+
+      iterations / time_limit: per-decision budget; the search stops at
+          whichever runs out first (None = no limit of that kind)
+      workers: processes searching independent trees (root parallelism)
+          whose root statistics are summed
+      raise_sizes: raises the search considers, as fractions of the pot
+      exploration: UCB1 constant; rewards are scaled to the pot plus own stack
+      rollout_policy: the model, any get_action policy; it gets a minimal
+          game_info (hand, board, pot, bets, stack, stage, players in the
+          hand, big blind). Default: RuleBot
+    """
+    def __init__(self, name: str = "MCTS", iterations: Optional[int] = 2000, time_limit: Optional[float] = 1.0,
+                 workers: int = 1, raise_sizes: Tuple[float, ...] = DEFAULT_RAISE_SIZES, exploration: float = 0.7,
+                 rollout_policy: Any = None, seed: Optional[int] = None):
+        if iterations is None and time_limit is None:
+            raise ValueError("MCTSBot needs an iteration or a time budget")
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.name = name
+        self.iterations = iterations
+        self.time_limit = time_limit
+        self.workers = workers
+        self.raise_sizes = tuple(raise_sizes)
+        self.exploration = exploration
+        self.rollout_policy = rollout_policy
+        self.rng = random.Random(seed)
+        # Also answers directly for game_info without the seat layout (e.g. hand-built states)
+        self.model = rollout_policy if rollout_policy is not None else RuleBot(name, seed=seed)
+
+    def settings(self) -> Dict[str, Any]:
+        """Constructor arguments for the single-process searches run by worker processes."""
+        return {"name": self.name, "iterations": self.iterations, "time_limit": self.time_limit,
+                "raise_sizes": self.raise_sizes, "exploration": self.exploration, "rollout_policy": self.rollout_policy}
+
+    def get_action(self, game_info: Dict[str, Any], valid_actions: List[str]) -> Dict[str, Any]:
+        if not valid_actions:
+            return {"action": "fold"}
+        if len(valid_actions) == 1:
+            return {"action": valid_actions[0], "amount": 0}
+        if not game_info.get('seats') or 'seat' not in game_info:
+            return self.model.get_action(game_info, valid_actions)
+
+        if self.workers > 1:
+            pool = get_search_pool(self.workers)
+            iterations = -(-self.iterations // self.workers) if self.iterations is not None else None
+            futures = [pool.submit(_search_in_worker, self.settings(), game_info, valid_actions, iterations, self.rng.randrange(2 ** 32))
+                       for _ in range(self.workers)]
+            stats: Dict[str, List[float]] = {}
+            for future in futures:
+                for key, (visits, total) in future.result().items():
+                    edge = stats.setdefault(key, [0, 0.0])
+                    edge[0] += visits
+                    edge[1] += total
+        else:
+            stats = self.search(game_info, valid_actions)
+
+        key, (visits, total) = max(stats.items(), key=lambda item: item[1][0])
+        action, amount = self._decode(key, game_info['pot'], game_info.get('big_blind', 20), game_info['my_chips'] - game_info['to_call'])
+        runs = sum(edge[0] for edge in stats.values())
+        return {"action": action, "amount": amount,
+                "reasoning": f"MCTS: {key} in {visits:.0f} of {runs:.0f} runs, EV {total / max(visits, 1):+.0f} chips"}
+
+    def search(self, game_info: Dict[str, Any], valid_actions: List[str], iterations: Optional[int] = None) -> Dict[str, List[float]]:
+        """
+        Run one search from this decision point. Returns the root edges:
+        {action key: [visits, total chips won]}, e.g. 'call' or 'raise:0.5'.
+        """
+        iterations = iterations if iterations is not None else self.iterations
+        game, root = self._root_game(game_info)
+        seat = game_info['seat']
+        me = game.players[seat]
+        my_hand = [card_to_int(c) for c in game_info['my_hand']]
+        known = set(my_hand) | {c.index for c in game.board}
+        unseen = [c for c in range(52) if c not in known]
+        holders = [i for i, p in enumerate(game.players) if i != seat and p.status != PlayerState.OUT]
+        start_chips = me.chips
+        scale = max(game.pot + me.chips, game.big_blind)
+        root_actions = [key for key in self._actions(game, me) if key.split(":")[0] in valid_actions]
+
+        tree: Dict[Tuple[str, ...], _Node] = {}
+        deadline = time.perf_counter() + self.time_limit if self.time_limit is not None else None
+        done = 0
+        while iterations is None or done < iterations:
+            # Checking the clock every few runs keeps its cost out of the loop
+            if deadline is not None and done % 8 == 0 and done and time.perf_counter() >= deadline:
+                break
+            game.restore(root)
+            self._deal(game, seat, my_hand, unseen, holders)
+            self._iterate(game, tree, seat, root_actions, start_chips, scale)
+            done += 1
+
+        node = tree.get(())
+        return {key: [edge[0], edge[1] * scale] for key, edge in node.edges.items()} if node else {}
+
+    def _root_game(self, info: Dict[str, Any]) -> Tuple[TexasHoldemGame, Any]:
+        """A game in the decision's public state (no hidden cards dealt), and its snapshot."""
+        big_blind = info.get('big_blind', 20)
+        game = TexasHoldemGame(small_blind=big_blind // 2, big_blind=big_blind, evaluator=_EVALUATOR)
+        for seat in info['seats']:
+            player = Player(seat['name'], chips=seat['chips'])
+            player.current_bet = seat['bet']
+            player.total_bet = seat.get('total_bet', seat['bet'])
+            player.status = PlayerState(seat.get('status', 'active'))
+            player.acted_in_round = seat.get('acted', False)
+            game.add_player(player)
+        game.board = [FULL_DECK[card_to_int(c)] for c in info.get('board', [])]
+        game.deck.cards = []
+        game.pot = info['pot']
+        game.current_bet = info['current_bet']
+        game.stage = GameStage[info['stage']]
+        game.dealer_index = info.get('dealer', 0)
+        game.current_player_index = info['seat']
+        # Still owed an action: not acted yet this round, or facing a bet
+        game.to_act_mask = sum(1 << i for i, p in enumerate(game.players)
+                               if p.status == PlayerState.ACTIVE and (not p.acted_in_round or p.current_bet < game.current_bet))
+        return game, game.snapshot()
+
+    def _deal(self, game: TexasHoldemGame, seat: int, my_hand: List[int], unseen: List[int], holders: List[int]):
+        """One guess at the hidden cards: opponents' hole cards, then the deck order."""
+        cards = list(unseen)
+        self.rng.shuffle(cards)
+        game.players[seat].hand = [FULL_DECK[c] for c in my_hand]
+        for i in holders:
+            game.players[i].hand = [FULL_DECK[cards.pop()], FULL_DECK[cards.pop()]]
+        game.deck.cards = [FULL_DECK[c] for c in cards]
+
+    def _iterate(self, game: TexasHoldemGame, tree: Dict[Tuple[str, ...], _Node], seat: int, root_actions: List[str],
+                 start_chips: int, scale: float):
+        """Selection, expansion, rollout and backpropagation for one dealt game."""
+        path: List[Tuple[_Node, str]] = []
+        history: Tuple[str, ...] = ()
+        expanded = False
+        actions = 0
+        while game.stage != GameStage.GAME_OVER:
+            acting = game.current_player_index
+            player = game.players[acting]
+            if acting != seat:
+                # Opponents play the model, on the cards dealt to them this iteration
+                action, amount = self._model_action(game, player)
+                key = self._encode(action, amount, game.pot, player.chips - (game.current_bet - player.current_bet))
+                game.step(action, amount)
+                history += (f"{acting}:{key}",)
+            elif expanded:
+                # Past the new node: our own later decisions are rolled out too
+                game.step(*self._model_action(game, player))
+            else:
+                node = tree.get(history)
+                if node is None:
+                    node = tree[history] = _Node()
+                    expanded = True
+                key = self._select(node, root_actions if not history else self._actions(game, player))
+                path.append((node, key))
+                game.step(*self._decode(key, game.pot, game.big_blind, player.chips - (game.current_bet - player.current_bet)))
+                history += (key,)
+            actions += 1
+            if actions > MAX_ROLLOUT_ACTIONS:
+                raise ValueError(f"Rollout did not finish within {MAX_ROLLOUT_ACTIONS} actions")
+
+        reward = (game.players[seat].chips - start_chips) / scale
+        for node, key in path:
+            edge = node.edges.setdefault(key, [0, 0.0])
+            edge[0] += 1
+            edge[1] += reward
+            node.visits += 1
+
+    def _select(self, node: _Node, actions: List[str]) -> str:
+        """UCB1 over the legal actions, trying each untried one first."""
+        untried = [key for key in actions if key not in node.edges]
+        if untried:
+            return self.rng.choice(untried)
+        log_visits = math.log(node.visits)
+        return max(actions, key=lambda key: node.edges[key][1] / node.edges[key][0]
+                   + self.exploration * math.sqrt(log_visits / node.edges[key][0]))
+
+    def _actions(self, game: TexasHoldemGame, player: Player) -> List[str]:
+        """The engine's legal actions, with 'raise' expanded to the pot fractions that fit in the stack, and a shove."""
+        keys = []
+        to_call = game.current_bet - player.current_bet
+        for action in game.get_legal_actions(player):
+            if action != "raise":
+                keys.append(action)
+                continue
+            for size in self.raise_sizes:
+                if to_call + max(game.big_blind, int(game.pot * size)) < player.chips:
+                    keys.append(f"raise:{size}")
+            keys.append("raise:all")
+        return keys
+
+    def _encode(self, action: str, amount: int, pot: int, behind: int) -> str:
+        """Action key for an opponent's move: raises are bucketed to the nearest raise size, or a shove."""
+        if action != "raise":
+            return action
+        if amount >= behind:
+            return "raise:all"
+        fraction = amount / max(pot, 1)
+        return f"raise:{min(self.raise_sizes, key=lambda size: abs(size - fraction))}"
+
+    @staticmethod
+    def _decode(key: str, pot: int, big_blind: int, behind: int) -> Tuple[str, int]:
+        """(engine action, raise amount) for an action key; `behind` is the stack left after calling."""
+        if key == "raise:all":
+            return "raise", behind
+        if key.startswith("raise:"):
+            return "raise", max(big_blind, int(pot * float(key[6:])))
+        return key, 0
+
+    def _model_action(self, game: TexasHoldemGame, player: Player) -> Tuple[str, int]:
+        """What the model policy plays for this seat, holding the cards it was dealt."""
+        valid_actions = game.get_legal_actions(player)
+        to_call = game.current_bet - player.current_bet
+        info = {
+            'my_hand': [c.index for c in player.hand],
+            'board': [c.index for c in game.board],
+            'pot': game.pot,
+            'current_bet': game.current_bet,
+            'to_call': to_call,
+            'my_chips': player.chips,
+            'my_bet': player.current_bet,
+            'num_active_players': game.live_mask.bit_count(),
+            'stage': game.stage.name,
+            'big_blind': game.big_blind,
+        }
+        decision = self.model.get_action(info, valid_actions)
+        action = decision.get("action")
+        if action not in valid_actions:
+            action = "check" if "check" in valid_actions else "fold"
+        if action != "raise":
+            return action, 0
+        try:
+            amount = int(decision.get("amount") or 0)
+        except (TypeError, ValueError):
+            amount = 0
+        return action, min(max(amount, game.big_blind), player.chips - to_call)
+
+
+def _search_in_worker(settings: Dict[str, Any], game_info: Dict[str, Any], valid_actions: List[str],
+                      iterations: Optional[int], seed: int) -> Dict[str, List[float]]:
+    """Runs inside a pool worker: one independent single-process search."""
+    return MCTSBot(seed=seed, **settings).search(game_info, valid_actions, iterations)
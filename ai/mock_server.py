@@ -0,0 +1,249 @@
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from .llm_client import LLMClient
+from .response_cache import response_cache_key
+
+_VALID_ACTIONS = re.compile(r"Valid Actions:\s*([a-z_, ]+)")
+_DECISION_ID = re.compile(r"^### Decision id (\d+)$", re.MULTILINE)
+
+def default_responder(messages: List[Dict[str, str]]) -> Dict[str, Any]:
+    """
+    Passive but legal poker decision: check if allowed, else call, else fold,
+    read from the 'Valid Actions:' line PokerAgent puts in its prompt.
+    A DecisionBatcher multi-decision prompt gets one such decision per id.
+    """
+    content = messages[-1].get("content", "") if messages else ""
+    parts = _DECISION_ID.split(content)
+    if len(parts) > 1:
+        return {"decisions": {i: _passive_decision(text) for i, text in zip(parts[1::2], parts[2::2])}}
+    return _passive_decision(content)
+
+def _passive_decision(content: str) -> Dict[str, Any]:
+    match = _VALID_ACTIONS.search(content)
+    valid = [a.strip() for a in match.group(1).split(",")] if match else []
+    for action in ("check", "call"):
+        if action in valid:
+            return LLMClient.mock_completion(action, "Mock server: passive line")
+    return LLMClient.mock_completion("fold", "Mock server: nothing free to do")
+
+
+class FixtureStore:
+    """
+    Recorded LLM responses in a JSON file, keyed like ResponseCache
+    (response_cache_key), so it plugs into LLMClient(cache=...):
+      mode="record": every request goes to the provider and its response is saved
+      mode="replay": responses come from the file; unknown requests miss
+    Recordings are written by save() or close() (also on leaving a with block).
+    MockLLMServer can also serve a store over HTTP.
+    """
+    def __init__(self, path: str, mode: str = "replay"):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown fixture mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.dirty = False
+        self._lock = threading.Lock()
+        try:
+            with open(path) as f:
+                self.entries = json.load(f).get("entries", {})
+        except FileNotFoundError:
+            if mode == "replay":
+                raise ValueError(f"Fixture file not found: {path}")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        if self.mode == "record":
+            return None
+        entry = self.entries.get(key)
+        return json.loads(json.dumps(entry["response"])) if entry else None
+
+    def put(self, key: str, response: Dict[str, Any]):
+        if self.mode != "record":
+            return
+        with self._lock:
+            self.entries[key] = {"response": response}
+            self.dirty = True
+
+    def save(self):
+        with self._lock:
+            if not self.dirty:
+                return
+            with open(self.path, "w") as f:
+                json.dump({"version": 1, "entries": self.entries}, f, indent=1, ensure_ascii=False)
+            self.dirty = False
+
+    def close(self):
+        self.save()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class MockLLMServer:
+    """
+    OpenAI-compatible stand-in for /v1/chat/completions on localhost, for
+    offline tests and benchmarks. Point an LLMClient at it with
+    base_url=server.url (any api_key works).
+
+      latency: seconds added before each reply; jitter adds uniform(0, jitter)
+      error_rate: fraction of requests answered with error_status instead
+      responder: callable(messages) -> dict or str producing the reply content
+      fixtures: FixtureStore to replay; requests it has no entry for use the
+          responder unless strict, in which case they get a 404
+      seed: seeds the jitter/error RNG so a run is reproducible
+      chunk_chars, token_latency: "stream": true requests get the reply as
+          server-sent events of chunk_chars characters, token_latency apart
+    stats() counts requests, errors and fixture hits.
+    """
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, error_status: int = 500, responder: Optional[Callable] = None,
+                 fixtures: Optional[FixtureStore] = None, strict: bool = False, seed: Optional[int] = None,
+                 chunk_chars: int = 4, token_latency: float = 0.0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.responder = responder or default_responder
+        self.fixtures = fixtures
+        self.strict = strict
+        self.rng = random.Random(seed)
+        self.chunk_chars = max(1, chunk_chars)
+        self.token_latency = token_latency
+        self.requests = 0
+        self.errors = 0
+        self.fixture_hits = 0
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "MockLLMServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="mock-llm-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"requests": self.requests, "errors": self.errors, "fixture_hits": self.fixture_hits}
+
+    def _plan(self) -> Tuple[float, bool]:
+        """Delay and whether to inject an error for one request."""
+        with self._lock:
+            self.requests += 1
+            delay = self.latency + (self.rng.uniform(0, self.jitter) if self.jitter else 0.0)
+            fail = self.error_rate > 0 and self.rng.random() < self.error_rate
+            if fail:
+                self.errors += 1
+            return delay, fail
+
+    def reply(self, body: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        """(status, JSON payload) for one chat.completions request body."""
+        delay, fail = self._plan()
+        if delay > 0:
+            time.sleep(delay)
+        if fail:
+            return self.error_status, {"error": {"message": "Injected error", "type": "server_error", "code": self.error_status}}
+
+        messages = body.get("messages", [])
+        content: Union[str, Dict[str, Any], None] = None
+        if self.fixtures is not None:
+            json_mode = (body.get("response_format") or {}).get("type") == "json_object"
+            content = self.fixtures.get(response_cache_key(body.get("model", ""), body.get("temperature"), messages, json_mode))
+            if content is not None:
+                with self._lock:
+                    self.fixture_hits += 1
+            elif self.strict:
+                return 404, {"error": {"message": "No fixture for this request", "type": "invalid_request_error"}}
+        if content is None:
+            content = self.responder(messages)
+        if isinstance(content, dict):
+            # LLMClient stores plain-text (non JSON mode) replies as {"content": text}
+            content = content["content"] if set(content) == {"content"} else json.dumps(content)
+
+        return 200, {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "mock"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+        }
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                if not self.path.rstrip("/").endswith("/chat/completions"):
+                    return self._send(404, {"error": {"message": f"Unknown path {self.path}", "type": "invalid_request_error"}})
+                length = int(self.headers.get("Content-Length", 0))
+                try:
+                    body = json.loads(self.rfile.read(length) or b"{}")
+                except json.JSONDecodeError:
+                    return self._send(400, {"error": {"message": "Invalid JSON body", "type": "invalid_request_error"}})
+                status, payload = server.reply(body)
+                if body.get("stream") and status == 200:
+                    return self._stream(payload)
+                self._send(status, payload)
+
+            def _stream(self, payload: Dict[str, Any]):
+                """Replay a completion as chat.completion.chunk server-sent events."""
+                content = payload["choices"][0]["message"]["content"]
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.end_headers()
+                base = {"id": payload["id"], "object": "chat.completion.chunk", "created": payload["created"], "model": payload["model"]}
+                pieces = [content[i:i + server.chunk_chars] for i in range(0, len(content), server.chunk_chars)]
+                for i, piece in enumerate(pieces):
+                    if i and server.token_latency > 0:
+                        time.sleep(server.token_latency)
+                    delta = {"role": "assistant", "content": piece} if i == 0 else {"content": piece}
+                    self._event(dict(base, choices=[{"index": 0, "delta": delta, "finish_reason": None}]))
+                self._event(dict(base, choices=[{"index": 0, "delta": {}, "finish_reason": "stop"}]))
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.wfile.flush()
+
+            def _event(self, data: Dict[str, Any]):
+                self.wfile.write(b"data: " + json.dumps(data).encode("utf-8") + b"\n\n")
+                self.wfile.flush()
+
+            def _send(self, status: int, payload: Dict[str, Any]):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                # Keep benchmark output clean
+                pass
+
+        return Handler
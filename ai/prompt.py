@@ -0,0 +1,95 @@
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+# Identical for every agent and call, and first in the system message, so
+# provider-side prompt caching can reuse it; the persona follows it.
+STATIC_INSTRUCTIONS = (
+    "You play Texas Hold'em to win chips. Decide from your hand, the board, "
+    "your equity and the pot odds.\n"
+    "State keys: hand, board, stage, pos(ition); pot, call (cost to call), "
+    "odds (pot odds), stack, bet (yours this round), bb (big blind); "
+    "seats: name stack/bet, marked folded/allin/out when not active.\n"
+    "Reply with one JSON object only, fields in this order: "
+    "action (one of the valid actions), amount (chips to raise, else 0), "
+    "reasoning (short), chat (short table talk)."
+)
+
+# Rough token count: ~4 characters per token for English/JSON-ish text
+CHARS_PER_TOKEN = 4
+
+_WINNERS = re.compile(r"Winners: ([^.]+)\.")
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of text (no tokenizer dependency)."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+def message_tokens(messages: List[Dict[str, str]]) -> int:
+    return sum(estimate_tokens(m["content"]) for m in messages)
+
+def _seat(seat: Dict[str, Any]) -> str:
+    text = f"{seat['name']} {seat['chips']}/{seat['bet']}"
+    status = seat.get("status", "active")
+    return text if status == "active" else f"{text} {status.replace('_', '')}"
+
+def compact_state(info: Dict[str, Any], equity: float) -> str:
+    """The decision state in a few short key/value lines."""
+    lines = [
+        f"hand {' '.join(info.get('my_hand', []))} | board {' '.join(info.get('board', [])) or '-'}"
+        f" | stage {info.get('stage', '?')} | pos {info.get('position', '?')}",
+    ]
+    money = f"pot {info.get('pot')} call {info.get('to_call')}"
+    pot_odds = info.get('pot_odds') or {}
+    if pot_odds.get('pot_odds_pct'):
+        money += f" odds {pot_odds['pot_odds_pct']}"
+    money += f" stack {info.get('my_chips')} bet {info.get('my_bet')}"
+    if info.get('big_blind'):
+        money += f" bb {info['big_blind']}"
+    lines.append(money)
+    lines.append(f"equity {round(equity * 100, 1)}%")
+    if info.get('seats'):
+        lines.append("seats " + ", ".join(_seat(s) for s in info['seats']))
+    elif info.get('players'):
+        lines.append("seats " + ", ".join(info['players']))
+    return "\n".join(lines)
+
+def summarize_memories(memories: List[str]) -> str:
+    """One line standing in for older memories: how many, and who won them."""
+    winners = Counter()
+    for memory in memories:
+        match = _WINNERS.search(memory)
+        if match:
+            winners.update(name.strip() for name in match.group(1).split(","))
+    summary = f"{len(memories)} earlier hands"
+    if winners:
+        summary += "; won by " + ", ".join(f"{name} x{count}" for name, count in winners.most_common(3))
+    return summary
+
+def fit_memories(memories: List[str], budget: Optional[int]) -> Tuple[List[str], int]:
+    """
+    The memory lines to send within `budget` tokens (None = all of them):
+    the newest verbatim, older ones folded into one summary line, or nothing
+    if not even that fits. Also returns how many memories were left out verbatim.
+    """
+    if budget is None:
+        return [f"- {m}" for m in memories], 0
+    kept: List[str] = []
+    used = 0
+    for memory in reversed(memories):
+        line = f"- {memory}"
+        if used + estimate_tokens(line) > budget:
+            break
+        kept.insert(0, line)
+        used += estimate_tokens(line)
+    older = memories[:len(memories) - len(kept)]
+    if older:
+        summary = f"- {summarize_memories(older)}"
+        # Make room for the summary by dropping the oldest verbatim lines
+        while kept and used + estimate_tokens(summary) > budget:
+            used -= estimate_tokens(kept.pop(0))
+            older = memories[:len(memories) - len(kept)]
+            summary = f"- {summarize_memories(older)}"
+        if used + estimate_tokens(summary) <= budget:
+            kept.insert(0, summary)
+    return kept, len(older)
@@ -0,0 +1,106 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+class CircuitBreaker:
+    """
+    Stops sending requests to a provider that keeps failing.
+
+      closed: requests flow; failure_threshold consecutive failures open it
+      open: requests are refused for reset_timeout seconds
+      half_open: after that, one trial request is let through; success closes
+          the breaker, failure opens it again
+    """
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1")
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trips = 0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now (claims the trial slot when half open)."""
+        with self._lock:
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = "half_open"
+                self._trial_in_flight = False
+            if self.state == "closed":
+                return True
+            if self.state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def available(self) -> bool:
+        """allow() without claiming anything: False while requests would be refused."""
+        with self._lock:
+            if self.state == "open":
+                return time.monotonic() - self.opened_at >= self.reset_timeout
+            return not (self.state == "half_open" and self._trial_in_flight)
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                if self.state != "open":
+                    self.trips += 1
+                self.state = "open"
+                self.opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+
+class ProviderHealth:
+    """
+    Latency and outcome counters for one provider endpoint, shared by every
+    LLMClient talking to it, plus its CircuitBreaker. Latencies of successful
+    requests are kept in a window of the last `window` calls for percentiles
+    (the hedging threshold is their p95).
+    """
+    OUTCOMES = ("success", "error", "timeout", "short_circuit", "cache_hit")
+
+    def __init__(self, window: int = 200, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.latencies: "deque[float]" = deque(maxlen=window)
+        self.counts = {outcome: 0 for outcome in self.OUTCOMES}
+        self.hedges = 0
+        self.hedge_wins = 0
+        self._lock = threading.Lock()
+
+    def record(self, outcome: str, latency: Optional[float] = None):
+        with self._lock:
+            self.counts[outcome] += 1
+            if latency is not None and outcome == "success":
+                self.latencies.append(latency)
+
+    def record_hedge(self, won: bool):
+        with self._lock:
+            self.hedges += 1
+            if won:
+                self.hedge_wins += 1
+
+    def percentile(self, q: float, min_samples: int = 1) -> Optional[float]:
+        """Latency at quantile q over the window, or None with fewer than min_samples."""
+        with self._lock:
+            if len(self.latencies) < max(1, min_samples):
+                return None
+            ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def stats(self) -> Dict[str, Any]:
+        p50, p95, p99 = (self.percentile(q) for q in (0.5, 0.95, 0.99))
+        with self._lock:
+            return dict(self.counts, hedges=self.hedges, hedge_wins=self.hedge_wins,
+                        circuit=self.breaker.state, circuit_trips=self.breaker.trips,
+                        p50=p50, p95=p95, p99=p99)
@@ -0,0 +1,142 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Protocol, Tuple
+
+def canonical_messages(messages: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    """Messages with per-line trailing whitespace and surrounding blank lines removed."""
+    return [
+        {k: "\n".join(line.rstrip() for line in v.strip().splitlines()) if k == "content" and isinstance(v, str) else v
+         for k, v in m.items()}
+        for m in messages
+    ]
+
+def response_cache_key(model: str, temperature: float, messages: List[Dict[str, str]], json_mode: bool = True) -> str:
+    """sha256 of the model, temperature, JSON mode and canonicalized messages."""
+    payload = json.dumps([model, temperature, json_mode, canonical_messages(messages)], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseStore(Protocol):
+    """What LLMClient(cache=...) needs: ResponseCache, FixtureStore, ..."""
+    def get(self, key: str) -> Optional[Dict[str, Any]]: ...
+    def put(self, key: str, response: Dict[str, Any]) -> None: ...
+
+
+class ResponseCache:
+    """
+    Thread-safe cache of parsed LLM responses: an in-memory LRU, optionally
+    backed by an SQLite file so responses survive restarts and can be replayed
+    offline.
+
+      maxsize: entries kept in memory (LRU eviction)
+      ttl: seconds an entry stays valid (None = forever)
+      path: SQLite file; memory misses fall through to it, and disk hits are promoted
+      max_disk_entries: oldest rows beyond this are deleted (None = unbounded)
+    """
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None, path: Optional[str] = None, max_disk_entries: Optional[int] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.path = path
+        self.max_disk_entries = max_disk_entries
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, created REAL NOT NULL, response TEXT NOT NULL)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS responses_created ON responses (created)")
+            self._db.commit()
+
+    def _fresh(self, created: float) -> bool:
+        return self.ttl is None or time.time() - created <= self.ttl
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if self._fresh(entry[0]):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return json.loads(json.dumps(entry[1]))
+                del self._entries[key]
+                self.expired += 1
+
+            if self._db is not None:
+                row = self._db.execute("SELECT created, response FROM responses WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    if self._fresh(row[0]):
+                        # Same as a memory hit: the caller gets its own copy
+                        self._remember(key, row[0], json.loads(row[1]))
+                        self.hits += 1
+                        self.disk_hits += 1
+                        return json.loads(row[1])
+                    self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._db.commit()
+                    self.expired += 1
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, response: Dict[str, Any]):
+        created = time.time()
+        with self._lock:
+            self._remember(key, created, json.loads(json.dumps(response)))
+            if self._db is not None:
+                self._db.execute("INSERT OR REPLACE INTO responses (key, created, response) VALUES (?, ?, ?)",
+                                 (key, created, json.dumps(response, ensure_ascii=False)))
+                if self.max_disk_entries is not None:
+                    self._db.execute("DELETE FROM responses WHERE key NOT IN (SELECT key FROM responses ORDER BY created DESC LIMIT ?)",
+                                     (self.max_disk_entries,))
+                self._db.commit()
+
+    def _remember(self, key: str, created: float, response: Dict[str, Any]):
+        """Insert into the in-memory LRU (lock held)."""
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = (created, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Drop every entry, on disk too, and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+            self.hits = self.disk_hits = self.misses = self.expired = self.evictions = 0
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            disk_size = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0] if self._db is not None else 0
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "disk_size": disk_size,
+                "maxsize": self.maxsize,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,182 @@
+import json
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from game.engine import TexasHoldemGame, GameStage
+
+class SpeculativeDecider:
+    """
+    Precomputes AI decisions in the background so they are ready when the AI's
+    turn actually comes.
+
+    - prefetch(): start an AI seat's decision for a known state right away.
+    - speculate(): while a human is deciding, play the human's most likely
+      replies (then restore the game from a snapshot) and prefetch the next AI
+      seat's decision in each resulting state (equity, prompt and LLM call).
+    - take(): when the AI's real turn comes, reuse the result whose state matches
+      exactly; every other speculative result is dropped.
+
+    Decisions are streamed: take() returns as soon as the action is known, and
+    table talk still being generated is collected later with finished_chats().
+
+    Decisions are keyed on the full game_info the agent would see, so a reused
+    decision is exactly what the agent would have been asked.
+    """
+    # Human replies to speculate on, most likely first (raise sizes are too varied to guess)
+    HUMAN_ACTIONS = ("check", "call", "fold")
+
+    def __init__(self, max_workers: int = 4, max_branches: int = 2):
+        self.max_branches = max_branches
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="speculate")
+        # Decisions needed right now (misses) never queue behind stale speculative LLM calls
+        self.direct = ThreadPoolExecutor(max_workers=1, thread_name_prefix="decide")
+        # state key -> (full decision, early decision with just action/amount)
+        self.pending: Dict[str, Tuple[Future, Future]] = {}
+        self.chats: List[Tuple[str, Future]] = []
+        self._lock = threading.Lock()
+        self._agent_locks: Dict[str, threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+        self.submitted = 0
+
+    @staticmethod
+    def state_key(name: str, game_info: Dict[str, Any], valid_actions: List[str]) -> str:
+        return json.dumps([name, game_info, list(valid_actions)], sort_keys=True, default=str)
+
+    def _decide(self, agent, game_info: Dict[str, Any], valid_actions: List[str], early: Future) -> Dict[str, Any]:
+        """Runs on a worker: streams the agent's decision, resolving early once the action is known."""
+        try:
+            if not valid_actions:
+                decision = agent.get_action(game_info, valid_actions)
+                early.set_result(decision)
+                return decision
+            with self._lock:
+                agent_lock = self._agent_locks.setdefault(agent.name, threading.Lock())
+            # The agent's equity calculator is not thread-safe; the LLM calls can overlap
+            with agent_lock:
+                equity = agent.estimate_equity(game_info)
+            decision = None
+            for event in agent.stream_decision(game_info, valid_actions, equity):
+                if event["type"] == "decision":
+                    if not early.done():
+                        early.set_result(event["decision"])
+                elif event["type"] == "done":
+                    decision = event["decision"]
+            if decision is None:
+                raise ValueError(f"Decision stream for {agent.name} ended without a decision")
+            return decision
+        except Exception as e:
+            if not early.done():
+                early.set_exception(e)
+            raise
+
+    def prefetch(self, agent, game_info: Dict[str, Any], valid_actions: List[str]):
+        """Start computing agent's decision for this exact state, unless already pending."""
+        key = self.state_key(agent.name, game_info, valid_actions)
+        with self._lock:
+            if key in self.pending:
+                return
+            early: Future = Future()
+            self.pending[key] = (self.executor.submit(self._decide, agent, game_info, valid_actions, early), early)
+            self.submitted += 1
+
+    def speculate(self, game: TexasHoldemGame, agents: Dict[str, Any]):
+        """
+        Prefetch the decision of the seat to act if it is an AI; if it is a human,
+        prefetch the next AI seat's decision after each likely human reply.
+        Safe to call repeatedly (e.g. on every Streamlit rerun).
+        """
+        if game.stage == GameStage.GAME_OVER:
+            return
+        player = game.players[game.current_player_index]
+        if player.name in agents:
+            self.prefetch(agents[player.name], game.get_game_info(player), game.get_legal_actions(player))
+            return
+
+        legal = game.get_legal_actions(player)
+        # Each reply is played on the game itself and taken back from a snapshot
+        state = game.snapshot()
+        for action in [a for a in self.HUMAN_ACTIONS if a in legal][:self.max_branches]:
+            try:
+                game.step(action)
+                if game.stage != GameStage.GAME_OVER:
+                    nxt = game.players[game.current_player_index]
+                    if nxt.name in agents:
+                        self.prefetch(agents[nxt.name], game.get_game_info(nxt), game.get_legal_actions(nxt))
+            finally:
+                game.restore(state)
+
+    def take(self, agent, game_info: Dict[str, Any], valid_actions: List[str]) -> Optional[Dict[str, Any]]:
+        """
+        The precomputed decision for this exact state (waiting for its action if
+        still running), or None on a miss. All other speculative work is discarded.
+        """
+        key = self.state_key(agent.name, game_info, valid_actions)
+        with self._lock:
+            entry = self._pop(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return self._resolve(agent, entry)
+
+    def decide(self, agent, game_info: Dict[str, Any], valid_actions: List[str]) -> Dict[str, Any]:
+        """take(), falling back to asking the agent now (still streamed)."""
+        decision = self.take(agent, game_info, valid_actions)
+        if decision is None:
+            early: Future = Future()
+            full = self.direct.submit(self._decide, agent, game_info, valid_actions, early)
+            decision = self._resolve(agent, (full, early))
+        return decision
+
+    def _pop(self, key: str) -> Optional[Tuple[Future, Future]]:
+        """Remove and return key's entry, cancelling every other pending one. Caller holds _lock."""
+        entry = self.pending.pop(key, None)
+        for full, early in self.pending.values():
+            full.cancel()
+            early.cancel()
+        self.pending.clear()
+        return entry
+
+    def _resolve(self, agent, entry: Tuple[Future, Future]) -> Dict[str, Any]:
+        full, early = entry
+        if full.done():
+            decision = full.result()
+        else:
+            decision = early.result()
+            # The action is played now; the table talk is still on its way
+            with self._lock:
+                self.chats.append((agent.name, full))
+        # Discarded branches are never counted; only the decision actually played is
+        agent.record_source(decision)
+        return decision
+
+    def finished_chats(self) -> List[Tuple[str, str]]:
+        """(agent name, chat) for streamed decisions whose table talk has since completed."""
+        done = []
+        with self._lock:
+            for name, full in list(self.chats):
+                if full.done():
+                    self.chats.remove((name, full))
+                    if not full.cancelled() and full.exception() is None and full.result().get("chat"):
+                        done.append((name, full.result()["chat"]))
+        return done
+
+    def clear(self):
+        """Drop all pending work and shut the worker pools down; the decider cannot be used afterwards."""
+        with self._lock:
+            self._pop("")
+            self.chats.clear()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.direct.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "submitted": self.submitted,
+                "pending": len(self.pending),
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
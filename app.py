@@ -9,6 +9,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from game.engine import TexasHoldemGame, GameStage, PlayerState
 from game.models import Player
 from ai.agent import PokerAgent
+from ai.speculation import SpeculativeDecider
 from ui.card_svg import cards_to_html, generate_card_back_svg
 
 # Page Config
@@ -36,6 +37,7 @@ if "game" not in st.session_state:
         st.session_state.game.add_player(p)
         st.session_state.agents[name] = PokerAgent(name, profile=profiles[i])
         
+    st.session_state.speculator = SpeculativeDecider()
     st.session_state.game_started = False  # Wait for Start Game button
     st.session_state.hand_recorded = False
     st.session_state.winning_payouts = {}
@@ -46,6 +48,8 @@ if "thinking_message" not in st.session_state:
     st.session_state.thinking_message = ""
 if "board_reveal_count" not in st.session_state:
     st.session_state.board_reveal_count = 0
+if "speculator" not in st.session_state:
+    st.session_state.speculator = SpeculativeDecider()
 
 game = st.session_state.game
 
@@ -81,6 +85,8 @@ if st.sidebar.button("🔄 Restart Game"):
         st.session_state.game.add_player(p)
         st.session_state.agents[name] = PokerAgent(name, profile=profiles[i])
     
+    st.session_state.speculator.clear()
+    st.session_state.speculator = SpeculativeDecider()
     st.session_state.game_started = False  # Go back to waiting state
     st.session_state.hand_recorded = False
     st.session_state.thinking_message = ""
@@ -527,6 +533,10 @@ with bot_col2:
 
 
 # === GAME LOGIC / ACTIONS ===
+# Table talk from streamed AI decisions arrives after their action was played
+for name, msg in st.session_state.speculator.finished_chats():
+    st.toast(f"💬 {name}: {msg}")
+
 if game.stage == GameStage.GAME_OVER:
     winners = game.winners or game.determine_winners()
     payouts = game.payouts if game.payouts else st.session_state.get('winning_payouts', {})
@@ -574,34 +584,21 @@ else:
     elif current_player.is_ai:
         if 'ai_processing' not in st.session_state:
             print(f"[DEBUG] Starting AI turn for {current_player.name}")
+            # Start the decision now so it runs while the page re-renders
+            st.session_state.speculator.speculate(game, st.session_state.agents)
             st.session_state.thinking_message = f"⏳ {current_player.name} is thinking..."
             st.session_state.ai_processing = True
             st.rerun()
         else:
             print(f"[DEBUG] AI {current_player.name} processing decision...")
-            time.sleep(1)
             agent = st.session_state.agents[current_player.name]
             valid_actions = game.get_legal_actions(current_player)
             print(f"[DEBUG] Valid actions for {current_player.name}: {valid_actions}")
-            active_count = len([p for p in game.players if p.status in [PlayerState.ACTIVE, PlayerState.ALL_IN]])
-            position = game.get_player_position(current_player)
-            pot_odds_info = game.calculate_pot_odds(current_player)
-            game_info = {
-                'my_hand': [c.to_treys_str() for c in current_player.hand],
-                'board': [c.to_treys_str() for c in game.board],
-                'pot': game.pot,
-                'current_bet': game.current_bet,
-                'to_call': game.current_bet - current_player.current_bet,
-                'my_chips': current_player.chips,
-                'my_bet': current_player.current_bet,
-                'players': [str(p) for p in game.players],
-                'num_active_players': active_count,
-                'position': position,
-                'pot_odds': pot_odds_info,
-                'stage': game.stage.name
-            }
+            game_info = game.get_game_info(current_player)
             st.session_state.thinking_message = f"⏳ {current_player.name} is analyzing with LLM..."
-            decision = agent.get_action(game_info, valid_actions)
+            # Usually precomputed while the previous player was acting
+            decision = st.session_state.speculator.decide(agent, game_info, valid_actions)
+            print(f"[DEBUG] Speculation: {st.session_state.speculator.stats()}")
             action = decision.get('action', 'fold')
             val = 0
             if action == 'raise':
@@ -615,6 +612,7 @@ else:
                 if msg:
                     st.toast(f"💬 {current_player.name}: {msg}")
                 game.step(action, val)
+                st.session_state.speculator.speculate(game, st.session_state.agents)
             except Exception as e:
                 st.error(f'AI Error: {e}')
             st.session_state.thinking_message = ''
@@ -626,6 +624,8 @@ else:
         if 'ai_processing' in st.session_state:
             del st.session_state.ai_processing
         st.session_state.thinking_message = ''
+        # Precompute the next AI seat's decision for the human's likely replies
+        st.session_state.speculator.speculate(game, st.session_state.agents)
         _, main_col, _ = st.columns([1, 2, 1])
         with main_col:
             valid_actions = game.get_legal_actions(current_player)
@@ -0,0 +1,119 @@
+import sys
+import os
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+# Ensure we can import from the project
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from game.engine import TexasHoldemGame
+from game.models import Player
+from ai.agent import PokerAgent
+from ai.batching import DecisionBatcher
+from ai.fast_path import FastPathPolicy
+from ai.llm_client import LLMClient
+from ai.mock_server import MockLLMServer, FixtureStore
+
+def decision_points(count: int, seed: int, players: int = 4):
+    """(game_info, valid_actions) for the first decision of `count` random deals."""
+    rng = random.Random(seed)
+    game = TexasHoldemGame(rng=rng)
+    for i in range(players):
+        game.add_player(Player(f"P{i}", is_ai=True, chips=1000))
+    points = []
+    for _ in range(count):
+        for p in game.players:
+            p.chips = 1000
+        game.start_hand()
+        # Walk a few calls/checks in so boards vary
+        for _ in range(rng.randint(0, players * 2)):
+            player = game.players[game.current_player_index]
+            legal = game.get_legal_actions(player)
+            game.step("check" if "check" in legal else "call")
+            if game.winners:
+                break
+        if game.winners:
+            continue
+        player = game.players[game.current_player_index]
+        points.append((game.get_game_info(player), game.get_legal_actions(player)))
+        game.dealer_index = (game.dealer_index + 1) % players
+    return points
+
+def summarize(label: str, latencies, elapsed: float):
+    latencies = sorted(latencies)
+    def pct(q):
+        return latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000
+    print(f"{label:<12} {len(latencies):>6} decisions  {len(latencies) / elapsed:>8.1f}/s  "
+          f"mean {statistics.mean(latencies) * 1000:>7.1f}ms  p50 {pct(0.5):>7.1f}ms  p95 {pct(0.95):>7.1f}ms  p99 {pct(0.99):>7.1f}ms")
+
+async def run_concurrent(agent: PokerAgent, points):
+    async def timed(info, valid):
+        start = time.perf_counter()
+        await agent.aget_action(info, valid)
+        return time.perf_counter() - start
+    return await asyncio.gather(*[timed(info, valid) for info, valid in points])
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure PokerAgent decision latency and throughput against a local mock LLM server.")
+    parser.add_argument("--decisions", type=int, default=200, help="Decision points to time")
+    parser.add_argument("--latency", type=float, default=0.05, help="Mock server base latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.02, help="Extra uniform random latency in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with HTTP 500")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for deals, latency jitter and errors")
+    parser.add_argument("--replay", help="Serve recorded responses from this fixture file (strict: unknown prompts fail)")
+    parser.add_argument("--record", help="Call the real provider (needs ZHIPU_API_KEY) and record responses to this fixture file")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-call deadline in seconds")
+    parser.add_argument("--hedge-after", default="p95", help="Seconds before a hedged duplicate request, 'p95' or 'off'")
+    parser.add_argument("--batch-window", type=float, help="Batch LLM requests arriving within this many seconds")
+    parser.add_argument("--combine", action="store_true", help="Send each batch as one multi-decision prompt (needs --batch-window)")
+    parser.add_argument("--no-fast-path", action="store_true", help="Send every decision to the LLM, even trivial ones")
+    args = parser.parse_args()
+    hedge_after = None if args.hedge_after == "off" else args.hedge_after if args.hedge_after == "p95" else float(args.hedge_after)
+    resilience = {"timeout": args.timeout, "hedge_after": hedge_after}
+
+    points = decision_points(args.decisions, args.seed)
+    server = None
+    recording = None
+    if args.record:
+        recording = FixtureStore(args.record, mode="record")
+        client = LLMClient(cache=recording, **resilience)
+        print(f"🎙️  Recording provider responses to {args.record}")
+    else:
+        fixtures = FixtureStore(args.replay) if args.replay else None
+        server = MockLLMServer(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                               fixtures=fixtures, strict=fixtures is not None, seed=args.seed).start()
+        client = LLMClient(api_key="mock-key", base_url=server.url, model="mock-model", max_retries=0, **resilience)
+        print(f"🚀 Mock LLM server at {server.url} (latency {args.latency * 1000:.0f}ms + up to {args.jitter * 1000:.0f}ms, errors {args.error_rate:.0%})")
+
+    batcher = DecisionBatcher(client, window=args.batch_window, combine=args.combine) if args.batch_window else None
+    agent = PokerAgent("Bench", client=client, fast_path=None if args.no_fast_path else FastPathPolicy(), batcher=batcher)
+    try:
+        latencies = []
+        start = time.perf_counter()
+        for info, valid in points:
+            t = time.perf_counter()
+            agent.get_action(info, valid)
+            latencies.append(time.perf_counter() - t)
+        summarize("sequential", latencies, time.perf_counter() - start)
+
+        if not args.record:
+            start = time.perf_counter()
+            latencies = asyncio.run(run_concurrent(agent, points))
+            summarize("concurrent", latencies, time.perf_counter() - start)
+    finally:
+        print(f"Agent: {agent.decision_stats()}")
+        print(f"Prompts: {agent.prompt_stats()}")
+        print(f"Client: {client.stats()}")
+        if batcher:
+            print(f"Batcher: {batcher.stats()}")
+        if recording:
+            recording.close()
+        if server:
+            print(f"Server: {server.stats()}")
+            server.stop()
+
+if __name__ == "__main__":
+    main()
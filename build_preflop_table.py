@@ -0,0 +1,30 @@
+import sys
+import os
+import argparse
+import time
+
+# Ensure we can import from the project
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from game.preflop import build_preflop_table, DEFAULT_TABLE_PATH
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the preflop equity table (169 hand classes x 2-9 players).")
+    parser.add_argument("--simulations", type=int, default=100000, help="Monte Carlo deals per hand class and table size")
+    parser.add_argument("--seed", type=int, default=0, help="RNG seed; the same seed reproduces the same table")
+    parser.add_argument("--output", default=DEFAULT_TABLE_PATH, help="Where to write the .npz file")
+    args = parser.parse_args()
+
+    start = time.time()
+
+    def progress(done, total):
+        if done % 50 == 0 or done == total:
+            print(f"  {done}/{total} entries ({time.time() - start:.0f}s)")
+
+    print(f"🚀 Building preflop table with {args.simulations} simulations per entry (seed={args.seed})...")
+    table = build_preflop_table(simulations=args.simulations, seed=args.seed, progress=progress)
+    table.save(args.output)
+    print(f"✅ Saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
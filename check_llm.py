@@ -1,17 +1,19 @@
 import sys
 import os
+import argparse
 
 # Ensure we can import from the project
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from ai.llm_client import LLMClient
+from ai.mock_server import MockLLMServer
 
-def check_connection():
+def check_connection(base_url=None, api_key=None):
     print("🚀 Testing LLM Connection...")
     
     # 1. Initialize Client
     try:
-        client = LLMClient()
+        client = LLMClient(api_key=api_key, base_url=base_url)
         print(f"✅ Client Initialized. Provider: {client.provider}")
         if client.provider == "openai":
             print(f"   Base URL: {client.client.base_url}")
@@ -40,4 +42,11 @@ def check_connection():
         print(f"\n❌ Request Failed: {e}")
 
 if __name__ == "__main__":
-    check_connection()
+    parser = argparse.ArgumentParser(description="Send one test request to the configured LLM provider.")
+    parser.add_argument("--mock", action="store_true", help="Check against a local mock server instead (no API key or network needed)")
+    args = parser.parse_args()
+    if args.mock:
+        with MockLLMServer() as server:
+            check_connection(base_url=server.url, api_key="mock-key")
+    else:
+        check_connection()
@@ -1,6 +1,7 @@
-from typing import List, Dict, Optional
+import random
+from typing import Any, List, Dict, Optional
 from enum import Enum
-from .models import Deck, Player, PlayerState, Card
+from .models import Deck, Player, PlayerState, Card, FULL_DECK
 from .evaluator import HandEvaluator
 
 class GameStage(Enum):
@@ -11,17 +12,31 @@ class GameStage(Enum):
     SHOWDOWN = 4
     GAME_OVER = 5
 
+class GameState:
+    """
+    Everything a hand in progress depends on, as flat per-seat tuples and card
+    index bytes (no Player/Card/Deck objects). Taken with
+    TexasHoldemGame.snapshot() and put back with restore(); restoring touches
+    each seat once. The deck's RNG is not part of the state.
+    """
+    __slots__ = ("chips", "bets", "total_bets", "statuses", "acted", "hands", "deck", "board",
+                 "pot", "current_bet", "stage", "dealer_index", "current_player_index",
+                 "aggressor_index", "round_bets_matched", "status_masks", "to_act_mask",
+                 "winners", "payouts", "side_pots")
+
+
 class TexasHoldemGame:
-    def __init__(self, small_blind: int = 10, big_blind: int = 20):
+    def __init__(self, small_blind: int = 10, big_blind: int = 20, rng: Optional[random.Random] = None, evaluator: Optional[HandEvaluator] = None):
         self.players: List[Player] = []
-        self.deck = Deck()
+        self.deck = Deck(rng)
         self.board: List[Card] = []
         self.pot = 0
         self.current_bet = 0
         self.dealer_index = 0
         self.small_blind = small_blind
         self.big_blind = big_blind
-        self.evaluator = HandEvaluator()
+        # Building an evaluator takes milliseconds; games created per decision should share one
+        self.evaluator = evaluator if evaluator is not None else HandEvaluator()
         
         # State Machine Attributes
         self.stage = GameStage.GAME_OVER
@@ -30,9 +45,53 @@ class TexasHoldemGame:
         self.round_bets_matched = False # If true, ready to deal next cards
         self.winners: List[Player] = []
         self.payouts: Dict[str, int] = {}  # name -> chips awarded for the hand
+        self.side_pots: List[Dict[str, Any]] = []  # pot breakdown of the last settled showdown
+
+        # Seat bookkeeping, updated as statuses change so per-action queries never
+        # rescan the table. Bit i of a mask is self.players[i].
+        self.seat_of: Dict[Player, int] = {}
+        self.status_masks: Dict[PlayerState, int] = {state: 0 for state in PlayerState}
+        self.to_act_mask = 0  # ACTIVE seats still owed an action this betting round
+        self._positions_key: Optional[tuple] = None
+        self._positions: List[str] = []
+
+        # Set to a list to have step() record a GameState before each action, for undo()
+        self.undo_log: Optional[List[GameState]] = None
 
     def add_player(self, player: Player):
         self.players.append(player)
+        self.seat_of[player] = len(self.players) - 1
+        self._sync_seats()
+
+    def _sync_seats(self):
+        """Rebuild the status masks from the players (once per hand, not per action)."""
+        self.status_masks = {state: 0 for state in PlayerState}
+        for i, p in enumerate(self.players):
+            self.status_masks[p.status] |= 1 << i
+        self.to_act_mask = self.status_masks[PlayerState.ACTIVE]
+
+    def _set_status(self, player: Player, status: PlayerState):
+        bit = 1 << self.seat_of[player]
+        self.status_masks[player.status] &= ~bit
+        self.status_masks[status] |= bit
+        self.to_act_mask &= self.status_masks[PlayerState.ACTIVE]
+        player.status = status
+
+    @property
+    def active_mask(self) -> int:
+        return self.status_masks[PlayerState.ACTIVE]
+
+    @property
+    def live_mask(self) -> int:
+        """Seats still in the hand: ACTIVE or ALL_IN."""
+        return self.status_masks[PlayerState.ACTIVE] | self.status_masks[PlayerState.ALL_IN]
+
+    @staticmethod
+    def _next_seat(seat: int, mask: int) -> int:
+        """First seat after `seat`, going round the table, whose bit is set in mask (-1 if none)."""
+        later = mask >> (seat + 1) << (seat + 1)
+        pick = later or mask
+        return (pick & -pick).bit_length() - 1
 
     def start_hand(self):
         """Starts a new hand: shuffle, deal, blinds."""
@@ -43,15 +102,16 @@ class TexasHoldemGame:
         self.stage = GameStage.PREFLOP
         self.winners = []
         self.payouts = {}
+        self.side_pots = []
         
         # Reset players
         active_count = 0
         for p in self.players:
-            if p.chips > 0:
-                p.reset_for_round()
+            # Busted players are reset too (to OUT), so last hand's bets never reach the side pots
+            p.reset_for_round()
+            if p.status == PlayerState.ACTIVE:
                 active_count += 1
-            else:
-                p.status = PlayerState.OUT
+        self._sync_seats()
         
         if active_count < 2:
             print("Not enough players.")
@@ -73,10 +133,10 @@ class TexasHoldemGame:
         self.post_blind(self.players[sb_idx], self.small_blind)
         self.post_blind(self.players[bb_idx], self.big_blind)
         
-        # Deal hole cards
+        # Deal hole cards (blinds who went all-in posting are still in the hand)
         for _ in range(2):
             for p in self.players:
-                if p.status == PlayerState.ACTIVE:
+                if p.status in (PlayerState.ACTIVE, PlayerState.ALL_IN):
                     p.hand.append(self.deck.deal(1)[0])
 
         self.current_bet = self.big_blind
@@ -85,6 +145,7 @@ class TexasHoldemGame:
         self.current_player_index = (bb_idx + 1) % len(self.players)
         self.aggressor_index = bb_idx # Last person who forced a bet amount
         self.round_bets_matched = False
+        self.to_act_mask = self.active_mask
         
         # Sanity check: Ensure current player is active
         self._ensure_active_current_player()
@@ -98,7 +159,7 @@ class TexasHoldemGame:
         player.total_bet += actual_bet
         self.pot += actual_bet
         if player.chips == 0:
-            player.status = PlayerState.ALL_IN
+            self._set_status(player, PlayerState.ALL_IN)
 
     def deal_community_cards(self, number: int):
         cards = self.deck.deal(number)
@@ -108,24 +169,29 @@ class TexasHoldemGame:
         """
         Returns the position name for a player (BTN, SB, BB, UTG, MP, CO, etc.)
         """
-        player_idx = self.players.index(player)
-        num_players = len([p for p in self.players if p.status != PlayerState.OUT])
-        
-        # Calculate relative position from dealer
-        active_players = [p for p in self.players if p.status != PlayerState.OUT]
-        if player not in active_players:
+        seat = self.seat_of[player]
+        if self.status_masks[PlayerState.OUT] >> seat & 1:
             return "OUT"
-        
-        active_idx = active_players.index(player)
-        dealer_active_idx = 0
-        for i, p in enumerate(active_players):
-            if self.players.index(p) == self.dealer_index:
-                dealer_active_idx = i
-                break
-        
-        # Position relative to dealer (0 = dealer)
-        rel_pos = (active_idx - dealer_active_idx) % num_players
-        
+        key = (self.dealer_index, len(self.players), self.status_masks[PlayerState.OUT])
+        if key != self._positions_key:
+            self._positions = self._position_names()
+            self._positions_key = key
+        return self._positions[seat]
+
+    def _position_names(self) -> List[str]:
+        """Position name of every seat (OUT seats included) for the current button."""
+        in_play = [i for i, p in enumerate(self.players) if p.status != PlayerState.OUT]
+        num_players = len(in_play)
+        order = {seat: i for i, seat in enumerate(in_play)}
+        dealer_active_idx = order.get(self.dealer_index, 0)
+        names = ["OUT"] * len(self.players)
+        for seat, active_idx in order.items():
+            # Position relative to dealer (0 = dealer)
+            names[seat] = self._position_name((active_idx - dealer_active_idx) % num_players, num_players)
+        return names
+
+    @staticmethod
+    def _position_name(rel_pos: int, num_players: int) -> str:
         if num_players == 2:
             # Heads up: dealer is SB, other is BB
             return "SB/BTN" if rel_pos == 0 else "BB"
@@ -174,6 +240,30 @@ class TexasHoldemGame:
             "description": f"Need {pot_odds_pct}% equity to call profitably"
         }
 
+    def get_game_info(self, player: Player) -> Dict[str, Any]:
+        """
+        Snapshot of the table from one player's point of view, in the
+        game_info format expected by PokerAgent.get_action and the bots.
+        """
+        return {
+            'my_hand': [c.to_treys_str() for c in player.hand],
+            'board': [c.to_treys_str() for c in self.board],
+            'pot': self.pot,
+            'current_bet': self.current_bet,
+            'to_call': self.current_bet - player.current_bet,
+            'my_chips': player.chips,
+            'my_bet': player.current_bet,
+            'players': [str(p) for p in self.players],
+            'seats': [{'name': p.name, 'chips': p.chips, 'bet': p.current_bet, 'total_bet': p.total_bet,
+                       'status': p.status.value, 'acted': p.acted_in_round} for p in self.players],
+            'seat': self.seat_of[player],
+            'dealer': self.dealer_index,
+            'num_active_players': self.live_mask.bit_count(),
+            'position': self.get_player_position(player),
+            'pot_odds': self.calculate_pot_odds(player),
+            'stage': self.stage.name,
+            'big_blind': self.big_blind,
+        }
 
     def get_legal_actions(self, player: Player) -> List[str]:
         if player.status != PlayerState.ACTIVE:
@@ -199,6 +289,8 @@ class TexasHoldemGame:
         """
         Executes one step for the current player, then advances turn or stage.
         """
+        if self.undo_log is not None:
+            self.undo_log.append(self.snapshot())
         player = self.players[self.current_player_index]
         self.process_action(player, action, amount)
         player.acted_in_round = True
@@ -218,62 +310,87 @@ class TexasHoldemGame:
         # Setup next turn
         self._advance_turn()
         
+    def undo(self):
+        """Take back the last recorded step()."""
+        if not self.undo_log:
+            raise ValueError("Nothing to undo")
+        self.restore(self.undo_log.pop())
+
+    def snapshot(self) -> GameState:
+        """The current game state, cheap enough to take before every step of a search."""
+        state = GameState()
+        players = self.players
+        state.chips = tuple(p.chips for p in players)
+        state.bets = tuple(p.current_bet for p in players)
+        state.total_bets = tuple(p.total_bet for p in players)
+        state.statuses = tuple(p.status for p in players)
+        state.acted = tuple(p.acted_in_round for p in players)
+        state.hands = tuple(bytes(c.index for c in p.hand) for p in players)
+        state.deck = bytes(c.index for c in self.deck.cards)
+        state.board = bytes(c.index for c in self.board)
+        state.pot = self.pot
+        state.current_bet = self.current_bet
+        state.stage = self.stage
+        state.dealer_index = self.dealer_index
+        state.current_player_index = self.current_player_index
+        state.aggressor_index = self.aggressor_index
+        state.round_bets_matched = self.round_bets_matched
+        state.status_masks = tuple(self.status_masks.values())
+        state.to_act_mask = self.to_act_mask
+        state.winners = tuple(self.seat_of[w] for w in self.winners)
+        state.payouts = dict(self.payouts)
+        state.side_pots = self.side_pots
+        return state
+
+    def restore(self, state: GameState):
+        """Put the game back to a snapshot() of it (same players, in the same seats)."""
+        if len(state.chips) != len(self.players):
+            raise ValueError(f"Snapshot has {len(state.chips)} seats, game has {len(self.players)}")
+        for i, p in enumerate(self.players):
+            p.chips = state.chips[i]
+            p.current_bet = state.bets[i]
+            p.total_bet = state.total_bets[i]
+            p.status = state.statuses[i]
+            p.acted_in_round = state.acted[i]
+            p.hand = [FULL_DECK[c] for c in state.hands[i]]
+        self.deck.cards = [FULL_DECK[c] for c in state.deck]
+        self.board = [FULL_DECK[c] for c in state.board]
+        self.pot = state.pot
+        self.current_bet = state.current_bet
+        self.stage = state.stage
+        self.dealer_index = state.dealer_index
+        self.current_player_index = state.current_player_index
+        self.aggressor_index = state.aggressor_index
+        self.round_bets_matched = state.round_bets_matched
+        self.status_masks = dict(zip(self.status_masks, state.status_masks))
+        self.to_act_mask = state.to_act_mask
+        self.winners = [self.players[i] for i in state.winners]
+        self.payouts = dict(state.payouts)
+        self.side_pots = state.side_pots
+
     def _advance_turn(self):
         """
         Move to next active player. Check if round is complete.
         """
         # 1. Check if only one player left (everyone else folded or busted)
-        not_folded = [p for p in self.players if p.status != PlayerState.FOLDED and p.status != PlayerState.OUT]
-        if len(not_folded) == 1:
-            self._finish_single_player(not_folded[0])
+        live = self.live_mask
+        if live.bit_count() == 1:
+            self._finish_single_player(self.players[live.bit_length() - 1])
             return
 
         # 2. If no ACTIVE players (only ALL_IN remain), run out the board and settle
-        active_players = [p for p in self.players if p.status == PlayerState.ACTIVE]
-        if len(active_players) == 0:
+        if not self.active_mask:
             self._run_all_in_showdown()
             return
 
-        # 3. Check if round is complete
-        # Round is complete if: 
-        # All ACTIVE players have acted AND their bets match current_bet (or they are all-in)
-        
-        active_indices = [i for i, p in enumerate(self.players) if p.status == PlayerState.ACTIVE]
-        
-        round_complete = True
-        for i in active_indices:
-            p = self.players[i]
-            if not p.acted_in_round:
-                round_complete = False
-                break
-            if p.current_bet != self.current_bet:
-                round_complete = False
-                break
-        
-        # Edge case: All-in players don't need to match current_bet if they can't (handled by status ALL_IN)
-        # But we need to ensure their action was processed.
-
-        if round_complete:
+        # 3. Round is complete once every ACTIVE player has acted since the last
+        # raise (all-in players don't need to match current_bet)
+        if not self.to_act_mask:
             self.next_stage()
             return
 
         # 4. If not complete, find next active player
-        start = self.current_player_index
-        next_idx = (self.current_player_index + 1) % len(self.players)
-        
-        while True:
-            p = self.players[next_idx]
-            if p.status == PlayerState.ACTIVE:
-                self.current_player_index = next_idx
-                break
-            # If all others are all-in, we might loop forever if we strip logic?
-            # active_indices covers logic. If round not complete, there MUST be an active player who needs to act.
-            next_idx = (next_idx + 1) % len(self.players)
-            if next_idx == start:
-                # Should not happen if round_complete calculated correctly?
-                # It can happen if everyone is All-In?
-                # If everyone All-in, round_complete should be True (active_indices empty)
-                break
+        self.current_player_index = self._next_seat(self.current_player_index, self.active_mask)
     
     def next_stage(self):
         """Move to next stage (Preflop -> Flop -> Turn -> River -> Showdown)"""
@@ -298,6 +415,8 @@ class TexasHoldemGame:
             p.acted_in_round = False
             # Fix status if needed? Active remains active.
         
+        self.to_act_mask = self.active_mask
+        
         # Dealer + 1 starts post-flop
         # Find first active player after dealer
         self.current_player_index = (self.dealer_index + 1) % len(self.players)
@@ -305,29 +424,25 @@ class TexasHoldemGame:
         
         # If everyone is All-In, we should auto-advance stages?
         # Check if >= 2 active players.
-        active_count = len([p for p in self.players if p.status == PlayerState.ACTIVE])
-        if active_count < 2:
+        if self.active_mask.bit_count() < 2:
             # Everyone else is All-in or Folded. 
             # Auto-run the remaining board and settle immediately.
             self._run_all_in_showdown()
             
     def _ensure_active_current_player(self):
-        """Rotates current_player_index until it hits an active player (or circles back)."""
-        start = self.current_player_index
-        count = 0
-        while self.players[self.current_player_index].status != PlayerState.ACTIVE:
-            self.current_player_index = (self.current_player_index + 1) % len(self.players)
-            count += 1
-            if count > len(self.players):
-                # Everyone is All-In or Folded
-                break
+        """Moves current_player_index to the first active player from it on (unchanged if none)."""
+        seat = self._next_seat(self.current_player_index - 1, self.active_mask)
+        if seat >= 0:
+            self.current_player_index = seat
 
     def process_action(self, player: Player, action: str, amount: int = 0):
         """
         Process a player's action. 
         """
+        seat = self.seat_of[player]
+        bet_before = self.current_bet
         if action == "fold":
-            player.status = PlayerState.FOLDED
+            self._set_status(player, PlayerState.FOLDED)
         elif action == "check":
             pass 
         elif action == "call":
@@ -338,7 +453,7 @@ class TexasHoldemGame:
             player.total_bet += actual_call
             self.pot += actual_call
             if player.chips == 0:
-                player.status = PlayerState.ALL_IN
+                self._set_status(player, PlayerState.ALL_IN)
         elif action == "raise":
             call_amount = self.current_bet - player.current_bet
             total_cost = call_amount + amount
@@ -354,17 +469,22 @@ class TexasHoldemGame:
             if player.current_bet > self.current_bet:
                 self.current_bet = player.current_bet
             if player.chips == 0:
-                player.status = PlayerState.ALL_IN
+                self._set_status(player, PlayerState.ALL_IN)
         elif action == "all_in":
              bet = player.chips
              player.chips = 0
              player.current_bet += bet
              player.total_bet += bet
              self.pot += bet
-             player.status = PlayerState.ALL_IN
+             self._set_status(player, PlayerState.ALL_IN)
              if player.current_bet > self.current_bet:
                  self.current_bet = player.current_bet
 
+        if self.current_bet > bet_before:
+            # A raise reopens the action for everyone else still able to act
+            self.to_act_mask = self.active_mask
+        self.to_act_mask &= ~(1 << seat)
+
     def determine_winners(self) -> List[Player]:
         active_players = [p for p in self.players if p.status in [PlayerState.ACTIVE, PlayerState.ALL_IN]]
         if not active_players:
@@ -402,6 +522,8 @@ class TexasHoldemGame:
         """Everyone else folded/out: award whole pot to remaining player."""
         self.winners = [player]
         self.payouts = {player.name: self.pot}
+        seat = self.seat_of[player]
+        self.side_pots = [{'amount': self.pot, 'eligible': [seat], 'winners': [seat]}]
         player.chips += self.pot
         self.pot = 0
         self.stage = GameStage.GAME_OVER
@@ -420,75 +542,90 @@ class TexasHoldemGame:
         self._deal_remaining_board_to_river()
         self._settle_side_pots()
 
-    def _settle_side_pots(self):
+    def _settle_side_pots(self) -> List[Dict[str, Any]]:
         """
         Distribute pot using side-pot aware logic based on total_bet per player.
         Folded/OUT players are ineligible to win but their chips stay in pots.
+
+        Contributions are sorted once and the pot layers built in one pass from
+        the top down, so each pot's best hand is updated as its contenders
+        join; every live hand is scored exactly once. Layers with the same
+        contenders form one pot, and chips of a layer no live player paid into
+        fall through to the layer below.
+
+        Returns (and stores in self.side_pots) the breakdown, main pot first:
+        [{'amount', 'eligible': [seat], 'winners': [seat]}].
         """
-        contributions = {p: p.total_bet for p in self.players if p.total_bet > 0}
-        eligible = [p for p in self.players if p.status not in (PlayerState.FOLDED, PlayerState.OUT) and p.total_bet > 0]
+        contributors = sorted((p for p in self.players if p.total_bet > 0), key=lambda p: p.total_bet)
+        live = self.live_mask
+        eligible = [p for p in contributors if live >> self.seat_of[p] & 1]
 
         # Nothing to distribute
-        if not contributions:
+        if not contributors:
             self.winners = []
             self.payouts = {}
+            self.side_pots = []
             self.stage = GameStage.GAME_OVER
-            return
+            return self.side_pots
 
         # If only one eligible player, award all
         if len(eligible) == 1:
             solo = eligible[0]
+            self.side_pots = [{'amount': self.pot, 'eligible': [self.seat_of[solo]], 'winners': [self.seat_of[solo]]}]
             solo.chips += self.pot
             self.winners = [solo]
             self.payouts = {solo.name: self.pot}
             self.pot = 0
             self.stage = GameStage.GAME_OVER
-            return
+            return self.side_pots
 
-        side_pots: List[tuple[int, List[Player]]] = []
-        remaining = contributions.copy()
+        board = [c.index for c in self.board]
+        scores = {p: self.evaluator.evaluate_ints([c.index for c in p.hand], board) for p in eligible}
 
-        # Build side pots incrementally
-        while remaining:
-            min_commit = min(remaining.values())
-            involved_players = list(remaining.keys())
-            pot_amount = min_commit * len(involved_players)
-            pot_eligible = [p for p in involved_players if p in eligible]
-            side_pots.append((pot_amount, pot_eligible))
-            for p in involved_players:
-                remaining[p] -= min_commit
-            remaining = {p: v for p, v in remaining.items() if v > 0}
+        side_pots: List[Dict[str, Any]] = []
+        contenders: List[int] = []
+        pot_winners: List[int] = []
+        best_score = float('inf')
+        carry = 0
+        for k in range(len(contributors) - 1, -1, -1):
+            p = contributors[k]
+            if p in scores:
+                seat = self.seat_of[p]
+                contenders.append(seat)
+                if scores[p] < best_score:
+                    best_score = scores[p]
+                    pot_winners = [seat]
+                elif scores[p] == best_score:
+                    pot_winners.append(seat)
+            below = contributors[k - 1].total_bet if k else 0
+            # Everyone from k up paid into the layer between `below` and p.total_bet
+            amount = (p.total_bet - below) * (len(contributors) - k) + carry
+            if below == p.total_bet or not pot_winners:
+                carry = amount
+                continue
+            carry = 0
+            if side_pots and len(side_pots[-1]['eligible']) == len(contenders):
+                # Nobody new contends this layer: it belongs to the same pot
+                side_pots[-1]['amount'] += amount
+                continue
+            side_pots.append({'amount': amount, 'eligible': sorted(contenders), 'winners': sorted(pot_winners)})
+        side_pots.reverse()
 
         payouts: Dict[str, int] = {}
         winners: List[Player] = []
 
-        for pot_amount, contenders in side_pots:
-            if not contenders or pot_amount == 0:
-                continue
-
-            best_score = float('inf')
-            pot_winners: List[Player] = []
-            for p in contenders:
-                score = self.evaluator.evaluate(p.hand, self.board)
-                if score < best_score:
-                    best_score = score
-                    pot_winners = [p]
-                elif score == best_score:
-                    pot_winners.append(p)
-
-            if not pot_winners:
-                continue
-
-            share = pot_amount // len(pot_winners)
-            remainder = pot_amount - share * len(pot_winners)
-            for w in pot_winners:
+        for pot in side_pots:
+            pot_winners = pot['winners']
+            share = pot['amount'] // len(pot_winners)
+            remainder = pot['amount'] - share * len(pot_winners)
+            for seat in pot_winners:
+                w = self.players[seat]
                 payouts[w.name] = payouts.get(w.name, 0) + share
-            if remainder > 0:
-                payouts[pot_winners[0].name] = payouts.get(pot_winners[0].name, 0) + remainder
-
-            for w in pot_winners:
                 if w not in winners:
                     winners.append(w)
+            if remainder > 0:
+                first = self.players[pot_winners[0]].name
+                payouts[first] = payouts.get(first, 0) + remainder
 
         # Pay out and clean up
         for p in self.players:
@@ -499,7 +636,9 @@ class TexasHoldemGame:
         self.pot = 0
         self.payouts = payouts
         self.winners = winners
+        self.side_pots = side_pots
         self.stage = GameStage.GAME_OVER
+        return side_pots
 
     def settle_hand(self):
         """Public helper to finish the hand and distribute the pot if not already done."""
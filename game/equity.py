@@ -1,38 +1,155 @@
 import random
-from typing import List, Tuple
-from .models import Card, Deck, Suit, Rank
-from .evaluator import HandEvaluator
+import threading
+import copy
+from collections import OrderedDict
+from itertools import combinations, permutations
+from math import comb, factorial, sqrt
+from typing import List, Tuple, Optional, Dict, Any, Iterator
+import numpy as np
+from .models import Deck, card_to_int
+from .evaluator import HandEvaluator, BatchEvaluator
+from .preflop import PreflopTable
+from .equity_pool import parallel_sample_tallies
+from .ranges import HandRange, to_range, card_mask
+
+# Every relabelling of the 4 suits, as a 0-51 -> 0-51 card mapping
+_SUIT_PERMUTATION_MAPS = [
+    [(card & ~3) | perm[card & 3] for card in range(52)]
+    for perm in permutations(range(4))
+]
+
+def canonical_spot(my_hand: List, board: List) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+    """
+    Canonical form of (hand, board) under card order and suit relabelling, so that
+    e.g. AhKh on 2h5c9d and AsKs on 2s5d9c map to the same key.
+    """
+    hand_ints = [card_to_int(c) for c in my_hand]
+    board_ints = [card_to_int(c) for c in board]
+    return min(
+        (tuple(sorted(m[c] for c in hand_ints)), tuple(sorted(m[c] for c in board_ints)))
+        for m in _SUIT_PERMUTATION_MAPS
+    )
+
+
+class EquityCache:
+    """
+    Thread-safe bounded LRU cache of equity results, keyed by canonical_spot()
+    plus the calculation parameters.
+    """
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Any, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(result)
+
+    def put(self, key, result: Dict[str, Any]):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = copy.deepcopy(result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+# Shared by every EquityCalculator by default, so AI seats reuse each other's spots
+shared_cache = EquityCache()
+
+# Layout of the tally vectors built by _hero_outcomes. Tallies are sums over
+# deals, so batches, workers and enumeration chunks merge by addition:
+# [wins, ties, pot share, squared pot share, then (wins, ties) vs each opponent]
+WINS, TIES, SHARE, SHARE_SQ, PER_OPPONENT = range(5)
+
 
 class EquityCalculator:
-    def __init__(self):
+    # Max simulations scored per vectorized batch (bounds peak memory)
+    BATCH_SIZE = 25000
+    # Auto mode enumerates every runout when there are at most this many
+    # (heads-up turn: 45,540; heads-up river: 990), otherwise it samples
+    EXACT_THRESHOLD = 50000
+    # Hard cap for exact=True (heads-up flop: 1,070,190)
+    MAX_EXACT_COMBOS = 2000000
+    # Simulations per batch between early-stopping checks in adaptive mode
+    ADAPTIVE_BATCH = 2000
+    # Below this many simulations the worker pool costs more than it saves
+    PARALLEL_MIN_SIMULATIONS = 20000
+    # Redraw rounds for range combos that collide on a card before giving up
+    MAX_REJECTION_ROUNDS = 200
+
+    def __init__(self, seed: Optional[int] = None, use_preflop_table: bool = True, use_cache: bool = True, cache: Optional[EquityCache] = None, workers: int = 1):
         self.evaluator = HandEvaluator()
+        self.batch_evaluator = BatchEvaluator()
         self.deck = Deck()
+        self.rng = np.random.default_rng(seed)
+        # workers > 1 splits large fixed-budget sampling across a persistent process pool;
+        # each chunk gets its own stream spawned from this seed sequence
+        self.workers = workers
+        self._seed_sequence = np.random.SeedSequence(seed)
+        # Precomputed preflop equities (see build_preflop_table.py); None if not available
+        self.preflop_table = PreflopTable.load() if use_preflop_table else None
+        # Results of calculate_equity_details, shared across calculators unless a cache is given
+        self.cache = (cache or shared_cache) if use_cache else None
 
-    def calculate_equity(self, my_hand: List[str], board: List[str], num_active_players: int = 2, simulations: int = 500) -> float:
+    def calculate_equity(self, my_hand: List[str], board: List[str], num_active_players: int = 2, simulations: int = 500, vectorized: bool = True, exact: Optional[bool] = None) -> float:
         """
-        Calculates the equity (win probability) of a hand using Monte Carlo simulation.
+        Calculates the equity (win probability) of a hand using Monte Carlo simulation,
+        or exact enumeration when the number of runouts is small.
         
         Args:
             my_hand: List of 2 card strings (e.g., ['Ah', 'Kd'])
             board: List of board card strings (e.g., ['2s', '5d', '9c'])
             num_active_players: Number of players still in the hand (including self)
             simulations: Number of random deals to simulate
+            vectorized: Draw and score all runouts as NumPy arrays (fast path).
+                Set to False to use the reference one-deal-at-a-time loop.
+            exact: True to enumerate every runout, False to always sample,
+                None (default) to use the preflop table on an empty board and
+                enumerate only below EXACT_THRESHOLD otherwise.
             
         Returns:
             Float between 0.0 and 1.0 representing win probability.
         """
         if num_active_players < 2:
             return 1.0
+
+        if vectorized:
+            return self.calculate_equity_details(my_hand, board, num_active_players, simulations, exact)["equity"]
             
-        wins = 0
-        ties = 0
+        share = 0.0
         
         # Build base deck once - filter out known cards
-        # Convert known cards to treys format for consistent comparison
-        known_cards_strs = set(my_hand + board)
-        self.deck.reset()
-        # Use to_treys_str() for filtering and dealing to match input format (e.g., 'Ah', not 'A♥')
-        base_deck = [c for c in self.deck.cards if c.to_treys_str() not in known_cards_strs]
+        # Work on 0-51 ints so both 'Ah' and 'A♥' inputs match and no strings are built per deal
+        my_ints = [card_to_int(c) for c in my_hand]
+        board_ints = [card_to_int(c) for c in board]
+        known_cards = set(my_ints + board_ints)
+        base_deck = [i for i in range(52) if i not in known_cards]
         
         # Pre-calculate cards needed
         cards_needed_opponent = (num_active_players - 1) * 2
@@ -48,34 +165,393 @@ class EquityCalculator:
             simulation_deck = base_deck.copy()
             random.shuffle(simulation_deck)
                  
-            # Deal Opponents - use to_treys_str() for consistent format
+            # Deal Opponents
             opponents_hands = []
             for _ in range(num_active_players - 1):
-                op_hand = [simulation_deck.pop().to_treys_str(), simulation_deck.pop().to_treys_str()]
+                op_hand = [simulation_deck.pop(), simulation_deck.pop()]
                 opponents_hands.append(op_hand)
                 
             # Deal Board
             sim_board_cards = []
             for _ in range(cards_needed_board):
-                sim_board_cards.append(simulation_deck.pop().to_treys_str())
+                sim_board_cards.append(simulation_deck.pop())
                 
-            final_board = board + sim_board_cards
+            final_board = board_ints + sim_board_cards
             
-            # Evaluate using Treys (expects strings)
             # Evaluator returns score (Lower is better)
-            my_score = self.evaluator.evaluate(my_hand, final_board)
+            my_score = self.evaluator.evaluate_ints(my_ints, final_board)
             
             best_opponent_score = float('inf')
+            tied_opponents = 0
             for op_h in opponents_hands:
-                s = self.evaluator.evaluate(op_h, final_board)
+                s = self.evaluator.evaluate_ints(op_h, final_board)
                 if s < best_opponent_score:
                     best_opponent_score = s
+                if s == my_score:
+                    tied_opponents += 1
             
             if my_score < best_opponent_score:
-                wins += 1
+                share += 1
             elif my_score == best_opponent_score:
-                ties += 1
+                # N-way tie: the pot is split between me and every tied opponent
+                share += 1 / (tied_opponents + 1)
                 
-        # Equity = Win% + (Tie% / 2) ? 
-        # Actually in multi-way tie, it's 1/N. But 1/2 is decent approx for AI logic.
-        return (wins + ties * 0.5) / simulations
+        return share / simulations
+
+    def calculate_equity_details(self, my_hand: List[str], board: List[str], num_active_players: int = 2, simulations: int = 500, exact: Optional[bool] = None, target_std_error: Optional[float] = None, threshold: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Same inputs as calculate_equity, but reports how the number was obtained.
+
+        Sampling draws every runout at once as an int array of shape
+        (simulations, cards_needed) and scores it with BatchEvaluator; exact mode
+        scores every distinct (opponent hands, board) deal instead. With an empty
+        board the precomputed preflop table is used when loaded (unless exact is False).
+
+        Adaptive sampling: when target_std_error and/or threshold is given,
+        simulations becomes the maximum budget and runouts are drawn in batches of
+        ADAPTIVE_BATCH until the standard error is at most target_std_error, or the
+        95% confidence interval lies entirely above or below threshold (e.g. the
+        'pot_odds' value from TexasHoldemGame.calculate_pot_odds).
+
+        Returns:
+            dict with
+              'equity': expected share of the pot; an N-way tie counts 1/N
+              'win' / 'tie' / 'loss': how often my hand is strictly best, tied for
+                  best, or beaten
+              'per_opponent': [{'win', 'tie', 'loss'}] head-to-head vs each seat
+              'method' ('exact', 'monte_carlo' or 'preflop_table'), 'samples'
+              (deals scored), 'std_error', 'ci_low' and 'ci_high' (95% interval).
+            The preflop table only stores equity/win/tie ('per_opponent' is None).
+            Identical and suit-isomorphic spots are answered from the cache.
+        """
+        if self.cache is None:
+            return self._calculate_equity_details(my_hand, board, num_active_players, simulations, exact, target_std_error, threshold)
+
+        # Calculators with and without the preflop table answer the same spot differently
+        key = (canonical_spot(my_hand, board), num_active_players, simulations, exact, target_std_error, threshold, self.preflop_table is not None)
+        result = self.cache.get(key)
+        if result is None:
+            result = self._calculate_equity_details(my_hand, board, num_active_players, simulations, exact, target_std_error, threshold)
+            self.cache.put(key, result)
+        return result
+
+    def _calculate_equity_details(self, my_hand: List[str], board: List[str], num_active_players: int, simulations: int, exact: Optional[bool], target_std_error: Optional[float], threshold: Optional[float]) -> Dict[str, Any]:
+        """Uncached implementation of calculate_equity_details."""
+        if num_active_players < 2:
+            return self._build_result(1.0, 0, "exact", win=1.0, tie=0.0, per_opponent=[])
+
+        if not board and exact is None and self.preflop_table is not None and self.preflop_table.covers(num_active_players):
+            entry = self.preflop_table.lookup(my_hand, num_active_players)
+            return self._build_result(entry["equity"], self.preflop_table.samples, "preflop_table", entry["std_error"], entry["win"], entry["tie"])
+
+        hand_ints = [card_to_int(c) for c in my_hand]
+        board_ints = [card_to_int(c) for c in board]
+        known = set(hand_ints + board_ints)
+        remaining = np.array([c for c in range(52) if c not in known], dtype=np.int64)
+
+        num_opponents = num_active_players - 1
+        cards_needed_board = 5 - len(board_ints)
+        total_cards_needed = num_opponents * 2 + cards_needed_board
+
+        if len(remaining) < total_cards_needed:
+            # Should not happen in normal poker
+            return self._build_result(0.5, 0, "none")
+
+        num_runouts = self.count_runouts(len(remaining), cards_needed_board, num_opponents)
+        use_exact = exact if exact is not None else num_runouts <= self.EXACT_THRESHOLD
+        if use_exact and num_runouts > self.MAX_EXACT_COMBOS:
+            if exact:
+                raise ValueError(f"Too many runouts to enumerate: {num_runouts} > {self.MAX_EXACT_COMBOS}")
+            use_exact = False
+
+        tallies = self._empty_tallies(num_opponents)
+        if use_exact:
+            for holes, sim_board in self._enumerate_runouts(remaining, board_ints, num_opponents):
+                tallies += self._score_runouts(hand_ints, holes, sim_board, num_opponents)
+            # Deals are enumerated with unordered opponents, so a column is not one seat;
+            # the seats are exchangeable and each gets the average head-to-head record
+            head_to_head = tallies[PER_OPPONENT:].reshape(num_opponents, 2).mean(axis=0)
+            tallies[PER_OPPONENT:] = np.tile(head_to_head, num_opponents)
+            # No sampling error: report a zero-width interval
+            return self._tally_result(tallies, num_runouts, "exact")
+
+        if simulations <= 0:
+            return self._build_result(0.5, 0, "none")
+
+        if target_std_error is None and threshold is None:
+            if self.workers > 1 and simulations >= self.PARALLEL_MIN_SIMULATIONS:
+                tallies = parallel_sample_tallies(self.workers, hand_ints, board_ints, num_opponents, simulations, self._seed_sequence.spawn(self.workers))
+            else:
+                tallies = self._sample_tallies(hand_ints, board_ints, remaining, num_opponents, simulations)
+            return self._tally_result(tallies, simulations, "monte_carlo")
+
+        # Adaptive: sample in batches and stop as soon as the estimate is precise enough
+        samples = 0
+        while samples < simulations:
+            n = min(self.ADAPTIVE_BATCH, simulations - samples)
+            tallies += self._sample_tallies(hand_ints, board_ints, remaining, num_opponents, n)
+            samples += n
+
+            partial = self._tally_result(tallies, samples, "monte_carlo")
+            if target_std_error is not None and partial["std_error"] <= target_std_error:
+                return partial
+            if threshold is not None and (partial["ci_low"] > threshold or partial["ci_high"] < threshold):
+                return partial
+        return partial
+
+    def _sample_tallies(self, hand_ints: List[int], board_ints: List[int], remaining: np.ndarray, num_opponents: int, simulations: int) -> np.ndarray:
+        """Sample `simulations` random deals in BATCH_SIZE chunks and return their tallies."""
+        total_cards_needed = num_opponents * 2 + 5 - len(board_ints)
+        tallies = self._empty_tallies(num_opponents)
+        done = 0
+        while done < simulations:
+            n = min(self.BATCH_SIZE, simulations - done)
+            draws = self._draw_runouts(remaining, n, total_cards_needed)
+
+            # Opponent hole cards come first, then the rest of the board
+            known_board = np.broadcast_to(np.array(board_ints, dtype=np.int64), (n, len(board_ints)))
+            sim_board = np.hstack([known_board, draws[:, num_opponents * 2:]])
+            tallies += self._score_runouts(hand_ints, draws[:, :num_opponents * 2], sim_board, num_opponents)
+            done += n
+        return tallies
+
+    @staticmethod
+    def _empty_tallies(num_opponents: int) -> np.ndarray:
+        return np.zeros(PER_OPPONENT + 2 * num_opponents, dtype=np.float64)
+
+    def _tally_result(self, tallies: np.ndarray, samples: int, method: str, total_weight: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Turn summed tallies into a result dict. total_weight normalizes weighted
+        tallies (range enumeration); by default every deal weighs 1.
+        """
+        total = total_weight if total_weight is not None else samples
+        equity = tallies[SHARE] / total
+        std_error = 0.0
+        if method == "monte_carlo" and samples > 1:
+            variance = max(tallies[SHARE_SQ] / total - equity * equity, 0.0) * samples / (samples - 1)
+            std_error = sqrt(variance / samples)
+        per_opponent = []
+        for i in range((len(tallies) - PER_OPPONENT) // 2):
+            win = float(tallies[PER_OPPONENT + 2 * i] / total)
+            tie = float(tallies[PER_OPPONENT + 2 * i + 1] / total)
+            per_opponent.append({"win": win, "tie": tie, "loss": max(0.0, 1.0 - win - tie)})
+        return self._build_result(equity, samples, method, std_error, tallies[WINS] / total, tallies[TIES] / total, per_opponent)
+
+    @staticmethod
+    def _build_result(equity: float, samples: int, method: str, std_error: float = 0.0, win: Optional[float] = None, tie: Optional[float] = None, per_opponent: Optional[List[Dict[str, float]]] = None) -> Dict[str, Any]:
+        """Package an equity estimate with its breakdown, standard error and 95% confidence interval."""
+        equity, std_error = float(equity), float(std_error)
+        return {
+            "equity": equity,
+            "win": None if win is None else float(win),
+            "tie": None if tie is None else float(tie),
+            "loss": None if win is None or tie is None else max(0.0, 1.0 - float(win) - float(tie)),
+            "per_opponent": per_opponent,
+            "method": method,
+            "samples": samples,
+            "std_error": std_error,
+            "ci_low": max(0.0, equity - 1.96 * std_error),
+            "ci_high": min(1.0, equity + 1.96 * std_error),
+        }
+
+    @staticmethod
+    def count_runouts(deck_size: int, board_needed: int, num_opponents: int) -> int:
+        """Number of distinct (unordered opponent hands, board completion) deals."""
+        total = comb(deck_size, board_needed)
+        left = deck_size - board_needed
+        for i in range(num_opponents):
+            total *= comb(left - 2 * i, 2)
+        return total // factorial(num_opponents)
+
+    def _score_runouts(self, hand_ints: List[int], holes: np.ndarray, sim_board: np.ndarray, num_opponents: int) -> np.ndarray:
+        """
+        Score my hand against every row of opponent holes (n, 2 * num_opponents)
+        on full boards (n, 5). Returns the tallies of those deals.
+        """
+        n = sim_board.shape[0]
+        my_hole = np.broadcast_to(np.array(hand_ints, dtype=np.int64), (n, 2))
+        player_holes = [my_hole] + [holes[:, 2 * i:2 * i + 2] for i in range(num_opponents)]
+        return self._hero_outcomes(self._score_players(player_holes, sim_board))
+
+    def _score_players(self, player_holes: List[np.ndarray], sim_board: np.ndarray) -> np.ndarray:
+        """Scores of each player's (n, 2) hole cards on full boards (n, 5), as an (n, players) array."""
+        products, masks = self.batch_evaluator.board_state(sim_board)
+        return np.stack([self.batch_evaluator.evaluate_with_board(h, products, masks) for h in player_holes], axis=1)
+
+    @staticmethod
+    def _hero_outcomes(scores: np.ndarray, weights: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Tallies of column 0 against the other columns of an (n, players) score
+        array, optionally weighting each row. When k players tie for best, the
+        hero's pot share for that row is 1/k.
+        """
+        hero = scores[:, :1]
+        opponents = scores[:, 1:]
+        best_opponent = opponents.min(axis=1)
+        win = hero[:, 0] < best_opponent
+        tie = hero[:, 0] == best_opponent
+        beats = hero < opponents
+        level = hero == opponents
+        share = np.where(win, 1.0, np.where(tie, 1.0 / (1 + level.sum(axis=1)), 0.0))
+
+        if weights is None:
+            weights = np.ones(len(scores))
+        head_to_head = np.empty(2 * opponents.shape[1])
+        head_to_head[0::2] = weights @ beats
+        head_to_head[1::2] = weights @ level
+        return np.concatenate([[weights @ win, weights @ tie, weights @ share, weights @ (share * share)], head_to_head])
+
+    def _enumerate_runouts(self, remaining: np.ndarray, board_ints: List[int], num_opponents: int) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Yield every distinct deal as (opponent holes, full board) arrays, in chunks
+        of roughly BATCH_SIZE rows. Opponents are unordered: each later opponent
+        takes a hole-card pair with a higher pair id, so every deal appears once.
+        """
+        cards = [int(c) for c in remaining]
+        board_needed = 5 - len(board_ints)
+        board_combos = list(combinations(cards, board_needed))
+        boards = np.array(board_combos, dtype=np.int64).reshape(len(board_combos), board_needed)
+        pairs = np.array(list(combinations(cards, 2)), dtype=np.int64)
+        pair_masks = np.left_shift(1, pairs[:, 0]) | np.left_shift(1, pairs[:, 1])
+        pair_ids = np.arange(len(pairs))
+        known_board = np.array(board_ints, dtype=np.int64)
+
+        def extend(rows: np.ndarray, used: np.ndarray, last: np.ndarray, level: int):
+            if level == num_opponents:
+                full_board = np.hstack([np.broadcast_to(known_board, (len(rows), len(board_ints))), rows[:, :board_needed]])
+                yield rows[:, board_needed:], full_board
+                return
+            step = max(1, self.BATCH_SIZE // len(pairs))
+            for start in range(0, len(rows), step):
+                chunk_used = used[start:start + step]
+                chunk_last = last[start:start + step]
+                fits = ((chunk_used[:, None] & pair_masks[None, :]) == 0) & (pair_ids[None, :] > chunk_last[:, None])
+                row_idx, pair_idx = np.nonzero(fits)
+                if len(row_idx) == 0:
+                    continue
+                yield from extend(
+                    np.hstack([rows[start:start + step][row_idx], pairs[pair_idx]]),
+                    chunk_used[row_idx] | pair_masks[pair_idx],
+                    pair_idx,
+                    level + 1,
+                )
+
+        board_masks = np.left_shift(1, boards).sum(axis=1) if board_needed else np.zeros(len(boards), dtype=np.int64)
+        yield from extend(boards, board_masks, np.full(len(boards), -1), 0)
+
+    def _draw_runouts(self, remaining: np.ndarray, n: int, k: int) -> np.ndarray:
+        """
+        Draw k distinct cards from `remaining` for each of n rows using a
+        vectorized partial Fisher-Yates shuffle. Returns an array of shape (n, k).
+        """
+        decks = np.tile(remaining, (n, 1))
+        rows = np.arange(n)
+        size = len(remaining)
+        for j in range(k):
+            swap = self.rng.integers(j, size, size=n)
+            picked = decks[rows, swap]
+            decks[rows, swap] = decks[rows, j]
+            decks[rows, j] = picked
+        return decks[:, :k]
+
+    # === Range equity ===
+
+    def calculate_range_equity(self, hero, villains, board: Optional[List[str]] = None, simulations: int = 20000, exact: Optional[bool] = None) -> Dict[str, Any]:
+        """
+        Equity of a hand or weighted range against one or more weighted ranges.
+
+        Args:
+            hero: two cards (['Ah', 'Kd']), a range string ("QQ+, AKs") or a HandRange
+            villains: one range (string / HandRange) or a list of them, one per opponent.
+                Weights scale how often a combo is dealt: "QQ+, AKs, 0.5×ATo".
+            board: known board cards
+            simulations: deals to sample when not enumerating
+            exact: heads-up on a complete board every non-conflicting combo pair is
+                enumerated unless exact is False; other spots are sampled.
+
+        Dealt combos never share a card with each other or the board (card removal).
+
+        Returns:
+            dict like calculate_equity_details: 'equity', 'win', 'tie', 'loss',
+            'per_opponent' (one entry per villain range), 'method', 'samples',
+            'std_error', 'ci_low', 'ci_high'.
+        """
+        if isinstance(villains, (str, HandRange)):
+            villains = [villains]
+        board_ints = [card_to_int(c) for c in board or []]
+        dead = card_mask(board_ints)
+        ranges = [to_range(r).without(dead) for r in [hero] + list(villains)]
+        if any(len(r) == 0 for r in ranges):
+            raise ValueError("A range has no combos left after removing board cards")
+
+        if len(board_ints) == 5 and len(ranges) == 2 and exact is not False:
+            return self._enumerate_range_equity(ranges[0], ranges[1], board_ints)
+        if exact:
+            raise ValueError("Exact range equity is only available heads-up on a complete board")
+
+        if simulations <= 0:
+            return self._build_result(0.5, 0, "none")
+
+        tallies = self._empty_tallies(len(ranges) - 1)
+        done = 0
+        while done < simulations:
+            n = min(self.BATCH_SIZE, simulations - done)
+            player_holes, sim_board = self._sample_range_deals(ranges, board_ints, n)
+            tallies += self._hero_outcomes(self._score_players(player_holes, sim_board))
+            done += n
+        return self._tally_result(tallies, simulations, "monte_carlo")
+
+    def _enumerate_range_equity(self, hero: HandRange, villain: HandRange, board_ints: List[int]) -> Dict[str, Any]:
+        """Weight every non-conflicting (hero combo, villain combo) pair on a complete board."""
+        board = np.array([board_ints], dtype=np.int64)
+        products, masks = self.batch_evaluator.board_state(board)
+        hero_scores = self.batch_evaluator.evaluate_with_board(hero.combos, np.repeat(products, len(hero)), np.repeat(masks, len(hero), axis=0))
+        villain_scores = self.batch_evaluator.evaluate_with_board(villain.combos, np.repeat(products, len(villain)), np.repeat(masks, len(villain), axis=0))
+
+        valid = (hero.masks[:, None] & villain.masks[None, :]) == 0
+        if not valid.any():
+            raise ValueError("Ranges have no non-conflicting combos")
+        hero_idx, villain_idx = np.nonzero(valid)
+        scores = np.stack([hero_scores[hero_idx], villain_scores[villain_idx]], axis=1)
+        pair_weights = hero.weights[hero_idx] * villain.weights[villain_idx]
+        tallies = self._hero_outcomes(scores, pair_weights)
+        return self._tally_result(tallies, len(hero_idx), "exact", total_weight=float(pair_weights.sum()))
+
+    def _sample_range_deals(self, ranges: List[HandRange], board_ints: List[int], n: int) -> Tuple[List[np.ndarray], np.ndarray]:
+        """
+        Draw one combo per range for n deals, weighted and without card collisions
+        (colliding rows are redrawn), then complete each board from the unused cards.
+        Returns (per-player (n, 2) hole arrays, (n, 5) boards).
+        """
+        probabilities = [r.weights / r.weights.sum() for r in ranges]
+        dead = card_mask(board_ints)
+        chosen = [np.zeros(n, dtype=np.int64) for _ in ranges]
+        used = np.full(n, dead, dtype=np.int64)
+        pending = np.arange(n)
+        for _ in range(self.MAX_REJECTION_ROUNDS):
+            picks = [self.rng.choice(len(r), size=len(pending), p=p) for r, p in zip(ranges, probabilities)]
+            row_used = np.full(len(pending), dead, dtype=np.int64)
+            ok = np.ones(len(pending), dtype=bool)
+            for r, pick in zip(ranges, picks):
+                combo_masks = r.masks[pick]
+                ok &= (row_used & combo_masks) == 0
+                row_used |= combo_masks
+            accepted = pending[ok]
+            for i, pick in enumerate(picks):
+                chosen[i][accepted] = pick[ok]
+            used[accepted] = row_used[ok]
+            pending = pending[~ok]
+            if len(pending) == 0:
+                break
+        else:
+            raise ValueError("Ranges collide on cards too often to sample")
+
+        # Fill the board with the k lowest random keys among unused cards
+        board_needed = 5 - len(board_ints)
+        keys = self.rng.random((n, 52))
+        keys[((used[:, None] >> np.arange(52)) & 1).astype(bool)] = 2.0
+        drawn = np.argpartition(keys, board_needed - 1, axis=1)[:, :board_needed] if board_needed else np.empty((n, 0), dtype=np.int64)
+        sim_board = np.hstack([np.broadcast_to(np.array(board_ints, dtype=np.int64), (n, len(board_ints))), drawn])
+
+        player_holes = [r.combos[c] for r, c in zip(ranges, chosen)]
+        return player_holes, sim_board
@@ -0,0 +1,54 @@
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+import numpy as np
+
+# One persistent pool per worker count, created on first use
+_POOLS: Dict[int, ProcessPoolExecutor] = {}
+_POOLS_LOCK = threading.Lock()
+
+# Per-process calculator, built once by the pool initializer (lookup tables included)
+_WORKER_CALCULATOR = None
+
+def _init_worker():
+    global _WORKER_CALCULATOR
+    from .equity import EquityCalculator
+    _WORKER_CALCULATOR = EquityCalculator(use_preflop_table=False, use_cache=False)
+
+def _sample_chunk(hand_ints: List[int], board_ints: List[int], num_opponents: int, simulations: int, seed: np.random.SeedSequence) -> np.ndarray:
+    """Runs inside a worker: sample `simulations` deals on the worker's own RNG stream."""
+    calculator = _WORKER_CALCULATOR
+    calculator.rng = np.random.default_rng(seed)
+    known = set(hand_ints + board_ints)
+    remaining = np.array([c for c in range(52) if c not in known], dtype=np.int64)
+    return calculator._sample_tallies(hand_ints, board_ints, remaining, num_opponents, simulations)
+
+def get_worker_pool(workers: int) -> ProcessPoolExecutor:
+    """Return the persistent pool for this worker count, starting it if needed."""
+    with _POOLS_LOCK:
+        pool = _POOLS.get(workers)
+        if pool is None:
+            pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+            _POOLS[workers] = pool
+        return pool
+
+def shutdown_worker_pools():
+    """Stop every pool started by get_worker_pool()."""
+    with _POOLS_LOCK:
+        for pool in _POOLS.values():
+            pool.shutdown(wait=True)
+        _POOLS.clear()
+
+def parallel_sample_tallies(workers: int, hand_ints: List[int], board_ints: List[int], num_opponents: int, simulations: int, seeds: List[np.random.SeedSequence]) -> np.ndarray:
+    """
+    Split `simulations` across the worker pool, one chunk and one independent
+    RNG stream (from `seeds`) per worker, and sum the workers' tally vectors.
+    """
+    pool = get_worker_pool(workers)
+    chunk, extra = divmod(simulations, workers)
+    futures = [
+        pool.submit(_sample_chunk, hand_ints, board_ints, num_opponents, chunk + (1 if i < extra else 0), seeds[i])
+        for i in range(workers)
+        if chunk + (1 if i < extra else 0) > 0
+    ]
+    return sum(future.result() for future in futures)
@@ -1,33 +1,34 @@
+from itertools import combinations, combinations_with_replacement
 from treys import Evaluator as TreysEvaluator
 from treys import Card as TreysCard
-from .models import Card
+import numpy as np
+from .models import Card, CARD_STRS, card_to_int
 from typing import List, Tuple
 
+# Treys bit pattern for each 0-51 card index, computed once
+CARD_TREYS_INTS = [TreysCard.new(s) for s in CARD_STRS]
+
 class HandEvaluator:
     def __init__(self):
         self._evaluator = TreysEvaluator()
 
-    def evaluate(self, hand: List[Card | str], board: List[Card | str]) -> int:
+    def evaluate(self, hand: List[Card | str | int], board: List[Card | str | int]) -> int:
         """
         Evaluate the strength of a hand given the board.
+        Cards may be Card objects, strings ('Ah', 'A♥') or 0-51 ints.
         Returns a score (lower is better, range 1-7462).
         """
         if len(hand) != 2:
             raise ValueError("Hand must have exactly 2 cards")
         
-        # Helper to convert to treys int
-        def to_treys(c):
-            if isinstance(c, str):
-                # Handle symbols if present
-                replacements = {'♠': 's', '♥': 'h', '♦': 'd', '♣': 'c'}
-                clean_c = c
-                for sym, char in replacements.items():
-                    clean_c = clean_c.replace(sym, char)
-                return TreysCard.new(clean_c)
-            return TreysCard.new(c.to_treys_str())
-
-        t_hand = [to_treys(c) for c in hand]
-        t_board = [to_treys(c) for c in board]
+        return self.evaluate_ints([card_to_int(c) for c in hand], [card_to_int(c) for c in board])
+
+    def evaluate_ints(self, hand: List[int], board: List[int]) -> int:
+        """
+        Fast path for 0-51 card indices: no string building or parsing.
+        """
+        t_hand = [CARD_TREYS_INTS[c] for c in hand]
+        t_board = [CARD_TREYS_INTS[c] for c in board]
         
         # Treys evaluate method needs board and hand
         return self._evaluator.evaluate(t_board, t_hand)
@@ -38,3 +39,107 @@ class HandEvaluator:
         """
         rank_class = self._evaluator.get_rank_class(score)
         return self._evaluator.class_to_string(rank_class)
+
+
+# === Array-based 7-card evaluation ===
+
+# Score used for "no flush possible" entries; worse than any real hand (max 7462).
+NO_HAND_SCORE = 9999
+
+PRIMES = np.array(TreysCard.PRIMES, dtype=np.int64)
+CARD_RANKS = np.arange(52, dtype=np.int64) // 4
+CARD_SUITS = np.arange(52, dtype=np.int64) % 4
+CARD_PRIMES = PRIMES[CARD_RANKS]
+CARD_RANK_BITS = np.left_shift(1, CARD_RANKS)
+
+_TABLES = None
+
+def _build_tables() -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Derive 7-card lookup tables from treys' 5-card tables:
+      - flush_table[rank_mask]: best flush/straight flush score for the ranks of one suit
+      - rank_keys / rank_scores: sorted prime products of every 7-card rank multiset
+        and the best non-flush score for that multiset
+    """
+    lookup = TreysEvaluator().table
+    flush_keys = np.array(sorted(lookup.flush_lookup), dtype=np.int64)
+    flush_vals = np.array([lookup.flush_lookup[k] for k in flush_keys], dtype=np.int16)
+    unsuited_keys = np.array(sorted(lookup.unsuited_lookup), dtype=np.int64)
+    unsuited_vals = np.array([lookup.unsuited_lookup[k] for k in unsuited_keys], dtype=np.int16)
+
+    def best_of_fives(ranks: np.ndarray, keys: np.ndarray, vals: np.ndarray) -> np.ndarray:
+        # ranks: (M, k) rank indices; score every 5-card subset and keep the best
+        subsets = np.array(list(combinations(range(ranks.shape[1]), 5)))
+        products = PRIMES[ranks[:, subsets]].prod(axis=2)
+        return vals[np.searchsorted(keys, products)].min(axis=1)
+
+    # Flush table, indexed directly by the 13-bit rank mask of a single suit
+    flush_table = np.full(1 << 13, NO_HAND_SCORE, dtype=np.int16)
+    for k in (5, 6, 7):
+        ranks = np.array(list(combinations(range(13), k)), dtype=np.int64)
+        masks = np.left_shift(1, ranks).sum(axis=1)
+        flush_table[masks] = best_of_fives(ranks, flush_keys, flush_vals)
+
+    # Rank multiset table (at most 4 of each rank), searched by prime product
+    multisets = np.array(
+        [c for c in combinations_with_replacement(range(13), 7)
+         if max(c.count(r) for r in set(c)) <= 4],
+        dtype=np.int64,
+    )
+    rank_keys = PRIMES[multisets].prod(axis=1)
+    order = np.argsort(rank_keys)
+    rank_keys = rank_keys[order]
+    rank_scores = best_of_fives(multisets[order], unsuited_keys, unsuited_vals)
+    return flush_table, rank_keys, rank_scores
+
+def get_tables() -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Build the lookup tables once per process and reuse them."""
+    global _TABLES
+    if _TABLES is None:
+        _TABLES = _build_tables()
+    return _TABLES
+
+
+class BatchEvaluator:
+    """
+    Scores many 7-card hands at once using integer card indices (0-51).
+    Scores are identical to HandEvaluator / treys (lower is better, 1-7462).
+    """
+    def __init__(self):
+        self.flush_table, self.rank_keys, self.rank_scores = get_tables()
+
+    def board_state(self, board: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Precompute the per-row prime product and per-suit rank masks of the board.
+        board: int array of shape (N, 5).
+        """
+        products = CARD_PRIMES[board].prod(axis=1)
+        masks = np.zeros((board.shape[0], 4), dtype=np.int64)
+        rows = np.arange(board.shape[0])
+        for col in range(board.shape[1]):
+            cards = board[:, col]
+            masks[rows, CARD_SUITS[cards]] |= CARD_RANK_BITS[cards]
+        return products, masks
+
+    def evaluate_with_board(self, hole: np.ndarray, board_products: np.ndarray, board_masks: np.ndarray) -> np.ndarray:
+        """
+        Score hole cards (N, 2) against a board already reduced by board_state().
+        """
+        rows = np.arange(hole.shape[0])
+        c1, c2 = hole[:, 0], hole[:, 1]
+
+        products = board_products * CARD_PRIMES[c1] * CARD_PRIMES[c2]
+        scores = self.rank_scores[np.searchsorted(self.rank_keys, products)]
+
+        masks = board_masks.copy()
+        masks[rows, CARD_SUITS[c1]] |= CARD_RANK_BITS[c1]
+        masks[rows, CARD_SUITS[c2]] |= CARD_RANK_BITS[c2]
+        flush_scores = self.flush_table[masks].min(axis=1)
+        return np.minimum(scores, flush_scores)
+
+    def evaluate(self, hole: np.ndarray, board: np.ndarray) -> np.ndarray:
+        """
+        Score hole cards (N, 2) with full boards (N, 5). Returns an int array of shape (N,).
+        """
+        products, masks = self.board_state(board)
+        return self.evaluate_with_board(hole, products, masks)
@@ -23,34 +23,94 @@ class Rank(Enum):
     KING = 'K'
     ACE = 'A'
 
+# Integer card encoding (0-51): index = rank * 4 + suit, following the
+# declaration order of Rank (2..A) and Suit (s, h, d, c).
+RANKS = list(Rank)
+SUITS = list(Suit)
+RANK_CHARS = "23456789TJQKA"
+SUIT_CHARS = "shdc"
+SUIT_SYMBOLS = {'♠': 's', '♥': 'h', '♦': 'd', '♣': 'c'}
+CARD_STRS = [r + s for r in RANK_CHARS for s in SUIT_CHARS]
+CARD_INDEX = {s: i for i, s in enumerate(CARD_STRS)}
+_RANK_INDEX = {r: i for i, r in enumerate(RANKS)}
+_SUIT_INDEX = {s: i for i, s in enumerate(SUITS)}
+_DISPLAY_STRS = [f"{r.value}{s.value}" for r in RANKS for s in SUITS]
+
 class Card:
+    """
+    A playing card backed by its 0-51 index. Construct with Card(rank, suit)
+    or Card.from_int(i) / Card.from_str('Ah') for the shared instance.
+    """
+    __slots__ = ("index",)
+
     def __init__(self, rank: Rank, suit: Suit):
-        self.rank = rank
-        self.suit = suit
+        self.index = _RANK_INDEX[rank] * 4 + _SUIT_INDEX[suit]
+
+    @staticmethod
+    def from_int(index: int) -> "Card":
+        return FULL_DECK[index]
+
+    @staticmethod
+    def from_str(card: str) -> "Card":
+        return FULL_DECK[card_to_int(card)]
+
+    @property
+    def rank(self) -> Rank:
+        return RANKS[self.index >> 2]
+
+    @property
+    def suit(self) -> Suit:
+        return SUITS[self.index & 3]
+
+    def __int__(self):
+        return self.index
+
+    def __eq__(self, other):
+        return isinstance(other, Card) and other.index == self.index
+
+    def __hash__(self):
+        return self.index
 
     def __str__(self):
-        return f"{self.rank.value}{self.suit.value}"
+        return _DISPLAY_STRS[self.index]
 
     def __repr__(self):
         return self.__str__()
     
     def to_treys_str(self):
         # treys expects 'Ah', '2d', 'Ts' etc.
-        # suits: s, h, d, c
-        s_map = {Suit.SPADES: 's', Suit.HEARTS: 'h', Suit.DIAMONDS: 'd', Suit.CLUBS: 'c'}
-        return f"{self.rank.value}{s_map[self.suit]}"
+        return CARD_STRS[self.index]
+
+# One shared instance per card; Deck.reset copies references instead of building objects
+FULL_DECK = tuple(Card(rank, suit) for rank in Rank for suit in Suit)
+
+def card_to_int(card) -> int:
+    """
+    Convert a Card, a card string ('Ah', 'A♥') or an int index to the 0-51 index.
+    """
+    if not isinstance(card, str):
+        return int(card)
+    clean = card
+    for sym, char in SUIT_SYMBOLS.items():
+        clean = clean.replace(sym, char)
+    try:
+        return CARD_INDEX[clean]
+    except KeyError:
+        raise ValueError(f"Invalid card string: {card}")
 
 class Deck:
-    def __init__(self):
+    def __init__(self, rng: Optional[random.Random] = None):
+        # Pass a seeded random.Random for reproducible deals; defaults to the global RNG
+        self.rng = rng if rng is not None else random
         self.cards: List[Card] = []
         self.reset()
 
     def reset(self):
-        self.cards = [Card(rank, suit) for suit in Suit for rank in Rank]
+        self.cards = list(FULL_DECK)
         self.shuffle()
 
     def shuffle(self):
-        random.shuffle(self.cards)
+        self.rng.shuffle(self.cards)
 
     def deal(self, n: int = 1) -> List[Card]:
         if len(self.cards) < n:
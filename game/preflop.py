@@ -0,0 +1,109 @@
+import os
+from typing import Dict, List, Optional
+import numpy as np
+from .models import RANK_CHARS, card_to_int
+
+# Players covered by the table (including self)
+MIN_PLAYERS = 2
+MAX_PLAYERS = 9
+
+DEFAULT_TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "preflop_equity.npz")
+
+# The 169 canonical starting hands, strongest ranks first: 'AA', 'AKs', 'AKo', ..., '22'
+HAND_CLASSES: List[str] = []
+for _hi in reversed(range(13)):
+    for _lo in reversed(range(_hi + 1)):
+        if _hi == _lo:
+            HAND_CLASSES.append(RANK_CHARS[_hi] * 2)
+        else:
+            HAND_CLASSES.append(RANK_CHARS[_hi] + RANK_CHARS[_lo] + "s")
+            HAND_CLASSES.append(RANK_CHARS[_hi] + RANK_CHARS[_lo] + "o")
+HAND_CLASS_INDEX = {name: i for i, name in enumerate(HAND_CLASSES)}
+
+def hand_class(hand: List) -> str:
+    """Canonical class of two hole cards (Card, 'Ah', 'A♥' or 0-51 int), e.g. 'AKs'."""
+    a, b = (card_to_int(c) for c in hand)
+    hi, lo = max(a >> 2, b >> 2), min(a >> 2, b >> 2)
+    if hi == lo:
+        return RANK_CHARS[hi] * 2
+    return RANK_CHARS[hi] + RANK_CHARS[lo] + ("s" if (a & 3) == (b & 3) else "o")
+
+def representative_hand(name: str) -> List[str]:
+    """One concrete hand of a class; preflop equity does not depend on which suits."""
+    if len(name) == 2:
+        return [name[0] + "s", name[1] + "h"]
+    return [name[0] + "s", name[1] + ("s" if name[2] == "s" else "h")]
+
+
+class PreflopTable:
+    """
+    Preflop equity against random hands, indexed by [hand class, num_players - MIN_PLAYERS].
+    Equity splits N-way ties 1/N; win and tie are the strictly-best and tied-for-best
+    frequencies (None for tables saved before they were recorded).
+    """
+    def __init__(self, equity: np.ndarray, std_error: np.ndarray, samples: int, win: Optional[np.ndarray] = None, tie: Optional[np.ndarray] = None):
+        self.equity = equity
+        self.std_error = std_error
+        self.samples = samples
+        self.win = win
+        self.tie = tie
+
+    def lookup(self, hand: List, num_players: int) -> Dict[str, Optional[float]]:
+        """Returns {'equity', 'std_error', 'win', 'tie'} for the hand at a table of num_players."""
+        row = HAND_CLASS_INDEX[hand_class(hand)]
+        col = num_players - MIN_PLAYERS
+        return {
+            "equity": float(self.equity[row, col]),
+            "std_error": float(self.std_error[row, col]),
+            "win": None if self.win is None else float(self.win[row, col]),
+            "tie": None if self.tie is None else float(self.tie[row, col]),
+        }
+
+    def covers(self, num_players: int) -> bool:
+        return MIN_PLAYERS <= num_players <= MAX_PLAYERS
+
+    def save(self, path: str = DEFAULT_TABLE_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        arrays = {"equity": self.equity, "std_error": self.std_error, "samples": np.int64(self.samples)}
+        if self.win is not None and self.tie is not None:
+            arrays.update(win=self.win, tie=self.tie)
+        np.savez_compressed(path, **arrays)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_TABLE_PATH) -> Optional["PreflopTable"]:
+        """Load a table written by save(); returns None if the file does not exist."""
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            win = data["win"] if "win" in data.files else None
+            tie = data["tie"] if "tie" in data.files else None
+            return cls(data["equity"], data["std_error"], int(data["samples"]), win, tie)
+
+
+def build_preflop_table(simulations: int = 100000, seed: int = 0, progress=None) -> PreflopTable:
+    """
+    Simulate every hand class at every table size. Deterministic for a given seed.
+    progress: optional callable(done, total) for reporting.
+    """
+    from .equity import EquityCalculator
+
+    calculator = EquityCalculator(seed=seed, use_preflop_table=False)
+    shape = (len(HAND_CLASSES), MAX_PLAYERS - MIN_PLAYERS + 1)
+    equity = np.zeros(shape, dtype=np.float32)
+    std_error = np.zeros(shape, dtype=np.float32)
+    win = np.zeros(shape, dtype=np.float32)
+    tie = np.zeros(shape, dtype=np.float32)
+    total = shape[0] * shape[1]
+
+    for row, name in enumerate(HAND_CLASSES):
+        hand = representative_hand(name)
+        for col in range(shape[1]):
+            result = calculator.calculate_equity_details(hand, [], col + MIN_PLAYERS, simulations=simulations, exact=False)
+            equity[row, col] = result["equity"]
+            std_error[row, col] = result["std_error"]
+            win[row, col] = result["win"]
+            tie[row, col] = result["tie"]
+            if progress:
+                progress(row * shape[1] + col + 1, total)
+
+    return PreflopTable(equity, std_error, simulations, win, tie)
@@ -0,0 +1,140 @@
+import re
+from typing import Dict, List, Tuple
+import numpy as np
+from .models import RANK_CHARS, card_to_int
+
+# All 1326 two-card combos as (low card, high card) 0-51 indices
+ALL_COMBOS: List[Tuple[int, int]] = [(a, b) for b in range(52) for a in range(b)]
+
+_WEIGHT_PREFIX = re.compile(r"^\s*([0-9]*\.?[0-9]+)\s*[×x*]\s*(.+)$")
+_WEIGHT_SUFFIX = re.compile(r"^(.+?)\s*:\s*([0-9]*\.?[0-9]+)\s*$")
+_SPECIFIC = re.compile(r"^([2-9TJQKA][shdc♠♥♦♣])([2-9TJQKA][shdc♠♥♦♣])$")
+_CLASS = re.compile(r"^([2-9TJQKA])([2-9TJQKA])([so]?)(\+?)$")
+_SPAN = re.compile(r"^([2-9TJQKA])([2-9TJQKA])([so]?)-([2-9TJQKA])([2-9TJQKA])([so]?)$")
+
+
+def _rank(char: str) -> int:
+    return RANK_CHARS.index(char)
+
+def _class_combos(hi: int, lo: int, kind: str) -> List[Tuple[int, int]]:
+    """Concrete combos of a hand class; kind is 's', 'o' or '' (both) for non-pairs."""
+    combos = []
+    for s1 in range(4):
+        for s2 in range(4):
+            a, b = hi * 4 + s1, lo * 4 + s2
+            if hi == lo:
+                if s1 >= s2:
+                    continue
+            elif kind == "s" and s1 != s2:
+                continue
+            elif kind == "o" and s1 == s2:
+                continue
+            combos.append((min(a, b), max(a, b)))
+    return combos
+
+def _token_combos(token: str) -> List[Tuple[int, int]]:
+    """Expand one range token ('QQ+', 'ATs+', 'A5s-A2s', '22-55', 'AhKh', 'any')."""
+    if token.lower() in ("any", "random", "100%"):
+        return list(ALL_COMBOS)
+
+    match = _SPECIFIC.match(token)
+    if match:
+        a, b = card_to_int(match.group(1)), card_to_int(match.group(2))
+        if a == b:
+            raise ValueError(f"Invalid combo: {token}")
+        return [(min(a, b), max(a, b))]
+
+    match = _CLASS.match(token)
+    if match:
+        r1, r2, kind, plus = _rank(match.group(1)), _rank(match.group(2)), match.group(3), match.group(4)
+        hi, lo = max(r1, r2), min(r1, r2)
+        if hi == lo:
+            if kind:
+                raise ValueError(f"Pairs cannot be suited/offsuit: {token}")
+            pairs = range(hi, 13) if plus else [hi]
+            return [c for r in pairs for c in _class_combos(r, r, "")]
+        # 'ATs+' raises the kicker up to just below the high card
+        kickers = range(lo, hi) if plus else [lo]
+        return [c for k in kickers for c in _class_combos(hi, k, kind)]
+
+    match = _SPAN.match(token)
+    if match:
+        a1, a2, kind1, b1, b2, kind2 = match.groups()
+        if kind1 != kind2:
+            raise ValueError(f"Mismatched suitedness in span: {token}")
+        a1, a2, b1, b2 = _rank(a1), _rank(a2), _rank(b1), _rank(b2)
+        if a1 == a2 and b1 == b2:
+            # Pair span: '22-55'
+            return [c for r in range(min(a1, b1), max(a1, b1) + 1) for c in _class_combos(r, r, "")]
+        if a1 == b1 and a1 not in (a2, b2):
+            # Kicker span with a fixed high card: 'A5s-A2s'
+            return [c for k in range(min(a2, b2), max(a2, b2) + 1) for c in _class_combos(a1, k, kind1)]
+    raise ValueError(f"Invalid range token: {token}")
+
+
+class HandRange:
+    """
+    A weighted set of two-card combos. Each combo is stored as its card pair,
+    a weight and a 52-bit card mask for fast card-removal checks.
+    """
+    def __init__(self, weights: Dict[Tuple[int, int], float]):
+        items = sorted((combo, w) for combo, w in weights.items() if w > 0)
+        self.combos = np.array([combo for combo, _ in items], dtype=np.int64).reshape(len(items), 2)
+        self.weights = np.array([w for _, w in items], dtype=np.float64)
+        self.masks = np.left_shift(1, self.combos[:, 0]) | np.left_shift(1, self.combos[:, 1])
+
+    @classmethod
+    def parse(cls, text: str) -> "HandRange":
+        """
+        Parse a range like "QQ+, AKs, 0.5×ATo, A5s-A2s, AhKh".
+        Weights go before the hand ("0.5×ATo", "0.5*ATo") or after it ("ATo:0.5");
+        a later token overrides the weight of combos listed earlier.
+        """
+        weights: Dict[Tuple[int, int], float] = {}
+        for raw in text.split(","):
+            token = raw.strip()
+            if not token:
+                continue
+            weight = 1.0
+            match = _WEIGHT_PREFIX.match(token) or _WEIGHT_SUFFIX.match(token)
+            if match:
+                if match.re is _WEIGHT_PREFIX:
+                    weight, token = float(match.group(1)), match.group(2).strip()
+                else:
+                    token, weight = match.group(1).strip(), float(match.group(2))
+            for combo in _token_combos(token):
+                weights[combo] = weight
+        if not weights:
+            raise ValueError(f"Empty range: {text!r}")
+        return cls(weights)
+
+    @classmethod
+    def from_hand(cls, hand: List) -> "HandRange":
+        """A range holding exactly one known hand."""
+        a, b = (card_to_int(c) for c in hand)
+        return cls({(min(a, b), max(a, b)): 1.0})
+
+    def without(self, dead_mask: int) -> "HandRange":
+        """Copy of the range with every combo that uses a dead card removed."""
+        keep = (self.masks & dead_mask) == 0
+        return HandRange({(int(a), int(b)): float(w) for (a, b), w in zip(self.combos[keep], self.weights[keep])})
+
+    def __len__(self):
+        return len(self.combos)
+
+    def __repr__(self):
+        return f"HandRange({len(self)} combos)"
+
+def to_range(value) -> HandRange:
+    """Accept a HandRange, a range string, or a list of two cards."""
+    if isinstance(value, HandRange):
+        return value
+    if isinstance(value, str):
+        return HandRange.parse(value)
+    return HandRange.from_hand(value)
+
+def card_mask(cards: List) -> int:
+    mask = 0
+    for c in cards:
+        mask |= 1 << card_to_int(c)
+    return mask
@@ -0,0 +1,251 @@
+import os
+import queue
+import random
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+import numpy as np
+from .engine import TexasHoldemGame, GameStage
+from .models import Player, PlayerState
+
+# Safety net against engine bugs: no real hand comes close to this many actions
+MAX_ACTIONS_PER_HAND = 1000
+
+# Hand records a table worker buffers before sending them to the aggregator
+RECORD_BATCH = 200
+
+
+class SimulationStats:
+    """
+    Aggregate results of many hands, per player. Stats from different runs
+    (or tables) can be combined with merge().
+    """
+    def __init__(self, big_blind: int = 20):
+        self.big_blind = big_blind
+        self.hands = 0
+        self.showdowns = 0
+        self.elapsed = 0.0
+        self.net: Dict[str, int] = {}
+        self.showdowns_seen: Dict[str, int] = {}
+        self.showdowns_won: Dict[str, int] = {}
+        self.pots_won: Dict[str, int] = {}
+
+    def add(self, record: Dict[str, Any]):
+        """Fold in one hand record as returned by play_hand()."""
+        self.hands += 1
+        if record["showdown"]:
+            self.showdowns += 1
+        for name, delta in record["net"].items():
+            self.net[name] = self.net.get(name, 0) + delta
+            self.showdowns_seen.setdefault(name, 0)
+            self.showdowns_won.setdefault(name, 0)
+            self.pots_won.setdefault(name, 0)
+        for name in record["showdown"]:
+            self.showdowns_seen[name] += 1
+        for name in record["winners"]:
+            self.pots_won[name] += 1
+            if record["showdown"]:
+                self.showdowns_won[name] += 1
+
+    def merge(self, other: "SimulationStats"):
+        self.hands += other.hands
+        self.showdowns += other.showdowns
+        self.elapsed = max(self.elapsed, other.elapsed)
+        for mine, theirs in ((self.net, other.net), (self.showdowns_seen, other.showdowns_seen),
+                             (self.showdowns_won, other.showdowns_won), (self.pots_won, other.pots_won)):
+            for name, value in theirs.items():
+                mine[name] = mine.get(name, 0) + value
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Returns dict with 'hands', 'showdown_rate', 'elapsed', 'hands_per_second' and
+        'players': {name: {'net', 'chips_per_100', 'bb_per_100', 'showdown_rate',
+        'showdown_win_rate', 'win_rate'}}.
+        """
+        players = {}
+        for name, net in self.net.items():
+            seen = self.showdowns_seen[name]
+            per_100 = net * 100 / self.hands if self.hands else 0.0
+            players[name] = {
+                "net": net,
+                "chips_per_100": per_100,
+                "bb_per_100": per_100 / self.big_blind,
+                "showdown_rate": seen / self.hands if self.hands else 0.0,
+                "showdown_win_rate": self.showdowns_won[name] / seen if seen else 0.0,
+                "win_rate": self.pots_won[name] / self.hands if self.hands else 0.0,
+            }
+        return {
+            "hands": self.hands,
+            "showdown_rate": self.showdowns / self.hands if self.hands else 0.0,
+            "elapsed": self.elapsed,
+            "hands_per_second": self.hands / self.elapsed if self.elapsed else 0.0,
+            "players": players,
+        }
+
+
+def play_hand(game: TexasHoldemGame, policies: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Play one hand to completion through start_hand()/step(), asking each seat's
+    policy (anything with get_action(game_info, valid_actions)) for its moves.
+
+    Returns dict with 'net' (chips won or lost per player), 'showdown'
+    (players who reached showdown, empty if everyone else folded) and 'winners'.
+    """
+    stacks = {p.name: p.chips for p in game.players}
+    game.start_hand()
+
+    actions = 0
+    while game.stage != GameStage.GAME_OVER:
+        player = game.players[game.current_player_index]
+        valid_actions = game.get_legal_actions(player)
+        if not valid_actions:
+            raise ValueError(f"Engine stalled: {player.name} to act with no legal actions at {game.stage.name}")
+
+        decision = policies[player.name].get_action(game.get_game_info(player), valid_actions)
+        action = decision.get("action", "fold")
+        if action not in valid_actions:
+            action = "check" if "check" in valid_actions else "fold"
+        amount = 0
+        if action == "raise":
+            try:
+                amount = int(decision.get("amount", game.big_blind))
+            except (TypeError, ValueError):
+                amount = game.big_blind
+            amount = max(amount, game.big_blind)
+        game.step(action, amount)
+
+        actions += 1
+        if actions > MAX_ACTIONS_PER_HAND:
+            raise ValueError(f"Hand did not finish within {MAX_ACTIONS_PER_HAND} actions")
+
+    in_hand = [p.name for p in game.players if p.status in (PlayerState.ACTIVE, PlayerState.ALL_IN)]
+    return {
+        "net": {p.name: p.chips - stacks[p.name] for p in game.players},
+        "showdown": in_hand if len(in_hand) > 1 else [],
+        "winners": [w.name for w in game.winners],
+    }
+
+
+def simulate(policies: Dict[str, Any], hands: int, seed: Optional[int] = None, starting_stack: int = 2000,
+             small_blind: int = 10, big_blind: int = 20, check_chips: bool = True, on_hand=None) -> SimulationStats:
+    """
+    Headless self-play: seat one player per policy and play `hands` hands.
+
+    Every hand starts with all stacks reset to starting_stack (a cash game with
+    automatic rebuys), and the button moves one seat per hand. The deck is
+    shuffled from a random.Random(seed), so a run is reproducible when the
+    policies are seeded too. Nothing is printed.
+
+    check_chips: raise ValueError if a hand creates or destroys chips.
+    on_hand: optional callable(record) receiving every play_hand() record.
+    """
+    if len(policies) < 2:
+        raise ValueError("Need at least two policies to simulate")
+
+    game = TexasHoldemGame(small_blind=small_blind, big_blind=big_blind, rng=random.Random(seed))
+    for name in policies:
+        game.add_player(Player(name, is_ai=True, chips=starting_stack))
+
+    stats = SimulationStats(big_blind)
+    start = time.perf_counter()
+    for _ in range(hands):
+        for p in game.players:
+            p.chips = starting_stack
+        record = play_hand(game, policies)
+        if check_chips and sum(record["net"].values()) != 0:
+            raise ValueError(f"Chips not conserved in hand {stats.hands + 1}: {record['net']}")
+        stats.add(record)
+        if on_hand:
+            on_hand(record)
+        game.dealer_index = (game.dealer_index + 1) % len(game.players)
+    stats.elapsed = time.perf_counter() - start
+    return stats
+
+
+# === Multi-table runs ===
+
+# Set in each table worker by the pool initializer
+_RECORD_QUEUE = None
+
+def _init_table_worker(record_queue):
+    global _RECORD_QUEUE
+    _RECORD_QUEUE = record_queue
+
+def table_seeds(seed: Optional[int], tables: int) -> List[int]:
+    """Independent per-table seeds spawned from one root seed."""
+    return [int(s.generate_state(1)[0]) for s in np.random.SeedSequence(seed).spawn(tables)]
+
+def _run_table(policy_factory: Callable, table_index: int, table_seed: int, hands: int, settings: Dict[str, Any], record_queue=None) -> int:
+    """
+    Play one table and send its hand records, in batches of RECORD_BATCH, to
+    the aggregator queue as (table_index, records). Returns the hands played.
+    """
+    record_queue = record_queue if record_queue is not None else _RECORD_QUEUE
+    buffer: List[Dict[str, Any]] = []
+
+    def on_hand(record):
+        buffer.append(record)
+        if len(buffer) >= RECORD_BATCH:
+            record_queue.put((table_index, list(buffer)))
+            buffer.clear()
+
+    simulate(policy_factory(table_index, table_seed), hands, seed=table_seed, on_hand=on_hand, **settings)
+    if buffer:
+        record_queue.put((table_index, buffer))
+    return hands
+
+def run_tables(policy_factory: Callable, tables: int, hands_per_table: int, seed: Optional[int] = None, workers: Optional[int] = None,
+               starting_stack: int = 2000, small_blind: int = 10, big_blind: int = 20, on_hand=None, progress=None) -> SimulationStats:
+    """
+    Play many independent tables, sharded across a process pool, and aggregate
+    every hand into one SimulationStats.
+
+    policy_factory(table_index, table_seed) -> {name: policy} builds the seats of
+        one table inside the worker; it must be picklable (a module-level function
+        or functools.partial of one, e.g. ai.bots.profile_policies).
+    seed: root seed; each table gets its own deck seed from table_seeds(), so the
+        aggregate does not depend on the number of workers.
+    workers: processes to use (default: CPU count); 1 runs every table in-process.
+    on_hand: optional callable(table_index, record) called in this process for every hand.
+    progress: optional callable(done, total) called as batches of hands arrive.
+    """
+    if tables < 1:
+        raise ValueError("Need at least one table")
+    workers = min(workers or os.cpu_count() or 1, tables)
+    settings = {"starting_stack": starting_stack, "small_blind": small_blind, "big_blind": big_blind}
+    seeds = table_seeds(seed, tables)
+    total = tables * hands_per_table
+
+    stats = SimulationStats(big_blind)
+    start = time.perf_counter()
+
+    def consume(table_index, records):
+        for record in records:
+            stats.add(record)
+            if on_hand:
+                on_hand(table_index, record)
+        if progress:
+            progress(stats.hands, total)
+
+    if workers == 1:
+        local_queue = queue.SimpleQueue()
+        for i in range(tables):
+            _run_table(policy_factory, i, seeds[i], hands_per_table, settings, local_queue)
+            while not local_queue.empty():
+                consume(*local_queue.get())
+    else:
+        record_queue = multiprocessing.Queue()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_table_worker, initargs=(record_queue,)) as pool:
+            futures = [pool.submit(_run_table, policy_factory, i, seeds[i], hands_per_table, settings) for i in range(tables)]
+            # Records may still be in flight after a future finishes, so drain by count
+            while stats.hands < total:
+                try:
+                    consume(*record_queue.get(timeout=0.1))
+                except queue.Empty:
+                    for future in futures:
+                        if future.done() and future.exception() is not None:
+                            raise future.exception()
+
+    stats.elapsed = time.perf_counter() - start
+    return stats
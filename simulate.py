@@ -0,0 +1,55 @@
+import sys
+import os
+import argparse
+import json
+from functools import partial
+
+# Ensure we can import from the project
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from game.simulation import simulate, run_tables
+from ai.bots import profile_policies, BOT_PROFILES
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless self-play between non-LLM bots.")
+    parser.add_argument("--hands", type=int, default=10000, help="Hands to play (per table)")
+    parser.add_argument("--tables", type=int, default=1, help="Independent tables, each with its own seeded deck")
+    parser.add_argument("--workers", type=int, default=None, help="Processes to spread the tables over (default: CPU count)")
+    parser.add_argument("--players", default="tag,lag,station,rock", help=f"Comma-separated bot profiles, one per seat (random, mcts, cfr, {', '.join(BOT_PROFILES)})")
+    parser.add_argument("--seed", type=int, default=0, help="RNG seed for the deck and the bots")
+    parser.add_argument("--stack", type=int, default=2000, help="Starting stack, restored before every hand")
+    parser.add_argument("--small-blind", type=int, default=10)
+    parser.add_argument("--big-blind", type=int, default=20)
+    parser.add_argument("--output", help="Write the aggregate results to this JSON file")
+    args = parser.parse_args()
+
+    profiles = [p.strip() for p in args.players.split(",") if p.strip()]
+    if args.tables > 1:
+        reported = [0]
+
+        def progress(done, total):
+            # Report every 10%
+            if done * 10 // total > reported[0]:
+                reported[0] = done * 10 // total
+                print(f"  {done}/{total} hands")
+
+        stats = run_tables(partial(profile_policies, profiles), args.tables, args.hands, seed=args.seed, workers=args.workers,
+                           starting_stack=args.stack, small_blind=args.small_blind, big_blind=args.big_blind, progress=progress)
+    else:
+        stats = simulate(profile_policies(profiles, 0, args.seed), args.hands, seed=args.seed, starting_stack=args.stack,
+                         small_blind=args.small_blind, big_blind=args.big_blind)
+    summary = stats.summary()
+
+    print(f"{summary['hands']} hands in {summary['elapsed']:.1f}s ({summary['hands_per_second']:.0f} hands/s), "
+          f"showdown in {summary['showdown_rate']:.1%} of hands")
+    print(f"{'player':<12}{'bb/100':>10}{'chips/100':>12}{'WTSD':>8}{'W$SD':>8}")
+    for name, p in summary["players"].items():
+        print(f"{name:<12}{p['bb_per_100']:>10.1f}{p['chips_per_100']:>12.1f}{p['showdown_rate']:>8.1%}{p['showdown_win_rate']:>8.1%}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(summary, f, indent=2)
+        print(f"✅ Saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import sys
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from ai.agent import PokerAgent
+from ai.batching import DecisionBatcher
+from ai.llm_client import LLMClient
+from ai.mock_server import MockLLMServer, default_responder
+
+INFO = {"my_hand": ["Qc", "Jd"], "board": ["Ah", "Kh", "2s"], "pot": 100, "current_bet": 20, "to_call": 10, "my_chips": 500, "my_bet": 10}
+
+def decide_all(agents, batcher_spots):
+    with ThreadPoolExecutor(len(agents)) as pool:
+        return list(pool.map(lambda pair: pair[0].get_action(INFO, pair[1]), zip(agents, batcher_spots)))
+
+def test_combined_batch_routes_each_decision():
+    # Half the seats may check, half must call: each must get its own answer back
+    spots = [["fold", "check", "raise"] if i % 2 else ["fold", "call", "raise"] for i in range(6)]
+    with MockLLMServer() as server:
+        client = LLMClient(api_key="mock-key", base_url=server.url, max_retries=0, hedge_after=None)
+        batcher = DecisionBatcher(client, window=5.0, max_batch=6, combine=True)
+        agents = [PokerAgent(f"Bot{i}", client=client, fast_path=None, batcher=batcher) for i in range(6)]
+        decisions = decide_all(agents, spots)
+        assert [d["action"] for d in decisions] == ["call", "check"] * 3
+        assert server.stats()["requests"] == 1
+        assert batcher.stats() == {"batches": 1, "decisions": 6, "requests": 1, "retries": 0, "mean_batch": 6.0}
+
+def test_concurrent_batch_and_partial_replies():
+    messages = [[{"role": "user", "content": f"Valid Actions: fold, {a}"}] for a in ("call", "check", "call")]
+    with MockLLMServer() as server:
+        client = LLMClient(api_key="mock-key", base_url=server.url, max_retries=0, hedge_after=None)
+        batcher = DecisionBatcher(client, window=0.05, max_batch=8)
+        with ThreadPoolExecutor(3) as pool:
+            replies = list(pool.map(batcher.chat_completion, messages))
+        assert [r["action"] for r in replies] == ["call", "check", "call"]
+        assert server.stats()["requests"] == 3 and batcher.stats()["batches"] == 1
+
+    # A combined reply that skips decisions: the missing ones are asked again on their own
+    def forgetful(msgs):
+        reply = default_responder(msgs)
+        if "decisions" in reply:
+            reply["decisions"] = {"0": reply["decisions"]["0"]}
+        return reply
+
+    with MockLLMServer(responder=forgetful) as server:
+        client = LLMClient(api_key="mock-key", base_url=server.url, max_retries=0, hedge_after=None)
+        batcher = DecisionBatcher(client, window=5.0, max_batch=3, combine=True)
+        with ThreadPoolExecutor(3) as pool:
+            replies = list(pool.map(batcher.chat_completion, messages))
+        assert [r["action"] for r in replies] == ["call", "check", "call"]
+        assert server.stats()["requests"] == 3 and batcher.stats()["retries"] == 2
+
+def test_json_mode_is_passed_through():
+    messages = [[{"role": "user", "content": f"Valid Actions: fold, {a}"}] for a in ("call", "check", "call")]
+    with MockLLMServer() as server:
+        client = LLMClient(api_key="mock-key", base_url=server.url, max_retries=0, hedge_after=None)
+        batcher = DecisionBatcher(client, window=5.0, max_batch=3, combine=True)
+        with ThreadPoolExecutor(3) as pool:
+            replies = list(pool.map(batcher.chat_completion, messages, [True, False, True]))
+        # The plain-text request is sent on its own, the JSON ones share a combined prompt
+        assert set(replies[1]) == {"content"}
+        assert replies[0]["action"] == "call" and replies[2]["action"] == "call"
+        assert server.stats()["requests"] == 2 and batcher.stats()["requests"] == 2
+
+if __name__ == "__main__":
+    test_combined_batch_routes_each_decision()
+    test_concurrent_batch_and_partial_replies()
+    test_json_mode_is_passed_through()
+    print("Batching tests passed.")
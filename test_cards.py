@@ -0,0 +1,30 @@
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from game.models import Card, Deck, Rank, Suit, card_to_int
+from game.evaluator import HandEvaluator
+
+def test_int_backed_cards():
+    card = Card(Rank.ACE, Suit.HEARTS)
+    assert card.index == 49
+    assert card.rank == Rank.ACE and card.suit == Suit.HEARTS
+    assert str(card) == "A♥" and card.to_treys_str() == "Ah"
+    assert card == Card.from_str("Ah") == Card.from_str("A♥") == Card.from_int(49)
+    assert card_to_int(card) == card_to_int("Ah") == card_to_int(49) == 49
+
+    deck = Deck()
+    assert len(set(deck.cards)) == 52
+
+def test_evaluator_accepts_all_card_forms():
+    ev = HandEvaluator()
+    as_strs = ev.evaluate(["Ah", "Kd"], ["2s", "5d", "9c"])
+    as_cards = ev.evaluate([Card.from_str("Ah"), Card.from_str("Kd")], ["2♠", "5♦", "9♣"])
+    as_ints = ev.evaluate_ints([49, 46], [card_to_int("2s"), card_to_int("5d"), card_to_int("9c")])
+    assert as_strs == as_cards == as_ints
+
+if __name__ == "__main__":
+    test_int_backed_cards()
+    test_evaluator_accepts_all_card_forms()
+    print("Card tests passed.")
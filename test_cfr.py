@@ -0,0 +1,92 @@
+import sys
+import os
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+from ai.bots import make_bot
+from ai.cfr import (CFRTrainer, CFRBlueprint, CFRPolicy, CardAbstraction, abstract_actions, regret_matching,
+                    ACTIONS, RAISE_ALL, REGRETS_FILE)
+from game.simulation import simulate
+
+def test_abstract_actions():
+    info = {"to_call": 20, "my_chips": 1000, "pot": 60, "big_blind": 20}
+    moves = abstract_actions(info, ["fold", "call", "raise"])
+    assert moves == {0: ("fold", 0), 1: ("call", 0), 2: ("raise", 30), 3: ("raise", 60), RAISE_ALL: ("raise", 980)}
+    # Free check: no fold; raise cap: only check
+    assert abstract_actions(dict(info, to_call=0), ["fold", "check", "raise"], allow_raise=False) == {1: ("check", 0)}
+    # Short stack: pot raises that do not fit are dropped, calling for less is all-in
+    assert set(abstract_actions(dict(info, my_chips=70), ["fold", "call", "raise"])) == {0, 1, 2, RAISE_ALL}
+    assert abstract_actions(dict(info, my_chips=10), ["fold", "all_in"]) == {0: ("fold", 0), 1: ("all_in", 0)}
+
+def test_regret_matching():
+    regrets = np.array([3.0, -1.0, 1.0, 0.0, 0.0])
+    assert np.allclose(regret_matching(regrets, [0, 1, 2]), [0.75, 0.0, 0.25])
+    assert np.allclose(regret_matching(regrets, [1, 3]), [0.5, 0.5])
+
+def test_rows_are_distinct_and_in_range():
+    abstraction = CardAbstraction(buckets=4)
+    seen = set()
+    for stage in ("PREFLOP", "FLOP", "TURN", "RIVER"):
+        for bucket in range(4):
+            for to_call in (0, 10, 30, 60, 500):
+                for chips in (50, 200, 500, 2000):
+                    for seat in (0, 1):
+                        row = abstraction.row({"stage": stage, "to_call": to_call, "pot": 100, "my_chips": chips, "seat": seat, "dealer": 0}, bucket)
+                        assert 0 <= row < abstraction.rows
+                        seen.add(row)
+    assert len(seen) == abstraction.rows
+    assert abstraction.bucket(["Ah", "As"], []) == 3
+    assert abstraction.bucket(["7h", "2c"], []) <= 1
+
+def test_buckets_are_deterministic():
+    # Spots near a bin edge must not move between calls, calculators or suit relabellings
+    spots = [(["Ah", "Kd"], ["2s", "5d", "9c"]), (["Qh", "Jh"], ["Th", "4c", "2h", "8s"]), (["9c", "9d"], ["Ks", "7h", "3d", "2c", "Jd"])]
+    first = [CardAbstraction(buckets=50).bucket(hand, board) for hand, board in spots]
+    assert first == [CardAbstraction(buckets=50).bucket(hand, board) for hand, board in spots]
+    abstraction = CardAbstraction(buckets=50)
+    assert [abstraction.bucket(hand, board) for hand, board in spots * 2] == first * 2
+    assert abstraction.bucket(["Qs", "Js"], ["Ts", "4d", "2s", "8c"]) == first[1]
+
+def test_train_checkpoint_and_resume():
+    with tempfile.TemporaryDirectory() as path:
+        trainer = CFRTrainer(path, buckets=4, equity_simulations=50, stack=400, seed=0)
+        assert isinstance(trainer.regrets, np.memmap)
+        trainer.train(6, checkpoint_every=3)
+        assert (trainer.regrets >= 0).all() and trainer.strategy_sum.sum() > 0
+        saved = np.array(trainer.strategy_sum)
+        del trainer
+
+        resumed = CFRTrainer(path, buckets=99, seed=1)  # stored settings win
+        assert resumed.iterations == 6 and resumed.abstraction.buckets == 4
+        assert np.array_equal(np.array(resumed.strategy_sum), saved)
+        resumed.train(2)
+        assert CFRBlueprint.load(path).iterations == 8
+        assert np.load(os.path.join(path, REGRETS_FILE), mmap_mode="r").shape == (resumed.abstraction.rows, len(ACTIONS))
+
+def test_policy_plays_and_falls_back():
+    with tempfile.TemporaryDirectory() as path:
+        CFRTrainer(path, buckets=4, equity_simulations=50, stack=400, seed=0).train(20)
+        blueprint = CFRBlueprint.load(path)
+        rows = blueprint.strategy.sum(axis=1)
+        assert np.allclose(rows[rows > 0], 1.0)
+
+        policies = {"cfr": CFRPolicy("cfr", blueprint=blueprint, seed=0), "tag": make_bot("tag", "tag", seed=1)}
+        stats = simulate(policies, 30, seed=2, starting_stack=400)
+        assert stats.hands == 30
+
+        # Three seats, or no blueprint at all: the RuleBot answers
+        info = {"my_hand": ["Ah", "As"], "board": [], "pot": 30, "to_call": 20, "big_blind": 20, "num_active_players": 3,
+                "my_chips": 400, "seat": 0, "dealer": 1, "stage": "PREFLOP", "seats": [{}, {}, {}]}
+        assert CFRPolicy(blueprint=blueprint, seed=0).get_action(info, ["fold", "call", "raise"])["action"] in ("call", "raise")
+        assert CFRPolicy(path=os.path.join(path, "missing"), seed=0).blueprint is None
+
+if __name__ == "__main__":
+    test_abstract_actions()
+    test_regret_matching()
+    test_rows_are_distinct_and_in_range()
+    test_buckets_are_deterministic()
+    test_train_checkpoint_and_resume()
+    test_policy_plays_and_falls_back()
+    print("CFR tests passed.")
@@ -4,6 +4,9 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'texas-holdem-ai'))
 
 from ai.llm_client import LLMClient
 
+# Initialization makes no request, so a placeholder key is enough to run offline
+os.environ.setdefault("ZHIPU_API_KEY", "mock-key")
+
 def test_init():
     print("Testing LLMClient initialization...")
     try:
@@ -0,0 +1,197 @@
+import sys
+import os
+import random
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from ai.bots import make_bot
+from game.engine import TexasHoldemGame, GameStage
+from game.models import Player, PlayerState
+
+PROFILES = ["tag", "lag", "station", "random"]
+
+def make_table(seats, seed, chips=None):
+    game = TexasHoldemGame(rng=random.Random(seed))
+    stacks = random.Random(seed)
+    for i in range(seats):
+        game.add_player(Player(f"P{i}", chips=chips or stacks.randint(30, 400)))
+    policies = {f"P{i}": make_bot(PROFILES[i % 4], f"P{i}", seed=seed + i) for i in range(seats)}
+    return game, policies
+
+def play_step(game, policies):
+    player = game.players[game.current_player_index]
+    valid_actions = game.get_legal_actions(player)
+    decision = policies[player.name].get_action(game.get_game_info(player), valid_actions)
+    action = decision.get("action")
+    if action not in valid_actions:
+        action = "check" if "check" in valid_actions else "fold"
+    amount = max(int(decision.get("amount") or 0), game.big_blind) if action == "raise" else 0
+    game.step(action, amount)
+    return action, amount
+
+def assert_masks_match(game):
+    for state in PlayerState:
+        expected = sum(1 << i for i, p in enumerate(game.players) if p.status == state)
+        assert game.status_masks[state] == expected, (state, game.status_masks[state], expected)
+    assert game.to_act_mask & ~game.active_mask == 0
+
+def test_masks_track_statuses_with_busts():
+    for seed in range(5):
+        game, policies = make_table(9, seed)
+        for _ in range(40):
+            if sum(p.chips > 0 for p in game.players) < 2:
+                break
+            game.start_hand()
+            assert_masks_match(game)
+            while game.stage != GameStage.GAME_OVER:
+                play_step(game, policies)
+                assert_masks_match(game)
+                if game.stage != GameStage.GAME_OVER:
+                    assert game.players[game.current_player_index].status == PlayerState.ACTIVE
+            assert all(len(p.hand) == 2 for p in game.players if p.status != PlayerState.OUT)
+            game.dealer_index = (game.dealer_index + 1) % len(game.players)
+
+def test_all_in_blind_gets_hole_cards():
+    game = TexasHoldemGame(rng=random.Random(0))
+    for name, chips in (("A", 500), ("B", 5), ("C", 500)):
+        game.add_player(Player(name, chips=chips))
+    game.start_hand()
+    short = game.players[1]
+    assert short.status == PlayerState.ALL_IN and len(short.hand) == 2
+    while game.stage != GameStage.GAME_OVER:
+        player = game.players[game.current_player_index]
+        game.step("call" if "call" in game.get_legal_actions(player) else "check")
+    assert sum(p.chips for p in game.players) == 1005
+
+def test_next_seat_wraps():
+    mask = 0b1001010
+    assert TexasHoldemGame._next_seat(1, mask) == 3
+    assert TexasHoldemGame._next_seat(3, mask) == 6
+    assert TexasHoldemGame._next_seat(6, mask) == 1
+    assert TexasHoldemGame._next_seat(-1, mask) == 1
+    assert TexasHoldemGame._next_seat(2, 0) == -1
+
+def test_positions_skip_busted_seats():
+    game = TexasHoldemGame()
+    for i in range(9):
+        game.add_player(Player(f"P{i}"))
+    game.players[3].chips = 0
+    game.dealer_index = 5
+    game.start_hand()
+    positions = [game.get_player_position(p) for p in game.players]
+    assert positions == ['UTG+1', 'MP', 'MP', 'OUT', 'CO', 'BTN', 'SB', 'BB', 'UTG']
+    game.dealer_index = 6
+    assert game.get_player_position(game.players[6]) == "BTN"
+
+def settle(stacks, bets, statuses, hands, board):
+    """Settle a showdown set up by hand: total bets, statuses and hole cards per seat."""
+    from game.models import Card
+    game = TexasHoldemGame()
+    for i, (chips, bet, status, hand) in enumerate(zip(stacks, bets, statuses, hands)):
+        p = Player(f"P{i}", chips=chips)
+        p.total_bet = bet
+        p.status = status
+        p.hand = [Card.from_str(c) for c in hand]
+        game.add_player(p)
+    game.board = [Card.from_str(c) for c in board]
+    game.pot = sum(bets)
+    return game, game._settle_side_pots()
+
+def test_side_pot_breakdown():
+    A, F = PlayerState.ALL_IN, PlayerState.FOLDED
+    board = ["2c", "7d", "9h", "Js", "4c"]
+    # P0 short all-in with the best hand, P1 beats P2 for the side pot, P3 folded
+    game, pots = settle([0, 0, 50, 0], [50, 200, 150, 100], [A, A, PlayerState.ACTIVE, F],
+                        [["Ah", "Ad"], ["Kh", "Kd"], ["Qh", "Qd"], ["3h", "3d"]], board)
+    assert pots == [
+        {'amount': 200, 'eligible': [0, 1, 2], 'winners': [0]},
+        {'amount': 250, 'eligible': [1, 2], 'winners': [1]},
+        {'amount': 50, 'eligible': [1], 'winners': [1]},
+    ]
+    assert game.payouts == {"P0": 200, "P1": 300}
+    assert [w.name for w in game.winners] == ["P0", "P1"]
+    assert game.side_pots is pots and game.pot == 0
+
+def test_split_pot_and_uncontested_layer():
+    A, F = PlayerState.ALL_IN, PlayerState.FOLDED
+    board = ["Ac", "Kd", "Qh", "Js", "Tc"]
+    # Both live players play the board; the folded top contribution falls into the pot below
+    game, pots = settle([0, 0, 0], [75, 75, 101], [A, A, F], [["2h", "3d"], ["4h", "5d"], ["6h", "6d"]], board)
+    assert pots == [{'amount': 251, 'eligible': [0, 1], 'winners': [0, 1]}]
+    assert game.payouts == {"P0": 126, "P1": 125}
+
+def test_each_hand_scored_once():
+    game = TexasHoldemGame(rng=random.Random(3))
+    for i in range(6):
+        game.add_player(Player(f"P{i}", chips=100 + 50 * i))
+    calls = []
+    evaluate_ints = game.evaluator.evaluate_ints
+    game.evaluator.evaluate_ints = lambda hand, board: calls.append(tuple(hand)) or evaluate_ints(hand, board)
+    game.start_hand()
+    while game.stage != GameStage.GAME_OVER:
+        game.step("all_in")
+    assert len(calls) == len(set(calls)) == 6
+    assert len(game.side_pots) == 6
+    assert sum(pot['amount'] for pot in game.side_pots) == sum(100 + 50 * i for i in range(6))
+
+def table_state(game):
+    """Everything observable about the table, as plain values."""
+    return ([(p.chips, p.current_bet, p.total_bet, p.status, p.acted_in_round, [c.index for c in p.hand]) for p in game.players],
+            [c.index for c in game.deck.cards], [c.index for c in game.board], game.pot, game.current_bet, game.stage,
+            game.current_player_index, game.aggressor_index, dict(game.status_masks), game.to_act_mask,
+            [w.name for w in game.winners], dict(game.payouts), game.side_pots)
+
+def test_snapshot_restore_round_trip():
+    game, policies = make_table(6, 11)
+    game.start_hand()
+    play_step(game, policies)
+    before = table_state(game)
+    state = game.snapshot()
+    actions = []
+    while game.stage != GameStage.GAME_OVER:
+        actions.append(play_step(game, policies))
+    finished = table_state(game)
+
+    game.restore(state)
+    assert table_state(game) == before
+    # The same actions from the restored state deal the same cards and settle the same way
+    for action, amount in actions:
+        game.step(action, amount)
+    assert table_state(game) == finished
+
+    other, _ = make_table(7, 0)
+    try:
+        other.restore(state)
+        assert False, "restoring into a table with other seats should fail"
+    except ValueError:
+        pass
+
+def test_undo_log_replays_identically():
+    game, policies = make_table(9, 4, chips=300)
+    game.undo_log = []
+    game.start_hand()
+    states = [table_state(game)]
+    while game.stage != GameStage.GAME_OVER:
+        play_step(game, policies)
+        states.append(table_state(game))
+    assert len(game.undo_log) == len(states) - 1
+    for expected in reversed(states[:-1]):
+        game.undo()
+        assert table_state(game) == expected
+    try:
+        game.undo()
+        assert False, "undo past the first step should fail"
+    except ValueError:
+        pass
+
+if __name__ == "__main__":
+    test_masks_track_statuses_with_busts()
+    test_all_in_blind_gets_hole_cards()
+    test_next_seat_wraps()
+    test_positions_skip_busted_seats()
+    test_side_pot_breakdown()
+    test_split_pot_and_uncontested_layer()
+    test_each_hand_scored_once()
+    test_snapshot_restore_round_trip()
+    test_undo_log_replays_identically()
+    print("Engine state tests passed.")
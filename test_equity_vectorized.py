@@ -0,0 +1,159 @@
+import sys
+import os
+import random
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+from game.equity import EquityCalculator, EquityCache, canonical_spot
+from game.equity_pool import shutdown_worker_pools
+from game.evaluator import HandEvaluator, BatchEvaluator
+from game.models import CARD_STRS
+
+def test_batch_evaluator_matches_treys():
+    rng = random.Random(7)
+    rows = np.array([rng.sample(range(52), 7) for _ in range(3000)])
+    scores = BatchEvaluator().evaluate(rows[:, :2], rows[:, 2:])
+
+    ev = HandEvaluator()
+    for row, score in zip(rows, scores):
+        hand = [CARD_STRS[c] for c in row[:2]]
+        board = [CARD_STRS[c] for c in row[2:]]
+        assert ev.evaluate(hand, board) == score
+
+def test_vectorized_equity():
+    eq = EquityCalculator(seed=42)
+
+    # Made nuts on the river never loses
+    assert eq.calculate_equity(["Ah", "Kh"], ["Qh", "Jh", "Th", "2c", "3d"], 3, simulations=2000) == 1.0
+
+    # AA vs random hand preflop is ~85%
+    aa = eq.calculate_equity(["A♠", "A♥"], [], 2, simulations=50000, exact=False)
+    assert abs(aa - 0.852) < 0.01
+
+    # Agrees with the reference loop within sampling error
+    fast = eq.calculate_equity(["Ah", "Kd"], ["2s", "5d", "9c"], 3, simulations=50000)
+    slow = eq.calculate_equity(["Ah", "Kd"], ["2s", "5d", "9c"], 3, simulations=3000, vectorized=False)
+    assert abs(fast - slow) < 0.04
+
+def test_exact_equity():
+    eq = EquityCalculator(seed=1)
+
+    # Heads-up river: all C(45, 2) = 990 opponent hands are enumerated
+    river = eq.calculate_equity_details(["Ah", "Kd"], ["2s", "5d", "9c", "Jh", "3c"], 2)
+    assert river["method"] == "exact" and river["samples"] == 990
+    assert river == eq.calculate_equity_details(["Ah", "Kd"], ["2s", "5d", "9c", "Jh", "3c"], 2)
+
+    # Heads-up turn is below the auto threshold too
+    turn = eq.calculate_equity_details(["Ah", "Kd"], ["2s", "5d", "9c", "Jh"], 2)
+    assert turn["method"] == "exact" and turn["samples"] == 46 * 990
+
+    # Flop 3-way is too large: falls back to sampling unless forced (and forcing is capped)
+    flop = eq.calculate_equity_details(["Ah", "Kd"], ["2s", "5d", "9c"], 3, simulations=1000)
+    assert flop["method"] == "monte_carlo" and flop["samples"] == 1000
+    try:
+        eq.calculate_equity_details(["Ah", "Kd"], [], 2, exact=True)
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+
+    # Sampling agrees with the exact answer
+    sampled = eq.calculate_equity(["Ah", "Kd"], ["2s", "5d", "9c", "Jh"], 2, simulations=100000, exact=False)
+    assert abs(sampled - turn["equity"]) < 0.01
+
+def test_exact_per_opponent_multiway():
+    # Exact enumeration treats opponents as unordered; each seat must still get the same record
+    exact = EquityCalculator(use_cache=False).calculate_equity_details(["Ah", "Kd"], ["2s", "5d", "9c", "Jh", "3c"], 3, exact=True)
+    sampled = EquityCalculator(seed=5, use_cache=False).calculate_equity_details(["Ah", "Kd"], ["2s", "5d", "9c", "Jh", "3c"], 3, simulations=100000, exact=False)
+    assert exact["per_opponent"][0] == exact["per_opponent"][1]
+    for exact_seat, sampled_seat in zip(exact["per_opponent"], sampled["per_opponent"]):
+        for outcome in ("win", "tie", "loss"):
+            assert abs(exact_seat[outcome] - sampled_seat[outcome]) < 0.01
+    assert abs(exact["equity"] - sampled["equity"]) < 0.01
+
+def test_adaptive_equity():
+    eq = EquityCalculator(seed=5)
+
+    # Clear-cut spot vs pot odds stops after the first batch
+    aa = eq.calculate_equity_details(["Ah", "Ad"], [], 2, simulations=100000, exact=False, threshold=0.3)
+    assert aa["samples"] == eq.ADAPTIVE_BATCH
+    assert aa["ci_low"] > 0.3
+
+    # Coin flip keeps sampling until the standard error target is met
+    flip = eq.calculate_equity_details(["Ah", "Kd"], [], 3, simulations=100000, exact=False, target_std_error=0.005)
+    assert flip["std_error"] <= 0.005
+    assert eq.ADAPTIVE_BATCH < flip["samples"] < 100000
+    assert flip["ci_low"] < flip["equity"] < flip["ci_high"]
+
+def test_equity_cache():
+    assert canonical_spot(["Ah", "Kh"], ["2h", "5c", "9d"]) == canonical_spot(["Ks", "As"], ["9c", "2s", "5d"])
+    assert canonical_spot(["Ah", "Kh"], ["2h", "5c", "9d"]) != canonical_spot(["Ah", "Kh"], ["2c", "5h", "9d"])
+
+    cache = EquityCache(maxsize=2)
+    alice = EquityCalculator(seed=1, cache=cache)
+    bob = EquityCalculator(seed=2, cache=cache)
+
+    first = alice.calculate_equity_details(["Ah", "Kh"], ["2h", "5c", "9d"], 3, simulations=5000)
+    # Same spot with suits relabelled and cards reordered is served from the cache
+    again = bob.calculate_equity_details(["Ks", "As"], ["9c", "2s", "5d"], 3, simulations=5000)
+    assert again == first
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+    # Oldest entry is evicted beyond maxsize
+    alice.calculate_equity_details(["7h", "7d"], ["2h", "5c", "9d"], 3, simulations=5000)
+    alice.calculate_equity_details(["Qh", "Jd"], ["2h", "5c", "9d"], 3, simulations=5000)
+    assert cache.stats()["size"] == 2
+    alice.calculate_equity_details(["Ah", "Kh"], ["2h", "5c", "9d"], 3, simulations=5000)
+    assert cache.stats()["misses"] == 4
+
+def test_equity_cache_keeps_table_lookups_apart():
+    cache = EquityCache()
+    with_table = EquityCalculator(seed=1, cache=cache)
+    without_table = EquityCalculator(seed=1, use_preflop_table=False, cache=cache)
+    if with_table.preflop_table is None or not with_table.preflop_table.covers(4):
+        return
+    assert with_table.calculate_equity_details(["7h", "2d"], [], 4, simulations=2000)["method"] == "preflop_table"
+    # The isomorphic spot from a calculator without the table is computed, not served the lookup
+    fresh = without_table.calculate_equity_details(["7s", "2c"], [], 4, simulations=2000)
+    assert fresh["method"] == "monte_carlo"
+    assert cache.stats()["hits"] == 0 and cache.stats()["misses"] == 2
+
+def test_multiway_ties():
+    eq = EquityCalculator(seed=4, use_cache=False)
+
+    # Royal flush on board: all three players split, so each gets a third
+    split = eq.calculate_equity_details(["2c", "3d"], ["Ah", "Kh", "Qh", "Jh", "Th"], 3, simulations=2000)
+    assert abs(split["equity"] - 1 / 3) < 1e-9
+    assert split["win"] == 0.0 and split["tie"] == 1.0 and split["loss"] == 0.0
+    assert split["per_opponent"] == [{"win": 0.0, "tie": 1.0, "loss": 0.0}] * 2
+    assert eq.calculate_equity(["2c", "3d"], ["Ah", "Kh", "Qh", "Jh", "Th"], 4, simulations=50, vectorized=False) == 0.25
+
+    # Breakdown is consistent: ties pay at most half, and one entry per opponent
+    flop = eq.calculate_equity_details(["Ah", "Kd"], ["2s", "5d", "9c"], 3, simulations=20000)
+    assert abs(flop["win"] + flop["tie"] + flop["loss"] - 1.0) < 1e-9
+    assert flop["win"] <= flop["equity"] <= flop["win"] + flop["tie"] / 2
+    assert len(flop["per_opponent"]) == 2
+    for outcome in flop["per_opponent"]:
+        assert outcome["win"] >= flop["win"]
+
+def test_parallel_equity():
+    eq = EquityCalculator(seed=11, use_cache=False, workers=2)
+    try:
+        result = eq.calculate_equity_details(["Ah", "Kd"], ["2s", "5d", "9c"], 3, simulations=eq.PARALLEL_MIN_SIMULATIONS)
+        assert result["samples"] == eq.PARALLEL_MIN_SIMULATIONS
+        serial = EquityCalculator(seed=11, use_cache=False).calculate_equity_details(["Ah", "Kd"], ["2s", "5d", "9c"], 3, simulations=50000)
+        assert abs(result["equity"] - serial["equity"]) < 0.02
+    finally:
+        shutdown_worker_pools()
+
+if __name__ == "__main__":
+    test_batch_evaluator_matches_treys()
+    test_vectorized_equity()
+    test_exact_equity()
+    test_exact_per_opponent_multiway()
+    test_adaptive_equity()
+    test_equity_cache()
+    test_equity_cache_keeps_table_lookups_apart()
+    test_multiway_ties()
+    test_parallel_equity()
+    print("Vectorized equity tests passed.")
@@ -0,0 +1,59 @@
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from ai.agent import PokerAgent
+from ai.fast_path import FastPathPolicy
+from ai.llm_client import LLMClient
+from ai.mock_server import MockLLMServer
+
+INFO = {"pot": 100, "to_call": 50, "my_chips": 500, "num_active_players": 2, "position": "BB",
+        "pot_odds": {"pot_odds": 50 / 150}}
+
+def test_policy_rules():
+    policy = FastPathPolicy()
+    free = dict(INFO, to_call=0, pot_odds={"pot_odds": 0.0})
+
+    # Trash with a free option checks; a decent hand escalates
+    assert policy.decide(free, ["fold", "check", "raise"], 0.2)["action"] == "check"
+    assert policy.decide(free, ["fold", "check", "raise"], 0.45) is None
+
+    # Hopeless versus the price folds; out of position the bar is higher
+    assert policy.decide(INFO, ["fold", "call", "raise"], 0.1)["action"] == "fold"
+    assert policy.decide(INFO, ["fold", "call", "raise"], 0.19)["action"] == "fold"
+    assert policy.decide(dict(INFO, position="BTN"), ["fold", "call", "raise"], 0.19) is None
+    assert policy.decide(INFO, ["fold", "call", "raise"], 0.3) is None
+
+    # The nuts gets the stack in
+    shove = policy.decide(INFO, ["fold", "call", "raise"], 0.97)
+    assert shove["action"] == "raise" and shove["amount"] == 450 and shove["source"] == "fast_path"
+    assert policy.decide(INFO, ["fold", "call", "all_in"], 0.97)["action"] == "all_in"
+
+def test_agent_skips_llm_for_trivial_spots():
+    trash = {"my_hand": ["7c", "2d"], "board": ["Ah", "Kh", "Qs"], "pot": 100, "current_bet": 0,
+             "to_call": 0, "my_chips": 500, "my_bet": 0, "num_active_players": 3}
+    # A gutshot: equity well clear of both the fold and the shove thresholds
+    marginal = {"my_hand": ["Qc", "Jd"], "board": ["Ah", "Kh", "2s"], "pot": 100, "current_bet": 20,
+                "to_call": 10, "my_chips": 500, "my_bet": 10}
+    with MockLLMServer() as server:
+        agent = PokerAgent("Bot", client=LLMClient(api_key="mock-key", base_url=server.url, max_retries=0))
+        assert agent.get_action(trash, ["fold", "check", "raise"])["source"] == "fast_path"
+        assert agent.get_action(marginal, ["fold", "call", "raise"])["action"] == "call"
+        assert server.stats()["requests"] == 1
+        assert agent.decision_stats() == {"fast_path": 1, "llm": 1, "fallback": 0, "fast_path_fraction": 0.5}
+
+        # Without a fast path every decision goes to the LLM
+        always_llm = PokerAgent("Bot", client=agent.client, fast_path=None)
+        always_llm.get_action(trash, ["fold", "check", "raise"])
+        assert server.stats()["requests"] == 2
+
+    # Each agent gets its own policy
+    other = PokerAgent("Other", client=agent.client)
+    other.fast_path.nuts_equity = 0.99
+    assert agent.fast_path is not other.fast_path and agent.fast_path.nuts_equity == 0.95
+
+if __name__ == "__main__":
+    test_policy_rules()
+    test_agent_skips_llm_for_trivial_spots()
+    print("Fast path tests passed.")
@@ -0,0 +1,54 @@
+import sys
+import os
+import json
+import random
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from ai.json_stream import JSONFieldStream
+
+OBJ = {"action": "raise", "amount": 120, "reasoning": "A \"draw\" \\ here\n😀 é", "chat": "Let's go 😀",
+       "extra": {"a": [1, {"b": "}"}]}, "ok": True, "none": None, "f": -1.5e3}
+
+def feed_in_chunks(text, rng):
+    parser = JSONFieldStream()
+    events = []
+    i = 0
+    while i < len(text):
+        size = rng.randint(1, 5)
+        events += parser.feed(text[i:i + size])
+        i += size
+    return parser, events
+
+def test_fields_and_deltas_any_chunking():
+    rng = random.Random(0)
+    texts = [json.dumps(OBJ), json.dumps(OBJ, ensure_ascii=False), json.dumps(OBJ, indent=2),
+             "```json\n" + json.dumps(OBJ) + "\n```"]
+    for text in texts:
+        for _ in range(50):
+            parser, events = feed_in_chunks(text, rng)
+            assert parser.done and parser.fields == OBJ
+            # Fields complete in the order they were written
+            assert [e["key"] for e in events if e["type"] == "field"] == list(OBJ)
+            # Escapes and surrogate pairs split across chunks still decode exactly
+            for key in ("reasoning", "chat"):
+                assert "".join(e["text"] for e in events if e["type"] == "delta" and e["key"] == key) == OBJ[key]
+
+def test_early_fields():
+    parser = JSONFieldStream()
+    events = parser.feed('{"action": "call", "amount": 0')
+    assert [e for e in events if e["type"] == "field"] == [{"type": "field", "key": "action", "value": "call"}]
+    # A scalar is complete at the next ',' or '}'
+    assert parser.feed(', "chat": "hi') == [{"type": "field", "key": "amount", "value": 0},
+                                            {"type": "delta", "key": "chat", "text": "hi"}]
+    parser.feed('"}')
+    assert parser.done and parser.fields == {"action": "call", "amount": 0, "chat": "hi"}
+
+    parser = JSONFieldStream()
+    parser.feed('{"amount": 5}trailing')
+    assert parser.done and parser.fields == {"amount": 5}
+
+if __name__ == "__main__":
+    test_fields_and_deltas_any_chunking()
+    test_early_fields()
+    print("JSON stream tests passed.")
@@ -0,0 +1,216 @@
+import sys
+import os
+import asyncio
+import json
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from ai.llm_client import LLMClient, CONCURRENCY_LIMITS
+from ai.response_cache import ResponseCache, response_cache_key
+from ai.agent import PokerAgent
+from ai.mock_server import MockLLMServer
+from ai.resilience import ProviderHealth
+
+class FakeCompletions:
+    """Stands in for AsyncOpenAI.chat.completions and records peak concurrency."""
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.in_flight = 0
+        self.peak = 0
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    async def create(self, model, messages, **kwargs):
+        with self.lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(self.delay)
+        with self.lock:
+            self.in_flight -= 1
+        content = json.dumps({"action": "call", "echo": messages[-1]["content"]})
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+def make_client(cache=None):
+    client = LLMClient(api_key="test-key", base_url="http://localhost:1/v1", model="gpt-test", cache=cache, hedge_after=None)
+    fake = FakeCompletions()
+    client.client = SimpleNamespace(chat=SimpleNamespace(completions=fake))
+    return client, fake
+
+def test_clients_share_connection_pool():
+    a = LLMClient(api_key="test-key", base_url="http://localhost:1/v1", model="gpt-test")
+    b = LLMClient(api_key="test-key", base_url="http://localhost:1/v1", model="gpt-test")
+    c = LLMClient(api_key="other-key", base_url="http://localhost:1/v1", model="gpt-test")
+    assert a.client is b.client
+    assert a.client is not c.client
+
+def test_sync_and_async_completion():
+    client, _ = make_client()
+    assert client.chat_completion([{"role": "user", "content": "hi"}]) == {"action": "call", "echo": "hi"}
+
+    async def main():
+        return await asyncio.gather(*[client.achat_completion([{"role": "user", "content": str(i)}]) for i in range(5)])
+    assert [r["echo"] for r in asyncio.run(main())] == ["0", "1", "2", "3", "4"]
+
+def test_concurrent_requests_respect_limit():
+    client, fake = make_client()
+    results = client.chat_completions([[{"role": "user", "content": str(i)}] for i in range(40)])
+    assert [r["echo"] for r in results] == [str(i) for i in range(40)]
+    assert 1 < fake.peak <= CONCURRENCY_LIMITS["openai"]
+
+def test_response_cache():
+    messages = [{"role": "system", "content": "You are Bob.  \n"}, {"role": "user", "content": "state"}]
+    same = [{"role": "system", "content": "You are Bob."}, {"role": "user", "content": "state\n"}]
+    assert response_cache_key("m", 0.5, messages) == response_cache_key("m", 0.5, same)
+    assert response_cache_key("m", 0.5, messages) != response_cache_key("m", 0.7, messages)
+
+    client, fake = make_client(ResponseCache(maxsize=2))
+    first = client.chat_completion(messages)
+    assert client.chat_completion(same) == first
+    assert fake.calls == 1 and client.cache.stats()["hits"] == 1
+
+    # LRU eviction beyond maxsize
+    client.chat_completion([{"role": "user", "content": "a"}])
+    client.chat_completion([{"role": "user", "content": "b"}])
+    client.chat_completion(messages)
+    assert fake.calls == 4 and client.cache.stats()["evictions"] >= 1
+
+    # TTL expiry
+    cache = ResponseCache(ttl=0.05)
+    cache.put("k", {"action": "call"})
+    assert cache.get("k") == {"action": "call"}
+    time.sleep(0.1)
+    assert cache.get("k") is None and cache.stats()["expired"] == 1
+
+def test_response_cache_on_disk():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "responses.sqlite")
+        client, fake = make_client(ResponseCache(path=path))
+        recorded = client.chat_completion([{"role": "user", "content": "hi"}])
+        client.cache.close()
+
+        # A new cache on the same file replays the stored response without a request
+        replay, fake = make_client(ResponseCache(path=path))
+        assert replay.chat_completion([{"role": "user", "content": "hi"}]) == recorded
+        assert fake.calls == 0 and replay.cache.stats()["disk_hits"] == 1
+        replay.cache.close()
+
+        # Disk hits hand out copies, like memory hits
+        cache = ResponseCache(path=path)
+        key = response_cache_key("gpt-test", 0.5, [{"role": "user", "content": "hi"}])
+        cache.get(key)["action"] = "fold"
+        assert cache.get(key) == recorded and cache.stats()["disk_hits"] == 1
+        cache.close()
+
+def test_agent_async_action():
+    client, _ = make_client()
+    agent = PokerAgent("Bot", client=client, fast_path=None)
+    info = {"my_hand": ["Ah", "Kd"], "board": ["Th", "Jh", "Qc"], "pot": 100, "current_bet": 20, "to_call": 10, "my_chips": 500, "my_bet": 10}
+    decision = asyncio.run(agent.aget_action(info, ["fold", "call", "raise"]))
+    assert decision["action"] == "call"
+
+def test_stream_completion():
+    messages = [{"role": "user", "content": "Valid Actions: fold, call"}]
+    with MockLLMServer(chunk_chars=3) as server:
+        client = LLMClient(api_key="mock-key", base_url=server.url, max_retries=0, cache=ResponseCache())
+        events = list(client.stream_completion(messages))
+        assert events[-1]["type"] == "done"
+        response = events[-1]["response"]
+        assert response == client.chat_completion([{"role": "user", "content": "Valid Actions: fold, call "}])
+        assert [e["key"] for e in events if e["type"] == "field"] == ["action", "amount", "reasoning", "chat"]
+        assert "".join(e["text"] for e in events if e["type"] == "delta" and e["key"] == "chat") == response["chat"]
+
+        # A cached response is replayed as fields without a request
+        requests = server.stats()["requests"]
+        assert list(client.stream_completion(messages))[-1]["response"] == response
+        assert server.stats()["requests"] == requests
+
+    # Replies that are not a JSON object fall back to the full-text parse
+    for reply in ("{'action': 'call'}", "no json here"):
+        with MockLLMServer(chunk_chars=3, responder=lambda _m, r=reply: r) as server:
+            client = LLMClient(api_key="mock-key", base_url=server.url, max_retries=0)
+            assert list(client.stream_completion(messages))[-1]["response"]["error"] == "Invalid JSON response"
+
+    with MockLLMServer(error_rate=1.0, seed=1) as server:
+        client = LLMClient(api_key="mock-key", base_url=server.url, max_retries=0)
+        assert "error" in list(client.stream_completion(messages))[-1]["response"]
+
+def test_agent_stream_commits_before_chat():
+    info = {"my_hand": ["Ah", "Kd"], "board": ["Th", "Jh", "Qc"], "pot": 100, "current_bet": 20, "to_call": 10, "my_chips": 500, "my_bet": 10}
+    with MockLLMServer(chunk_chars=3, token_latency=0.002) as server:
+        agent = PokerAgent("Bot", client=LLMClient(api_key="mock-key", base_url=server.url, max_retries=0), fast_path=None)
+        events = list(agent.stream_action(info, ["fold", "call", "raise"]))
+    kinds = [e["type"] for e in events]
+    assert kinds[0] == "decision" and kinds[-1] == "done" and kinds.index("chat") > 0
+    # The action is committed before the reasoning and chat have been generated
+    assert events[0]["decision"]["action"] == "call" and "reasoning" not in events[0]["decision"]
+    assert "".join(e["text"] for e in events if e["type"] == "chat") == events[-1]["decision"]["chat"]
+    assert agent.decision_stats()["llm"] == 1
+
+class SlowFirstCompletions(FakeCompletions):
+    """The first call hangs for a second; later ones answer at once."""
+    async def create(self, model, messages, **kwargs):
+        with self.lock:
+            self.calls += 1
+            first = self.calls == 1
+        await asyncio.sleep(1.0 if first else 0.01)
+        content = json.dumps({"action": "call", "first": first})
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+def test_timeout_and_hedging():
+    with MockLLMServer(latency=0.5) as server:
+        client = LLMClient(api_key="mock-key", base_url=server.url, max_retries=0, timeout=0.1, hedge_after=None)
+        start = time.perf_counter()
+        response = client.chat_completion([{"role": "user", "content": "hi"}])
+        assert response.get("timeout") and time.perf_counter() - start < 0.4
+        assert client.stats()["timeout"] == 1
+
+    client = LLMClient(api_key="test-key", base_url="http://localhost:2/v1", model="gpt-test", hedge_after=0.05)
+    fake = SlowFirstCompletions()
+    client.client = SimpleNamespace(chat=SimpleNamespace(completions=fake))
+    start = time.perf_counter()
+    assert client.chat_completion([{"role": "user", "content": "hi"}]) == {"action": "call", "first": False}
+    assert time.perf_counter() - start < 0.5
+    stats = client.stats()
+    assert fake.calls == 2 and stats["hedges"] == 1 and stats["hedge_wins"] == 1 and stats["success"] == 1
+
+def test_circuit_breaker_and_fallback():
+    info = {"my_hand": ["Qc", "Jd"], "board": ["Ah", "Kh", "2s"], "pot": 100, "current_bet": 20, "to_call": 10, "my_chips": 500, "my_bet": 10}
+    with MockLLMServer(error_rate=1.0, seed=1) as server:
+        client = LLMClient(api_key="mock-key", base_url=server.url, max_retries=0, hedge_after=None)
+        client.health = ProviderHealth(failure_threshold=2, reset_timeout=0.2)
+        for _ in range(2):
+            assert client.chat_completion([{"role": "user", "content": "hi"}]).get("provider_error")
+        assert not client.available()
+
+        # Open: agents fail fast to their local fallback policy without a request
+        agent = PokerAgent("Bot", client=client, fast_path=None)
+        decision = agent.get_action(info, ["fold", "call", "raise"])
+        assert decision["source"] == "fallback" and decision["action"] in ("fold", "call", "raise")
+        assert server.stats()["requests"] == 2 and client.stats()["short_circuit"] == 1
+
+        # After reset_timeout one trial request goes through; its success closes the circuit
+        server.error_rate = 0.0
+        time.sleep(0.25)
+        assert client.available()
+        assert agent.get_action(info, ["fold", "call", "raise"]).get("source") != "fallback"
+        stats = client.stats()
+        assert stats["circuit"] == "closed" and stats["circuit_trips"] == 1 and stats["p95"] is not None
+        assert agent.decision_stats()["fallback"] == 1
+
+if __name__ == "__main__":
+    test_clients_share_connection_pool()
+    test_sync_and_async_completion()
+    test_concurrent_requests_respect_limit()
+    test_response_cache()
+    test_response_cache_on_disk()
+    test_agent_async_action()
+    test_stream_completion()
+    test_agent_stream_commits_before_chat()
+    test_timeout_and_hedging()
+    test_circuit_breaker_and_fallback()
+    print("LLM client tests passed.")
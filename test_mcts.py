@@ -0,0 +1,94 @@
+import sys
+import os
+import random
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from ai.bots import make_bot
+from ai.mcts import MCTSBot, shutdown_search_pools, _SEARCH_POOLS
+from game import equity_pool
+from game.engine import TexasHoldemGame
+from game.models import Player, Card
+from game.simulation import simulate
+
+def decision_point(hand, seats=6, seed=1):
+    """The first preflop decision at a fresh table, with `hand` as the hole cards."""
+    game = TexasHoldemGame(rng=random.Random(seed))
+    for i in range(seats):
+        game.add_player(Player(f"P{i}", chips=2000))
+    game.start_hand()
+    player = game.players[game.current_player_index]
+    player.hand = [Card.from_str(c) for c in hand]
+    return game, player
+
+def test_search_covers_legal_actions_and_keeps_game():
+    game, player = decision_point(["Ah", "As"])
+    info, valid = game.get_game_info(player), game.get_legal_actions(player)
+    stats = MCTSBot(player.name, iterations=400, time_limit=None, seed=0).search(info, valid)
+    assert set(stats) == {"fold", "call", "raise:0.5", "raise:1.0", "raise:all"}
+    assert sum(visits for visits, _ in stats.values()) == 400
+    # Searching works on its own copy of the state
+    assert game.get_game_info(player) == info
+
+def test_strong_and_weak_hands():
+    game, player = decision_point(["Ah", "As"])
+    bot = MCTSBot(player.name, iterations=1500, time_limit=None, seed=0)
+    assert bot.get_action(game.get_game_info(player), game.get_legal_actions(player))["action"] in ("call", "raise")
+    game, player = decision_point(["7h", "2c"])
+    game.step("raise", 400)  # A big raise in front of the next seat
+    player = game.players[game.current_player_index]
+    player.hand = [Card.from_str("7h"), Card.from_str("2c")]
+    bot = MCTSBot(player.name, iterations=1500, time_limit=None, seed=0)
+    assert bot.get_action(game.get_game_info(player), game.get_legal_actions(player))["action"] == "fold"
+
+def test_time_budget_and_reproducibility():
+    game, player = decision_point(["Kd", "Qd"])
+    info, valid = game.get_game_info(player), game.get_legal_actions(player)
+    start = time.perf_counter()
+    MCTSBot(player.name, iterations=None, time_limit=0.2, seed=0).get_action(info, valid)
+    assert time.perf_counter() - start < 1.0
+    first = MCTSBot(player.name, iterations=300, time_limit=None, seed=3).get_action(info, valid)
+    second = MCTSBot(player.name, iterations=300, time_limit=None, seed=3).get_action(info, valid)
+    assert first == second
+
+def test_workers_split_iterations():
+    game, player = decision_point(["Jc", "Js"])
+    info, valid = game.get_game_info(player), game.get_legal_actions(player)
+    try:
+        decision = MCTSBot(player.name, iterations=200, time_limit=None, workers=2, seed=0).get_action(info, valid)
+        assert decision["action"] in valid
+        assert " of 200 runs" in decision["reasoning"]
+        # Searches run on their own pool, not the equity calculator's
+        assert 2 in _SEARCH_POOLS and 2 not in equity_pool._POOLS
+    finally:
+        shutdown_search_pools()
+
+def test_opponent_raises_keep_their_size():
+    bot = MCTSBot(seed=0)
+    assert bot._encode("call", 0, 100, 500) == "call"
+    assert bot._encode("raise", 40, 100, 500) == "raise:0.5"
+    assert bot._encode("raise", 120, 100, 500) == "raise:1.0"
+    # A shove and a min-raise lead to different nodes
+    assert bot._encode("raise", 500, 100, 500) == "raise:all"
+    assert bot._encode("raise", 20, 100, 500) != bot._encode("raise", 500, 100, 500)
+
+def test_plays_full_hands():
+    policies = {"mcts": make_bot("mcts", "mcts", seed=0), "tag": make_bot("tag", "tag", seed=1), "lag": make_bot("lag", "lag", seed=2)}
+    policies["mcts"].iterations = 60
+    stats = simulate(policies, 10, seed=4)
+    assert stats.hands == 10
+
+def test_falls_back_without_seat_layout():
+    info = {"my_hand": ["Ah", "As"], "board": [], "pot": 30, "to_call": 20, "big_blind": 20, "num_active_players": 2}
+    assert MCTSBot(seed=0).get_action(info, ["fold", "call", "raise"])["action"] in ("call", "raise")
+
+if __name__ == "__main__":
+    test_search_covers_legal_actions_and_keeps_game()
+    test_strong_and_weak_hands()
+    test_time_budget_and_reproducibility()
+    test_workers_split_iterations()
+    test_opponent_raises_keep_their_size()
+    test_plays_full_hands()
+    test_falls_back_without_seat_layout()
+    print("MCTS tests passed.")
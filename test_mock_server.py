@@ -0,0 +1,59 @@
+import sys
+import os
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from ai.agent import PokerAgent
+from ai.llm_client import LLMClient
+from ai.mock_server import MockLLMServer, FixtureStore
+
+STATE = {"my_hand": ["Ah", "Kd"], "board": ["Th", "Jh", "Qc"], "pot": 100, "current_bet": 20, "to_call": 10, "my_chips": 500, "my_bet": 10}
+
+def test_agent_against_mock_server():
+    with MockLLMServer(latency=0.01) as server:
+        # Near-nut hand: without fast_path=None it could be answered locally
+        agent = PokerAgent("Bot", client=LLMClient(api_key="mock-key", base_url=server.url, max_retries=0), fast_path=None)
+        assert agent.get_action(STATE, ["fold", "call", "raise"])["action"] == "call"
+        assert agent.get_action(dict(STATE, to_call=0), ["fold", "check", "raise"])["action"] == "check"
+        assert server.stats()["requests"] == 2
+
+def test_error_injection():
+    with MockLLMServer(error_rate=1.0, error_status=500, seed=1) as server:
+        client = LLMClient(api_key="mock-key", base_url=server.url, max_retries=0)
+        assert "error" in client.chat_completion([{"role": "user", "content": "hi"}])
+        # No hidden SDK retries: one call, one failed request
+        assert server.stats()["errors"] == server.stats()["requests"] == 1
+
+def test_record_and_replay():
+    messages = [{"role": "user", "content": "Valid Actions: fold, call"}]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "fixtures.json")
+
+        # Record what the "provider" (here a mock server) answers
+        with MockLLMServer() as provider:
+            with FixtureStore(path, mode="record") as store:
+                recorder = LLMClient(api_key="mock-key", base_url=provider.url, max_retries=0, cache=store)
+                recorded = recorder.chat_completion(messages)
+                assert not os.path.exists(path)  # written once, on close
+        assert len(FixtureStore(path)) == 1
+
+        # Client-side replay needs no server at all
+        offline = LLMClient(api_key="mock-key", base_url="http://127.0.0.1:9/v1", max_retries=0, cache=FixtureStore(path))
+        assert offline.chat_completion(messages) == recorded
+
+        # Server-side replay serves the fixture and rejects unknown prompts in strict mode
+        def responder(_messages):
+            return {"action": "fold"}
+
+        with MockLLMServer(fixtures=FixtureStore(path), strict=True, responder=responder) as server:
+            client = LLMClient(api_key="mock-key", base_url=server.url, max_retries=0)
+            assert client.chat_completion(messages) == recorded
+            assert "error" in client.chat_completion([{"role": "user", "content": "unknown"}])
+            assert server.stats()["fixture_hits"] == 1
+
+if __name__ == "__main__":
+    test_agent_against_mock_server()
+    test_error_injection()
+    test_record_and_replay()
+    print("Mock server tests passed.")
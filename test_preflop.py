@@ -0,0 +1,34 @@
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from game.equity import EquityCalculator
+from game.preflop import HAND_CLASSES, hand_class, representative_hand
+
+def test_hand_classes():
+    assert len(HAND_CLASSES) == 169 == len(set(HAND_CLASSES))
+    assert HAND_CLASSES[0] == "AA" and HAND_CLASSES[-1] == "22"
+    assert hand_class(["Ah", "Kh"]) == hand_class(["K♠", "A♠"]) == "AKs"
+    assert hand_class(["Ah", "Kd"]) == "AKo"
+    assert hand_class(["7c", "7d"]) == "77"
+    for name in HAND_CLASSES:
+        assert hand_class(representative_hand(name)) == name
+
+def test_preflop_table_lookup():
+    eq = EquityCalculator(seed=3)
+    assert eq.preflop_table is not None, "run build_preflop_table.py"
+
+    result = eq.calculate_equity_details(["Ah", "Kh"], [], 4)
+    assert result["method"] == "preflop_table"
+    assert result["win"] <= result["equity"] <= result["win"] + result["tie"]
+
+    # Table agrees with a fresh simulation, and exact=False bypasses it
+    sampled = eq.calculate_equity_details(["Ad", "Kd"], [], 4, simulations=100000, exact=False)
+    assert sampled["method"] == "monte_carlo"
+    assert abs(sampled["equity"] - result["equity"]) < 0.01
+
+if __name__ == "__main__":
+    test_hand_classes()
+    test_preflop_table_lookup()
+    print("Preflop table tests passed.")
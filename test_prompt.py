@@ -0,0 +1,64 @@
+import sys
+import os
+from unittest.mock import MagicMock
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from ai.agent import PokerAgent
+from ai.llm_client import LLMClient
+from ai.prompt import STATIC_INSTRUCTIONS, fit_memories, message_tokens
+from game.engine import TexasHoldemGame
+from game.models import Player
+
+def table_spots():
+    game = TexasHoldemGame()
+    for name in ["Alice", "Bob", "Cy"]:
+        game.add_player(Player(name, is_ai=True))
+    game.start_hand()
+    first = game.players[game.current_player_index]
+    spot1 = (game.get_game_info(first), game.get_legal_actions(first))
+    game.step("fold")
+    second = game.players[game.current_player_index]
+    return spot1, (game.get_game_info(second), game.get_legal_actions(second))
+
+def test_compact_prompt_and_stable_prefix():
+    (info1, valid1), (info2, valid2) = table_spots()
+    alice = PokerAgent("Alice", client=MagicMock(spec=LLMClient))
+    bob = PokerAgent("Bob", profile="A loose gambler", client=MagicMock(spec=LLMClient))
+
+    first = alice._build_messages(info1, valid1, 0.4)
+    alice.add_memory("Hand ended. Winners: Bob. Paid out: $40.")
+    later = alice._build_messages(info2, valid2, 0.55)
+    # The system message is the same across calls; every agent's starts with the shared instructions
+    assert first[0] == later[0]
+    assert bob._build_messages(info2, valid2, 0.5)[0]["content"].startswith(STATIC_INSTRUCTIONS)
+
+    user = later[1]["content"]
+    assert "Recent:\n- Hand ended. Winners: Bob." in user
+    assert "seats Alice 1000/0 folded" in user and "Valid Actions: " + ", ".join(valid2) in user
+    assert "(Chips:" not in user and "Example" not in user
+
+def test_token_budget():
+    (info, valid), _ = table_spots()
+    memories = [f"Hand ended. Winners: {'Alice' if i % 3 else 'Bob'}. Paid out: ${i * 40}." for i in range(10)]
+
+    lines, summarized = fit_memories(memories, None)
+    assert len(lines) == 10 and summarized == 0
+    lines, summarized = fit_memories(memories, 40)
+    assert lines[0].startswith("- 8 earlier hands; won by Alice x5, Bob x3") and summarized == 8 and len(lines) == 3
+
+    unlimited = PokerAgent("Bob", client=MagicMock(spec=LLMClient))
+    budgeted = PokerAgent("Bob", client=MagicMock(spec=LLMClient), token_budget=220)
+    for memory in memories:
+        unlimited.add_memory(memory)
+        budgeted.add_memory(memory)
+    full = message_tokens(unlimited._build_messages(info, valid, 0.5))
+    cut = message_tokens(budgeted._build_messages(info, valid, 0.5))
+    assert cut <= 220 < full
+    stats = budgeted.prompt_stats()
+    assert stats["calls"] == 1 and stats["last_tokens"] == cut and stats["memories_summarized"] > 0
+
+if __name__ == "__main__":
+    test_compact_prompt_and_stable_prefix()
+    test_token_budget()
+    print("Prompt tests passed.")
@@ -0,0 +1,48 @@
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from game.equity import EquityCalculator
+from game.ranges import HandRange
+
+def test_parse_ranges():
+    assert len(HandRange.parse("QQ+")) == 18
+    assert len(HandRange.parse("AKs")) == 4 and len(HandRange.parse("AKo")) == 12 and len(HandRange.parse("AK")) == 16
+    assert len(HandRange.parse("ATs+")) == 16
+    assert len(HandRange.parse("22-55")) == 24
+    assert len(HandRange.parse("A5s-A2s")) == 16
+    assert len(HandRange.parse("any")) == 1326
+
+    weighted = HandRange.parse("QQ+, AKs, 0.5×ATo")
+    assert len(weighted) == 18 + 4 + 12
+    assert weighted.weights.sum() == 18 + 4 + 6
+    assert HandRange.parse("ATo:0.5").weights.tolist() == [0.5] * 12
+
+    try:
+        HandRange.parse("AKx")
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+
+def test_range_equity():
+    eq = EquityCalculator(seed=9)
+
+    # Known matchup: AA vs KK is ~82%
+    aa_kk = eq.calculate_range_equity("AA", "KK", simulations=50000)
+    assert abs(aa_kk["equity"] - 0.82) < 0.01
+
+    # Hand vs random range agrees with the plain equity API (exactly on the river)
+    board = ["2s", "5d", "9c", "Jh", "3c"]
+    vs_any = eq.calculate_range_equity(["Ah", "Kd"], "any", board)
+    assert vs_any["method"] == "exact"
+    assert vs_any["equity"] == eq.calculate_equity_details(["Ah", "Kd"], board, 2)["equity"]
+
+    # Card removal: villain's KK combos that use the board's K are never dealt
+    blocked = eq.calculate_range_equity(["Ah", "Ad"], "KK, QQ", ["Kc", "Kd", "2h", "3s", "7c"])
+    assert blocked["samples"] == 1 + 6
+
+if __name__ == "__main__":
+    test_parse_ranges()
+    test_range_equity()
+    print("Range tests passed.")
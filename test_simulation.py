@@ -0,0 +1,49 @@
+import sys
+import os
+from functools import partial
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from ai.bots import make_bot, profile_policies, RuleBot
+from game.simulation import simulate, run_tables
+
+def make_policies(seed):
+    return {name: make_bot(profile, name, seed=seed + i) for i, (name, profile) in enumerate([("A", "tag"), ("B", "station"), ("C", "random")])}
+
+def test_simulation_runs_and_conserves_chips():
+    stats = simulate(make_policies(0), 300, seed=1)
+    summary = stats.summary()
+    assert summary["hands"] == 300
+    assert sum(p["net"] for p in summary["players"].values()) == 0
+    for p in summary["players"].values():
+        assert 0.0 <= p["showdown_rate"] <= 1.0
+        assert 0.0 <= p["showdown_win_rate"] <= 1.0
+
+def test_simulation_is_reproducible():
+    first = simulate(make_policies(5), 100, seed=9).summary()["players"]
+    second = simulate(make_policies(5), 100, seed=9).summary()["players"]
+    assert first == second
+
+def test_multi_table_runs():
+    policies = partial(profile_policies, ["tag", "lag", "random"])
+    serial = run_tables(policies, 4, 50, seed=3, workers=1)
+    assert serial.hands == 200
+    streamed = []
+    parallel = run_tables(policies, 4, 50, seed=3, workers=2, on_hand=lambda table, record: streamed.append(table))
+    assert sorted(set(streamed)) == [0, 1, 2, 3] and len(streamed) == 200
+    # Tables are seeded independently of the worker count
+    assert parallel.summary()["players"] == serial.summary()["players"]
+
+def test_rule_bot_decisions():
+    bot = RuleBot(tightness=0.5, aggression=1.0, seed=0)
+    info = {"my_hand": ["Ah", "As"], "board": [], "pot": 30, "to_call": 20, "big_blind": 20, "num_active_players": 2}
+    assert bot.get_action(info, ["fold", "call", "raise"])["action"] == "raise"
+    info = {"my_hand": ["7h", "2c"], "board": ["As", "Kd", "Qs"], "pot": 200, "to_call": 200, "big_blind": 20, "num_active_players": 2}
+    assert RuleBot(tightness=1.0, seed=0).get_action(info, ["fold", "call", "raise"])["action"] == "fold"
+
+if __name__ == "__main__":
+    test_simulation_runs_and_conserves_chips()
+    test_simulation_is_reproducible()
+    test_multi_table_runs()
+    test_rule_bot_decisions()
+    print("Simulation tests passed.")
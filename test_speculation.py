@@ -0,0 +1,91 @@
+import sys
+import os
+import random
+import threading
+import time
+from unittest.mock import MagicMock
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from ai.agent import PokerAgent
+from ai.llm_client import LLMClient
+from ai.speculation import SpeculativeDecider
+from game.engine import TexasHoldemGame
+from game.models import Player
+
+def make_table():
+    game = TexasHoldemGame(rng=random.Random(1))
+    game.add_player(Player("Human", chips=1000))
+    agents = {}
+    for name in ["Alice", "Bob"]:
+        game.add_player(Player(name, is_ai=True, chips=1000))
+        client = MagicMock(spec=LLMClient)
+        response = {"action": "call", "amount": 0, "chat": name}
+        client.chat_completion.return_value = response
+        client.stream_completion.side_effect = lambda messages, json_mode=True, r=response: iter(
+            [{"type": "field", "key": k, "value": v} for k, v in r.items()] + [{"type": "done", "response": r}])
+        agents[name] = PokerAgent(name, client=client, fast_path=None)
+    game.start_hand()
+    return game, agents
+
+def test_speculation_hit_on_predicted_reply():
+    game, agents = make_table()
+    speculator = SpeculativeDecider()
+    # Human is first to act three-handed (dealer 0, blinds 1 and 2)
+    assert game.players[game.current_player_index].name == "Human"
+
+    human = game.players[game.current_player_index]
+    info, deck = game.get_game_info(human), list(game.deck.cards)
+    speculator.speculate(game, agents)
+    speculator.speculate(game, agents)  # idempotent across reruns
+    assert speculator.stats()["submitted"] == 2  # call and fold branches
+    # The branches were played on the real game and taken back
+    assert game.get_game_info(human) == info and game.deck.cards == deck
+    assert game.players[game.current_player_index] is human
+
+    game.step("call")
+    nxt = game.players[game.current_player_index]
+    decision = speculator.take(agents[nxt.name], game.get_game_info(nxt), game.get_legal_actions(nxt))
+    assert decision["chat"] == nxt.name
+    stats = speculator.stats()
+    assert stats["hits"] == 1 and stats["pending"] == 0
+
+def test_speculation_miss_falls_back():
+    game, agents = make_table()
+    speculator = SpeculativeDecider()
+    speculator.speculate(game, agents)
+
+    # A raise was not speculated on
+    game.step("raise", 60)
+    nxt = game.players[game.current_player_index]
+    info, valid = game.get_game_info(nxt), game.get_legal_actions(nxt)
+    assert speculator.take(agents[nxt.name], info, valid) is None
+    assert speculator.decide(agents[nxt.name], info, valid)["action"] == "call"
+    assert speculator.stats()["misses"] == 2
+
+def test_miss_does_not_wait_for_speculation():
+    game, agents = make_table()
+    speculator = SpeculativeDecider(max_workers=1)
+    # A stale speculative call occupies the only speculation worker
+    release = threading.Event()
+    speculator.executor.submit(release.wait, 5)
+
+    game.step("call")
+    nxt = game.players[game.current_player_index]
+    start = time.perf_counter()
+    assert speculator.decide(agents[nxt.name], game.get_game_info(nxt), game.get_legal_actions(nxt))["action"] == "call"
+    assert time.perf_counter() - start < 2
+    release.set()
+
+    speculator.clear()
+    try:
+        speculator.executor.submit(print)
+        assert False, "clear() should shut the worker pool down"
+    except RuntimeError:
+        pass
+
+if __name__ == "__main__":
+    test_speculation_hit_on_predicted_reply()
+    test_speculation_miss_falls_back()
+    test_miss_does_not_wait_for_speculation()
+    print("Speculation tests passed.")
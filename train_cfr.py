@@ -0,0 +1,36 @@
+import sys
+import os
+import argparse
+import time
+
+# Ensure we can import from the project
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from ai.cfr import CFRTrainer, DEFAULT_BLUEPRINT_DIR
+
+def main():
+    parser = argparse.ArgumentParser(description="Train (or resume training) the heads-up CFR blueprint used by CFRPolicy.")
+    parser.add_argument("--iterations", type=int, default=10000, help="Iterations to add to the checkpoint")
+    parser.add_argument("--path", default=DEFAULT_BLUEPRINT_DIR, help="Checkpoint directory; an existing checkpoint is resumed")
+    parser.add_argument("--checkpoint-every", type=int, default=1000, help="Flush the tables every N iterations")
+    parser.add_argument("--buckets", type=int, default=10, help="Equity buckets per street (new checkpoints only)")
+    parser.add_argument("--equity-simulations", type=int, default=1000, help="Runouts sampled per flop/turn bucket (new checkpoints only)")
+    parser.add_argument("--stack", type=int, default=2000, help="Starting stack of every training hand (new checkpoints only)")
+    parser.add_argument("--seed", type=int, default=0, help="RNG seed for a new checkpoint")
+    args = parser.parse_args()
+
+    trainer = CFRTrainer(args.path, buckets=args.buckets, equity_simulations=args.equity_simulations, stack=args.stack, seed=args.seed)
+    if trainer.iterations:
+        print(f"🔁 Resuming {args.path} at iteration {trainer.iterations}")
+    start = time.time()
+
+    def progress(done, total):
+        if done % args.checkpoint_every == 0 or done == total:
+            print(f"  {done}/{total} iterations ({time.time() - start:.0f}s)")
+
+    print(f"🚀 Training {args.iterations} MCCFR iterations...")
+    trainer.train(args.iterations, checkpoint_every=args.checkpoint_every, progress=progress)
+    print(f"✅ Saved to {args.path} ({trainer.iterations} iterations in total)")
+
+if __name__ == "__main__":
+    main()